@@ -0,0 +1,112 @@
+"""
+Measure bulk import throughput at 100k rows.
+
+Generates a synthetic agent file (CSV, or XLSX with --xlsx) and times the
+streaming read + validation pass that jobs.import_agents runs before any
+database work. With --insert the full import is also run against the
+configured database in a subprocess; point secrets.env at a scratch
+database first, since the rows are really inserted.
+
+Usage:
+    python -m bench.import_throughput [--rows 100000] [--xlsx] [--insert] [--chunk-size 5000]
+"""
+import argparse
+import csv
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from services.agent_import import read_rows, validate_row
+
+REGIONS = ['North', 'South', 'East', 'West', 'Central']
+
+
+def synthetic_rows(count):
+    """Yield header + count plausible agent rows, about 1% of them invalid"""
+    rng = random.Random(42)
+    stamp = int(time.time())
+    yield ['email', 'first_name', 'surname', 'date_of_birth', 'gender', 'mobile_number',
+           'state', 'region', 'bank_name', 'account_number', 'account_name', 'id_type', 'id_number']
+    for i in range(count):
+        invalid = rng.random() < 0.01
+        yield [
+            'not-an-email' if invalid else f"bench.{stamp}.{i}@example.com",
+            f"First{i}", f"Surname{i}",
+            f"{rng.randint(1960, 2004)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            rng.choice(['Male', 'Female']),
+            f"080{rng.randint(10000000, 99999999)}",
+            'Lagos', rng.choice(REGIONS), 'Bench Bank',
+            f"{rng.randint(10 ** 9, 10 ** 10 - 1)}", f"First{i} Surname{i}",
+            'NIN', f"{rng.randint(10 ** 10, 10 ** 11 - 1)}",
+        ]
+
+
+def write_file(path, count, xlsx):
+    if xlsx:
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        for row in synthetic_rows(count):
+            sheet.append(row)
+        workbook.save(path)
+    else:
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows(synthetic_rows(count))
+
+
+def validation_pass(path, trace_memory=False):
+    """Run the import's read + validate pass; returns (seconds, valid, invalid, peak_bytes or None)"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    valid = invalid = 0
+    for _, raw in read_rows(path):
+        _, error = validate_row(raw)
+        if error:
+            invalid += 1
+        else:
+            valid += 1
+    elapsed = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, valid, invalid, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--xlsx', action='store_true')
+    parser.add_argument('--insert', action='store_true', help='Also run the full import against the configured database')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"agents.{'xlsx' if args.xlsx else 'csv'}")
+        start = time.perf_counter()
+        write_file(path, args.rows, args.xlsx)
+        print(f"Generated {args.rows} rows in {time.perf_counter() - start:.1f}s ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+        elapsed, valid, invalid, _ = validation_pass(path)
+        print(f"Read + validate: {elapsed:.2f}s, {args.rows / elapsed:,.0f} rows/s, {valid} valid / {invalid} rejected")
+        # tracemalloc slows the pass down several times, so memory is measured on a separate run
+        peak = validation_pass(path, trace_memory=True)[3]
+        print(f"Peak traced memory during the pass: {peak / 1e6:.1f} MB")
+
+        if args.insert:
+            result = subprocess.run(
+                [sys.executable, '-m', 'jobs.import_agents', path, '--chunk-size', str(args.chunk_size),
+                 '--report', os.path.join(tmp, 'errors.csv')],
+                capture_output=True, text=True
+            )
+            output = (result.stdout or result.stderr).strip().splitlines()
+            print(f"Full import: {output[-1] if output else 'no output'}")
+
+
+if __name__ == '__main__':
+    main()
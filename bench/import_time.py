@@ -0,0 +1,96 @@
+"""
+Measure cold import time per page and warm rerun time of the app script.
+
+Cold import: each page module is imported in a fresh interpreter (after
+streamlit itself), which is what the first visit to that page costs a new
+worker. The "monolith" row imports the dependencies the single-file app.py
+loaded for every page.
+
+Rerun: the app is run repeatedly with streamlit's AppTest on a page that needs
+no database (admin_login by default), so only script overhead is measured.
+Point --script at an older app.py to compare.
+
+Usage:
+    python -m bench.import_time [--runs 5] [--reruns 50] [--page admin_login] [--script app.py]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from bench.rerun_overhead import PLACEHOLDER_ENV
+
+PAGE_MODULES = [
+    'views.login', 'views.create_account', 'views.agent_info', 'views.dashboard',
+    'views.profile', 'views.admin_login', 'views.test_page', 'views.admin_dashboard',
+    'views.admin_agent_detail', 'views.admin_analytics', 'views.admin_performance',
+]
+MONOLITH_IMPORTS = 'import pyodbc, azure.storage.blob, smtplib, email.mime.multipart, email.mime.text, dotenv'
+DEPENDENCY_IMPORTS = [
+    ('pyodbc', 'import pyodbc'),
+    ('azure.storage.blob', 'import azure.storage.blob'),
+    ('smtplib + email.mime', 'import smtplib, email.mime.multipart, email.mime.text'),
+]
+
+COLD_IMPORT_SNIPPET = '''
+import time, streamlit
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+'''
+
+
+def cold_import(statement, runs):
+    """Median seconds to run an import statement in a fresh interpreter, or an error string"""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', COLD_IMPORT_SNIPPET.format(statement=statement)],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return result.stderr.strip().splitlines()[-1]
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def rerun_time(script, page, reruns):
+    """Median seconds per AppTest run of the script with the given page selected"""
+    from streamlit.testing.v1 import AppTest
+    for name, value in PLACEHOLDER_ENV.items():
+        os.environ.setdefault(name, value)
+    app = AppTest.from_file(os.path.abspath(script), default_timeout=30)
+    app.session_state['page'] = page
+    app.run()
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        samples.append(time.perf_counter() - start)
+    if app.exception:
+        return f"error: {app.exception[0].message}"
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--reruns', type=int, default=50)
+    parser.add_argument('--page', default='admin_login')
+    parser.add_argument('--script', default='app.py')
+    args = parser.parse_args()
+
+    print('Cold import (median, ms)')
+    for label, statement in [('monolith deps', MONOLITH_IMPORTS)] + DEPENDENCY_IMPORTS + [(m, f'import {m}') for m in PAGE_MODULES]:
+        result = cold_import(statement, args.runs)
+        print(f"  {label:28} {result * 1000:8.1f}" if isinstance(result, float) else f"  {label:28} {result}")
+
+    result = rerun_time(args.script, args.page, args.reruns)
+    print(f"Rerun of {args.script} on '{args.page}' (median, ms)")
+    print(f"  {result * 1000:8.1f}" if isinstance(result, float) else f"  {result}")
+
+
+if __name__ == '__main__':
+    main()
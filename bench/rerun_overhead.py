@@ -0,0 +1,78 @@
+"""
+Measure the per-rerun cost of configuration and client construction.
+
+Compares the old top-of-script work (load_dotenv, os.getenv lookups and a new
+BlobServiceClient on every rerun) with the cached settings/client lookups the
+app now performs. Uses placeholder credentials when none are configured, so
+it runs without network access.
+
+Usage:
+    python -m bench.rerun_overhead [--iterations 2000]
+"""
+import argparse
+import os
+import time
+
+from azure.storage.blob import BlobServiceClient
+from dotenv import load_dotenv
+
+PLACEHOLDER_ENV = {
+    'server': 'bench.database.windows.net',
+    'database': 'bench',
+    'dbusername': 'bench',
+    'password': 'bench',
+    'AZURE_STORAGE_CONNECTION_STRING': (
+        'DefaultEndpointsProtocol=https;AccountName=bench;'
+        'AccountKey=YmVuY2hiZW5jaGJlbmNoYmVuY2hiZW5jaGJlbmNoYmVuY2g=;EndpointSuffix=core.windows.net'
+    ),
+    'AZURE_STORAGE_CONTAINER_NAME': 'bench',
+    'BLOB_BASE_URL': 'https://bench.blob.core.windows.net/bench',
+}
+
+
+def legacy_rerun():
+    """The configuration work app.py used to repeat on every rerun"""
+    load_dotenv('secrets.env')
+    values = [os.getenv(name) for name in (
+        'server', 'database', 'dbusername', 'password',
+        'AZURE_STORAGE_CONNECTION_STRING', 'AZURE_STORAGE_CONTAINER_NAME', 'BLOB_BASE_URL',
+        'ADMIN_LOGIN_CRED', 'ADMIN_PASS_CRED', 'OFFICE_SENDER_EMAIL', 'OUTLOOK_APP_PASSWORD',
+    )]
+    return values, BlobServiceClient.from_connection_string(values[4])
+
+
+def time_per_call(fn, iterations):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    for name, value in PLACEHOLDER_ENV.items():
+        os.environ.setdefault(name, value)
+
+    import streamlit as st
+    from config import get_settings
+
+    @st.cache_resource
+    def get_blob_service_client():
+        return BlobServiceClient.from_connection_string(get_settings().blob_conn_str)
+
+    def cached_rerun():
+        return get_settings(), get_blob_service_client()
+
+    legacy = time_per_call(legacy_rerun, args.iterations)
+    cached = time_per_call(cached_rerun, args.iterations)
+    print(f"legacy per-rerun setup: {legacy * 1e6:9.1f} us")
+    print(f"cached per-rerun setup: {cached * 1e6:9.1f} us")
+    print(f"saved per rerun:        {(legacy - cached) * 1e6:9.1f} us ({legacy / cached:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""
+Create a SQLite database with a deterministic synthetic dataset.
+
+The same --agents, --seed and --as-of always give the same rows, so load
+tests and benchmarks against the SQLite backend are comparable run to run.
+The dataset has LGAs for every state, agents in every status (with sign-up,
+submission and decision history), a small share of duplicate applicants,
+reviewer claims and the analytics rollups. Every agent logs in as
+agentNNNNNN@example.com with the password SEED_PASSWORD. Document columns
+name blobs that do not exist, so their previews show as missing.
+
+Run the app on the result with DB_BACKEND=sqlite SQLITE_PATH=<path>, plus
+MAIL_OUTBOX_DIR and BLOB_LOCAL_DIR to keep emails and documents local.
+
+Usage:
+    python -m bench.seed_sqlite --path local.sqlite3 [--agents 10000] [--seed 42]
+        [--as-of 2026-06-30] [--days 365] [--replace]
+"""
+import argparse
+import datetime
+import hashlib
+import os
+import random
+import time
+
+from jobs.rollup_analytics import rollup
+from services import sqlite_backend
+from services.agent_ids import format_agent_id
+
+SEED_PASSWORD = 'password123'
+
+STATES = [
+    'Abia', 'Adamawa', 'Akwa Ibom', 'Anambra', 'Bauchi', 'Bayelsa', 'Benue', 'Borno', 'Cross River', 'Delta',
+    'Ebonyi', 'Edo', 'Ekiti', 'Enugu', 'Federal Capital Territory', 'Gombe', 'Imo', 'Jigawa', 'Kaduna', 'Kano',
+    'Katsina', 'Kebbi', 'Kogi', 'Kwara', 'Lagos', 'Nasarawa', 'Niger', 'Ogun', 'Ondo', 'Osun', 'Oyo', 'Plateau',
+    'Rivers', 'Sokoto', 'Taraba', 'Yobe', 'Zamfara',
+]
+REGIONS = ['North', 'South', 'East', 'West', 'Central', 'Multi-Region']
+CATEGORIES = ['Heirs Agent', 'Independent Agent']
+BANKS = ['Access Bank', 'Fidelity Bank', 'First Bank of Nigeria', 'Guaranty Trust Bank', 'Stanbic IBTC Bank', 'Zenith Bank']
+ID_TYPES = ['NIN', "Driver's License", 'International Passport', "Voter's Card"]
+FIRST_NAMES = ['Adaeze', 'Bola', 'Chinedu', 'Damilola', 'Emeka', 'Funmi', 'Garba', 'Halima', 'Ifeanyi', 'Jumoke',
+               'Kelechi', 'Lami', 'Musa', 'Ngozi', 'Olu', 'Tunde', 'Uche', 'Yemi', 'Zainab', 'Sade']
+SURNAMES = ['Adeyemi', 'Bello', 'Chukwu', 'Danjuma', 'Eze', 'Fashola', 'Ibrahim', 'Johnson', 'Okafor', 'Okonkwo',
+            'Olawale', 'Suleiman', 'Usman', 'Williams', 'Yusuf', 'Abubakar', 'Nwosu', 'Ogunleye', 'Lawal', 'Obi']
+
+# Status -> share of agents
+STATUS_MIX = [('Incomplete', 0.2), ('Pending', 0.3), ('Approved', 0.4), ('Rejected', 0.1)]
+# Share of submitted agents reusing an earlier applicant's mobile, ID or account number
+DUPLICATE_SHARE = 0.02
+# Share of pending agents claimed by one of the seeded reviewers
+CLAIMED_SHARE = 0.05
+REVIEWERS = ['admin-seed01', 'admin-seed02']
+
+INSERT_BATCH_SIZE = 5000
+
+AGENT_COLUMNS = [
+    'application_ref', 'agent_id', 'prefix', 'first_name', 'surname', 'date_of_birth', 'age', 'gender',
+    'marital_status', 'email', 'mobile_number', 'residential_address', 'state', 'lga', 'region',
+    'preferred_territory', 'Agentcategory', 'TaxID', 'nok_name', 'nok_relationship', 'nok_contact', 'id_type',
+    'id_number', 'bank_name', 'account_number', 'account_name',
+    'id_document_blob_name', 'id_document_blob_sha256', 'id_document_blob_size',
+    'passport_photo_blob_name', 'passport_photo_blob_sha256', 'passport_photo_blob_size',
+    'address_proof_blob_name', 'address_proof_blob_sha256', 'address_proof_blob_size',
+    'application_status', 'submitted_date', 'created_at', 'created_by', 'updated_at', 'claimed_by', 'lease_expires_at',
+]
+
+# Document prefix -> file extension of the seeded blob name
+DOCUMENTS = {'id_document': 'pdf', 'passport_photo': 'jpg', 'address_proof': 'pdf'}
+
+
+def lga_rows(rng):
+    return [(state, f"{state} LGA {n:02d}") for state in STATES for n in range(1, rng.randint(8, 20) + 1)]
+
+
+def pick_status(rng):
+    roll, total = rng.random(), 0.0
+    for status, share in STATUS_MIX:
+        total += share
+        if roll < total:
+            return status
+    return STATUS_MIX[-1][0]
+
+
+def synthetic_agents(count, rng, as_of, days):
+    """Yield (agent values, history rows) per agent; history rows are (from, to, changed_at, changed_by)"""
+    start = as_of - datetime.timedelta(days=days)
+    submitted = []  # (mobile, id number, account number) of earlier submitted agents, for duplicates
+    serials = {}  # two-digit year -> last agent ID serial
+    for i in range(1, count + 1):
+        email = f"agent{i:06d}@example.com"
+        created_at = start + datetime.timedelta(seconds=rng.randint(0, days * 86400))
+        status = pick_status(rng)
+        year = created_at.strftime('%y')
+        serials[year] = serials.get(year, 0) + 1
+        ref = f"APP-{created_at:%Y%m%d%H%M%S}-{i:06d}"
+        values = dict.fromkeys(AGENT_COLUMNS)
+        values.update(
+            application_ref=ref, agent_id=format_agent_id(year, serials[year]), email=email,
+            first_name='', surname='', date_of_birth=datetime.date(1990, 1, 1), mobile_number='00000000000',
+            application_status=status, created_at=created_at, created_by=email,
+        )
+        # (from_status, to_status, changed_at, changed_by, region, category); the profile is empty at sign-up
+        history = [(None, 'Incomplete', created_at, email, None, None)]
+        if status != 'Incomplete':
+            first, surname = rng.choice(FIRST_NAMES), rng.choice(SURNAMES)
+            dob = datetime.date(rng.randint(1965, 2004), rng.randint(1, 12), rng.randint(1, 28))
+            mobile = f"080{rng.randint(10000000, 99999999)}"
+            id_number = f"{rng.randint(10 ** 10, 10 ** 11 - 1)}"
+            account = f"{rng.randint(10 ** 9, 10 ** 10 - 1)}"
+            if submitted and rng.random() < DUPLICATE_SHARE:
+                match = rng.randrange(3)
+                earlier = rng.choice(submitted)
+                mobile, id_number, account = [earlier[k] if k == match else value
+                                              for k, value in enumerate((mobile, id_number, account))]
+            submitted.append((mobile, id_number, account))
+            state = rng.choice(STATES)
+            submitted_at = created_at + datetime.timedelta(minutes=rng.randint(5, 14 * 24 * 60))
+            values.update(
+                prefix=rng.choice(['Mr', 'Mrs', 'Miss', 'Dr']), first_name=first, surname=surname,
+                date_of_birth=dob, age=as_of.year - dob.year, gender=rng.choice(['Male', 'Female']),
+                marital_status=rng.choice(['Single', 'Married']), mobile_number=mobile,
+                residential_address=f"{rng.randint(1, 200)} {rng.choice(SURNAMES)} Street, {state}",
+                state=state, lga=f"{state} LGA 01", region=rng.choice(REGIONS),
+                preferred_territory=state, Agentcategory=rng.choice(CATEGORIES), TaxID=f"TIN{rng.randint(10 ** 7, 10 ** 8 - 1)}",
+                nok_name=f"{rng.choice(FIRST_NAMES)} {surname}", nok_relationship=rng.choice(['Spouse', 'Parent', 'Sibling']),
+                nok_contact=f"081{rng.randint(10000000, 99999999)}", id_type=rng.choice(ID_TYPES), id_number=id_number,
+                bank_name=rng.choice(BANKS), account_number=account, account_name=f"{first} {surname}",
+                submitted_date=submitted_at, updated_at=submitted_at,
+            )
+            for doc, extension in DOCUMENTS.items():
+                values[f'{doc}_blob_name'] = f"{doc}/{ref}_{doc}_{submitted_at:%Y%m%d%H%M%S}.{extension}"
+                values[f'{doc}_blob_sha256'] = hashlib.sha256(f"{ref}/{doc}".encode()).hexdigest()
+                values[f'{doc}_blob_size'] = rng.randint(50_000, 4_000_000)
+            history.append(('Incomplete', 'Pending', submitted_at, email, values['region'], values['Agentcategory']))
+            if status in ('Approved', 'Rejected'):
+                decided_at = submitted_at + datetime.timedelta(minutes=rng.randint(30, 21 * 24 * 60))
+                values['updated_at'] = decided_at
+                history.append(('Pending', status, decided_at, rng.choice(REVIEWERS), values['region'], values['Agentcategory']))
+            elif rng.random() < CLAIMED_SHARE:
+                # Leased as of the dataset's last day, so lapsed by the time the app runs on it
+                values['claimed_by'] = rng.choice(REVIEWERS)
+                values['lease_expires_at'] = as_of + datetime.timedelta(minutes=15)
+        yield values, history
+
+
+def seed(conn, count, rng, as_of, days):
+    """Insert the dataset in batches; returns the number of agents"""
+    cursor = conn.cursor()
+    cursor.executemany("INSERT INTO dim_nigerian_states_lgas (state_name, lga_name) VALUES (?, ?)", lga_rows(rng))
+    password_hash = hashlib.sha256(SEED_PASSWORD.encode()).hexdigest()
+    agents = synthetic_agents(count, rng, as_of, days)
+    next_id = 1
+    while True:
+        batch = [agent for _, agent in zip(range(INSERT_BATCH_SIZE), agents)]
+        if not batch:
+            break
+        ids = range(next_id, next_id + len(batch))
+        cursor.executemany(
+            f"INSERT INTO agents (id, {', '.join(AGENT_COLUMNS)}) VALUES (?, {', '.join('?' * len(AGENT_COLUMNS))})",
+            [(agent_id, *[values[col] for col in AGENT_COLUMNS]) for agent_id, (values, _) in zip(ids, batch)]
+        )
+        cursor.executemany("""
+            INSERT INTO agent_credentials (agent_id, email, password_hash, is_active, created_at)
+            VALUES (?, ?, ?, 1, ?)
+        """, [(agent_id, values['email'], password_hash, values['created_at']) for agent_id, (values, _) in zip(ids, batch)])
+        cursor.executemany("""
+            INSERT INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by, region, category)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(agent_id, *change) for agent_id, (_, history) in zip(ids, batch) for change in history])
+        conn.commit()
+        next_id += len(batch)
+    return next_id - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default=os.getenv('SQLITE_PATH'), required=not os.getenv('SQLITE_PATH'),
+                        help='Database file (default: $SQLITE_PATH)')
+    parser.add_argument('--agents', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--as-of', type=datetime.date.fromisoformat, default=datetime.date(2026, 6, 30),
+                        help='Last day of the dataset (sign-ups are spread over the --days before it)')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--replace', action='store_true', help='Delete an existing database file first')
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        if not args.replace:
+            parser.error(f"{args.path} already exists; use --replace to recreate it")
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.path + suffix):
+                os.remove(args.path + suffix)
+
+    started = time.perf_counter()
+    as_of = datetime.datetime.combine(args.as_of, datetime.time(23, 59))
+    conn = sqlite_backend.connect(args.path)
+    count = seed(conn, args.agents, random.Random(args.seed), as_of, args.days)
+    print(f"Seeded {count} agents in {time.perf_counter() - started:.1f}s")
+    history = rollup(conn, INSERT_BATCH_SIZE)
+    conn.close()
+    print(f"Done: {args.path} ({os.path.getsize(args.path) / 1e6:.1f} MB), {history} history rows rolled up")
+
+
+if __name__ == '__main__':
+    main()
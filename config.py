@@ -0,0 +1,146 @@
+"""
+Application settings.
+
+Environment variables (and secrets.env) are read and validated once per
+process into a frozen Settings object. Streamlit reruns and background jobs
+share the same instance through get_settings().
+"""
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True)
+class SmtpSettings:
+    sender_email: str
+    app_password: str
+    host: str = 'smtp.office365.com'
+    port: int = 587
+
+
+@dataclass(frozen=True)
+class Settings:
+    db_server: str
+    db_name: str
+    db_username: str
+    db_password: str
+    blob_conn_str: str
+    blob_container: str
+    blob_base_url: str
+    admin_login: str
+    admin_password: str
+    smtp: SmtpSettings
+    upload_spool_dir: str
+    upload_spool_max_mb: int
+    upload_spool_ttl_minutes: int
+
+    db_read_server: str
+    db_read_max_staleness_seconds: int
+
+    otel_endpoint: str
+
+    slow_query_ms: int
+    slow_query_log: str
+
+    profile_secret: str
+    profile_dir: str
+
+    db_backend: str
+    sqlite_path: str
+    mail_outbox_dir: str
+    blob_local_dir: str
+
+    def _connection_string(self, server):
+        return (
+            "DRIVER={ODBC Driver 17 for SQL Server};SERVER="
+            + server
+            + ';DATABASE='
+            + self.db_name
+            + ';UID='
+            + self.db_username
+            + ';PWD='
+            + self.db_password
+        )
+
+    @property
+    def db_connection_string(self):
+        return self._connection_string(self.db_server)
+
+    @property
+    def db_read_connection_string(self):
+        """Read-only intent routes to a readable secondary (Always On / Azure read scale-out)"""
+        return self._connection_string(self.db_read_server) + ';ApplicationIntent=ReadOnly;MultiSubnetFailover=Yes'
+
+
+DB_BACKENDS = ['mssql', 'sqlite']
+
+# Setting name -> environment variable
+REQUIRED_ENV = {
+    'db_server': 'server',
+    'db_name': 'database',
+    'db_username': 'dbusername',
+    'db_password': 'password',
+    'blob_conn_str': 'AZURE_STORAGE_CONNECTION_STRING',
+    'blob_container': 'AZURE_STORAGE_CONTAINER_NAME',
+    'blob_base_url': 'BLOB_BASE_URL',
+}
+
+# Only needed when the app talks to SQL Server / Azure Blob Storage
+SQL_SERVER_ENV = ['server', 'database', 'dbusername', 'password']
+AZURE_BLOB_ENV = ['AZURE_STORAGE_CONNECTION_STRING', 'AZURE_STORAGE_CONTAINER_NAME', 'BLOB_BASE_URL']
+
+
+def _int_env(name, default):
+    value = os.getenv(name)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise RuntimeError(f"Setting {name} must be an integer, got {value!r}")
+
+
+@lru_cache(maxsize=None)
+def get_settings(env_file='secrets.env'):
+    """Load and validate settings once; later calls return the same object"""
+    load_dotenv(env_file)
+    db_backend = os.getenv('DB_BACKEND') or 'mssql'
+    if db_backend not in DB_BACKENDS:
+        raise RuntimeError(f"Setting DB_BACKEND must be one of {', '.join(DB_BACKENDS)}, got {db_backend!r}")
+    optional = (SQL_SERVER_ENV if db_backend == 'sqlite' else []) + (AZURE_BLOB_ENV if os.getenv('BLOB_LOCAL_DIR') else [])
+    missing = [env for env in REQUIRED_ENV.values() if not os.getenv(env) and env not in optional]
+    if missing:
+        raise RuntimeError(f"Missing required settings: {', '.join(missing)}")
+    return Settings(
+        **{field: os.getenv(env) for field, env in REQUIRED_ENV.items()},
+        admin_login=os.getenv('ADMIN_LOGIN_CRED'),
+        admin_password=os.getenv('ADMIN_PASS_CRED'),
+        smtp=SmtpSettings(
+            sender_email=os.getenv('OFFICE_SENDER_EMAIL'),
+            app_password=os.getenv('OUTLOOK_APP_PASSWORD'),
+        ),
+        upload_spool_dir=os.getenv('UPLOAD_SPOOL_DIR') or os.path.join(tempfile.gettempdir(), 'agent-upload-spool'),
+        upload_spool_max_mb=_int_env('UPLOAD_SPOOL_MAX_MB', 512),
+        upload_spool_ttl_minutes=_int_env('UPLOAD_SPOOL_TTL_MINUTES', 120),
+        # Admin reporting reads go to this server when set (may equal `server` for read scale-out)
+        db_read_server=os.getenv('DB_READ_SERVER') or None,
+        db_read_max_staleness_seconds=_int_env('DB_READ_MAX_STALENESS_SECONDS', 30),
+        # Optional OpenTelemetry collector for the timing spans, e.g. http://localhost:4318
+        otel_endpoint=os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT') or None,
+        # Statements slower than this are logged with their plan: to a JSON-lines file, or 'table' for slow_query_log
+        slow_query_ms=_int_env('SLOW_QUERY_MS', 500),
+        slow_query_log=os.getenv('SLOW_QUERY_LOG') or os.path.join(tempfile.gettempdir(), 'agent-slow-queries.jsonl'),
+        # ?profile=<secret> profiles a session's next reruns; unset disables the query parameter
+        profile_secret=os.getenv('PROFILE_SECRET') or None,
+        profile_dir=os.getenv('PROFILE_DIR') or os.path.join(tempfile.gettempdir(), 'agent-profiles'),
+        # sqlite runs the app on a local file (see services/sqlite_backend.py and bench/seed_sqlite.py)
+        db_backend=db_backend,
+        sqlite_path=os.getenv('SQLITE_PATH') or os.path.join(tempfile.gettempdir(), 'agent-onboarding.sqlite3'),
+        # When set, emails are written here as .eml files instead of being sent (local runs, load tests)
+        mail_outbox_dir=os.getenv('MAIL_OUTBOX_DIR') or None,
+        # When set, documents are stored as files under this directory instead of Azure Blob Storage
+        blob_local_dir=os.getenv('BLOB_LOCAL_DIR') or None,
+    )
@@ -0,0 +1,171 @@
+"""
+Archive agent rows past their retention window.
+
+Three kinds of rows are moved out of agents (and agent_credentials) into the
+*_archive tables:
+  abandoned_signup   placeholder rows from create_account that never got a
+                     name or submission, older than --placeholder-days
+  stale_incomplete   other Incomplete applications untouched for --incomplete-days
+  rejected           Rejected applications decided more than --rejected-days ago
+Pending and Approved agents are never archived. agent_status_history is kept
+so the analytics rollups stay complete.
+
+Each batch is selected with UPDLOCK/READPAST, copied and deleted in one
+transaction. The documents of archived rows are then moved to the Archive
+(or Cool) tier or deleted. Every archived row and blob action is appended to
+a JSON-lines manifest.
+
+Usage:
+    python -m jobs.archive_agents [--placeholder-days 30] [--incomplete-days 180]
+        [--rejected-days 365] [--blob-action archive|cool|delete|keep]
+        [--batch-size 500] [--manifest archive-YYYYmmdd-HHMMSS.jsonl] [--dry-run]
+"""
+import argparse
+import datetime
+import json
+
+import pyodbc
+from azure.storage.blob import BlobServiceClient
+
+from config import get_settings
+
+DOCUMENT_COLUMNS = ['id_document', 'passport_photo', 'address_proof']
+
+BLOB_TIERS = {'archive': 'Archive', 'cool': 'Cool'}
+
+RETENTION_REASON = """
+    CASE
+        WHEN application_status = 'Incomplete' AND submitted_date IS NULL
+             AND COALESCE(first_name, '') = '' AND COALESCE(surname, '') = ''
+             AND created_at < DATEADD(day, -?, SYSDATETIME()) THEN 'abandoned_signup'
+        WHEN application_status = 'Incomplete'
+             AND COALESCE(updated_at, created_at) < DATEADD(day, -?, SYSDATETIME()) THEN 'stale_incomplete'
+        WHEN application_status = 'Rejected'
+             AND COALESCE(updated_at, submitted_date) < DATEADD(day, -?, SYSDATETIME()) THEN 'rejected'
+    END
+"""
+
+
+def select_batch(cursor, last_id, batch_size, retention, lock):
+    """Next batch of rows due for archiving (locked until commit when lock is set)"""
+    hints = "WITH (UPDLOCK, READPAST, ROWLOCK)" if lock else ""
+    cursor.execute(f"""
+        SELECT TOP (?) id, agent_id, email, application_status, reason,
+            id_document_blob_name, passport_photo_blob_name, address_proof_blob_name
+        FROM (
+            SELECT *, {RETENTION_REASON} AS reason FROM agents {hints}
+            WHERE id > ? AND application_status IN ('Incomplete', 'Rejected')
+        ) AS due
+        WHERE reason IS NOT NULL
+        ORDER BY id
+    """, (batch_size, *retention, last_id))
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def archive_batch(conn, cursor, rows):
+    """Copy a locked batch into the archive tables and delete it, in the current transaction"""
+    cursor.execute("IF OBJECT_ID('tempdb..#archive_batch') IS NOT NULL DROP TABLE #archive_batch")
+    cursor.execute("CREATE TABLE #archive_batch (id INT PRIMARY KEY, reason NVARCHAR(30) NOT NULL)")
+    cursor.executemany("INSERT INTO #archive_batch (id, reason) VALUES (?, ?)", [(row['id'], row['reason']) for row in rows])
+    cursor.execute("""
+        INSERT INTO agents_archive (id, agent_id, email, application_status, reason, archived_at, record)
+        SELECT a.id, a.agent_id, a.email, a.application_status, b.reason, SYSDATETIME(),
+            (SELECT a.* FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES)
+        FROM agents a JOIN #archive_batch b ON b.id = a.id
+    """)
+    cursor.execute("""
+        INSERT INTO agent_credentials_archive (agent_id, archived_at, record)
+        SELECT c.agent_id, SYSDATETIME(), (SELECT c.* FOR JSON PATH, WITHOUT_ARRAY_WRAPPER, INCLUDE_NULL_VALUES)
+        FROM agent_credentials c JOIN #archive_batch b ON b.id = c.agent_id
+    """)
+    cursor.execute("DELETE c FROM agent_credentials c JOIN #archive_batch b ON b.id = c.agent_id")
+    cursor.execute("DELETE a FROM agents a JOIN #archive_batch b ON b.id = a.id")
+    conn.commit()
+
+
+def retire_blob(container_client, blob_name, action):
+    """Apply the blob action; returns a short result for the manifest"""
+    blob_client = container_client.get_blob_client(blob_name)
+    try:
+        if action == 'delete':
+            blob_client.delete_blob(delete_snapshots='include')
+            return 'deleted'
+        blob_client.set_standard_blob_tier(BLOB_TIERS[action])
+        return f'tier:{BLOB_TIERS[action]}'
+    except Exception as e:
+        return f'error: {e}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--placeholder-days', type=int, default=30)
+    parser.add_argument('--incomplete-days', type=int, default=180)
+    parser.add_argument('--rejected-days', type=int, default=365)
+    parser.add_argument('--blob-action', choices=['archive', 'cool', 'delete', 'keep'], default='archive')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--manifest', help='JSON-lines manifest path (default: archive-<timestamp>.jsonl)')
+    parser.add_argument('--dry-run', action='store_true', help='List what would be archived; change nothing')
+    args = parser.parse_args()
+
+    retention = (args.placeholder_days, args.incomplete_days, args.rejected_days)
+    manifest_path = args.manifest or f"archive-{datetime.datetime.now():%Y%m%d-%H%M%S}.jsonl"
+
+    settings = get_settings()
+    container_client = BlobServiceClient.from_connection_string(
+        settings.blob_conn_str
+    ).get_container_client(settings.blob_container)
+
+    conn = pyodbc.connect(settings.db_connection_string)
+    cursor = conn.cursor()
+    cursor.fast_executemany = True
+
+    last_id = 0
+    totals = {}
+    with open(manifest_path, 'a', encoding='utf-8') as manifest:
+        while True:
+            rows = select_batch(cursor, last_id, args.batch_size, retention, lock=not args.dry_run)
+            if not rows:
+                break
+            if not args.dry_run:
+                try:
+                    archive_batch(conn, cursor, rows)
+                except Exception as e:
+                    conn.rollback()
+                    raise SystemExit(f"Archiving batch after id {last_id} failed: {e}")
+
+            archived_at = datetime.datetime.now().isoformat(timespec='seconds')
+            for row in rows:
+                blobs = []
+                for doc in DOCUMENT_COLUMNS:
+                    blob_name = row[f'{doc}_blob_name']
+                    if not blob_name:
+                        continue
+                    if args.dry_run or args.blob_action == 'keep':
+                        result = 'kept'
+                    else:
+                        result = retire_blob(container_client, blob_name, args.blob_action)
+                    blobs.append({'blob_name': blob_name, 'result': result})
+                manifest.write(json.dumps({
+                    'id': row['id'],
+                    'agent_id': row['agent_id'],
+                    'email': row['email'],
+                    'status': row['application_status'],
+                    'reason': row['reason'],
+                    'archived_at': archived_at,
+                    'dry_run': args.dry_run,
+                    'blobs': blobs,
+                }) + '\n')
+                totals[row['reason']] = totals.get(row['reason'], 0) + 1
+            manifest.flush()
+
+            last_id = rows[-1]['id']
+            print(f"{'Found' if args.dry_run else 'Archived'} {sum(totals.values())} agents (last id {last_id})")
+
+    conn.close()
+    summary = ', '.join(f"{count} {reason}" for reason, count in sorted(totals.items())) or 'nothing due'
+    print(f"Done: {summary}{' (dry run)' if args.dry_run else ''}; manifest: {manifest_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Backfill compact blob references on existing agent rows.
+
+Older rows carry a 10-year SAS URL in each *_blob_url column. This job parses
+the blob name out of the URL one last time, records the blob's content hash
+and size, and clears the URL so only the compact reference remains. A URL is
+only cleared once its blob has been found in the container; documents that do
+not resolve keep their URL (and stored name) and are counted in the summary.
+
+Usage:
+    python -m jobs.backfill_blob_refs [--batch-size 500] [--skip-hash] [--dry-run]
+"""
+import argparse
+import hashlib
+from urllib.parse import urlparse, unquote
+
+import pyodbc
+from azure.storage.blob import BlobServiceClient
+
+from config import get_settings
+
+DOCUMENT_COLUMNS = ['id_document', 'passport_photo', 'address_proof']
+
+
+def blob_name_from_url(blob_url, container):
+    """Extract the blob name from a stored blob URL (SAS token stripped); None if it is in another container"""
+    path = unquote(urlparse(blob_url).path).lstrip('/')
+    if not path.startswith(f'{container}/'):
+        return None
+    return path[len(f'{container}/'):] or None
+
+
+def describe_blob(container_client, blob_name, skip_hash):
+    """Return (sha256, size) for a blob, streaming the content for the hash"""
+    blob_client = container_client.get_blob_client(blob_name)
+    if skip_hash:
+        return None, blob_client.get_blob_properties().size
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in blob_client.download_blob().chunks():
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def fetch_batch(cursor, last_id, batch_size):
+    """Fetch the next batch of rows that still carry a blob URL"""
+    cursor.execute("""
+        SELECT TOP (?) id,
+            id_document_blob_url, id_document_blob_name,
+            passport_photo_blob_url, passport_photo_blob_name,
+            address_proof_blob_url, address_proof_blob_name
+        FROM agents
+        WHERE id > ?
+          AND (id_document_blob_url IS NOT NULL
+               OR passport_photo_blob_url IS NOT NULL
+               OR address_proof_blob_url IS NOT NULL)
+        ORDER BY id
+    """, (batch_size, last_id))
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+# Each document's columns are only written (and its URL cleared) when its blob was found
+UPDATE_SQL = f"""
+    UPDATE agents SET {', '.join(
+        f"{doc}_blob_name = CASE WHEN ? = 1 THEN ? ELSE {doc}_blob_name END, "
+        f"{doc}_blob_sha256 = CASE WHEN ? = 1 THEN ? ELSE {doc}_blob_sha256 END, "
+        f"{doc}_blob_size = CASE WHEN ? = 1 THEN ? ELSE {doc}_blob_size END, "
+        f"{doc}_blob_url = CASE WHEN ? = 1 THEN NULL ELSE {doc}_blob_url END"
+        for doc in DOCUMENT_COLUMNS
+    )}
+    WHERE id = ?
+"""
+
+
+def normalize_row(row, container_client, container, skip_hash):
+    """
+    Build the update parameters for one row
+    Returns: (params, unresolved) where unresolved lists the documents whose
+    URL could not be matched to a blob in the container (left untouched)
+    """
+    params = []
+    unresolved = []
+    for doc in DOCUMENT_COLUMNS:
+        blob_name = row[f'{doc}_blob_name']
+        if not blob_name and row[f'{doc}_blob_url']:
+            blob_name = blob_name_from_url(row[f'{doc}_blob_url'], container)
+        sha256 = size = None
+        resolved = False
+        if blob_name:
+            try:
+                sha256, size = describe_blob(container_client, blob_name, skip_hash)
+                resolved = True
+            except Exception as e:
+                print(f"  agent {row['id']}: unable to read {blob_name}: {e}")
+        elif row[f'{doc}_blob_url']:
+            print(f"  agent {row['id']}: {doc} URL is not in container {container}")
+        if row[f'{doc}_blob_url'] and not resolved:
+            unresolved.append(doc)
+        flag = 1 if resolved else 0
+        params.extend([flag, blob_name, flag, sha256, flag, size, flag])
+    params.append(row['id'])
+    return params, unresolved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--skip-hash', action='store_true', help='Record sizes only; do not download blobs to hash them')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    settings = get_settings()
+    container = settings.blob_container
+    container_client = BlobServiceClient.from_connection_string(
+        settings.blob_conn_str
+    ).get_container_client(container)
+
+    conn = pyodbc.connect(settings.db_connection_string)
+    read_cursor = conn.cursor()
+    write_cursor = conn.cursor()
+    write_cursor.fast_executemany = True
+
+    last_id = 0
+    total = unresolved_rows = 0
+    while True:
+        rows = fetch_batch(read_cursor, last_id, args.batch_size)
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            params, unresolved = normalize_row(row, container_client, container, args.skip_hash)
+            updates.append(params)
+            unresolved_rows += bool(unresolved)
+        if not args.dry_run:
+            write_cursor.executemany(UPDATE_SQL, updates)
+            conn.commit()
+        last_id = rows[-1]['id']
+        total += len(rows)
+        print(f"{'Checked' if args.dry_run else 'Normalized'} {total} rows (last id {last_id})")
+
+    conn.close()
+    print(f"Done: {total} rows {'would be ' if args.dry_run else ''}normalized, "
+          f"{unresolved_rows} with documents left unresolved (URL kept)")
+
+
+if __name__ == '__main__':
+    main()
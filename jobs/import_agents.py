@@ -0,0 +1,186 @@
+"""
+Bulk import agents from a CSV or XLSX file.
+
+The file is read and validated in one streaming pass. Valid rows are inserted
+in chunks: each chunk reserves a block of AVH/ISA/YY/XXXXX IDs, inserts its
+agents, agent_credentials and agent_status_history rows with
+fast_executemany, and commits as one transaction. A failed chunk is rolled
+back on its own and the import carries on. Every rejected row is written to
+the error report with its row number.
+
+Required columns: email, first_name, surname. Optional: see
+services.agent_import.IMPORT_COLUMNS. Rows without a password get an
+unusable one and cannot sign in until a password is set.
+
+Usage:
+    python -m jobs.import_agents agents.xlsx [--chunk-size 5000]
+        [--status Incomplete] [--report agents.errors.csv] [--dry-run]
+"""
+import argparse
+import csv
+import datetime
+import time
+
+import pyodbc
+
+from config import get_settings
+from services.agent_ids import allocate_agent_ids, format_agent_id
+from services.agent_import import import_source_name, read_rows, validate_row
+
+AGENT_COLUMNS = [
+    'application_ref', 'agent_id', 'prefix', 'first_name', 'surname', 'date_of_birth', 'age',
+    'gender', 'marital_status', 'mobile_number', 'email', 'residential_address', 'state', 'lga',
+    'region', 'preferred_territory', 'Agentcategory', 'TaxID', 'id_type', 'id_number',
+    'bank_name', 'account_number', 'account_name', 'application_status', 'created_at', 'created_by',
+    'submitted_date',
+]
+
+# SQL Server accepts at most 2100 parameters per statement
+LOOKUP_CHUNK_SIZE = 2000
+
+
+def existing_emails(cursor, emails):
+    """Return the subset of emails that already have credentials"""
+    found = set()
+    emails = list(emails)
+    for start in range(0, len(emails), LOOKUP_CHUNK_SIZE):
+        chunk = emails[start:start + LOOKUP_CHUNK_SIZE]
+        cursor.execute(
+            f"SELECT LOWER(email) FROM agent_credentials WHERE email IN ({', '.join('?' * len(chunk))})",
+            chunk
+        )
+        found.update(row[0] for row in cursor.fetchall())
+    return found
+
+
+def insert_chunk(conn, cursor, rows, status, created_by):
+    """Insert one chunk of validated rows in a single transaction; returns the number inserted"""
+    created_at = datetime.datetime.now()
+    year, first_serial = allocate_agent_ids(cursor, len(rows))
+    agent_params = []
+    for offset, (row_number, values) in enumerate(rows):
+        serial = first_serial + offset
+        values.update(
+            agent_id=format_agent_id(year, serial),
+            application_ref=f"APP-{created_at:%Y%m%d%H%M%S}-{serial:05d}",
+            application_status=status,
+            created_at=created_at,
+            created_by=created_by,
+            # Imported as Pending means submitted on import, as far as sorting, rollups and retention go
+            submitted_date=created_at if status == 'Pending' else None,
+        )
+        agent_params.append([values[col] for col in AGENT_COLUMNS])
+
+    cursor.executemany(
+        f"INSERT INTO agents ({', '.join(AGENT_COLUMNS)}) VALUES ({', '.join('?' * len(AGENT_COLUMNS))})",
+        agent_params
+    )
+
+    # The block is contiguous, so one range query returns every new primary key
+    cursor.execute("""
+        SELECT agent_id, id FROM agents
+        WHERE agent_id LIKE ? AND LEN(agent_id) > 14
+          AND CAST(RIGHT(agent_id, 5) AS INT) BETWEEN ? AND ?
+    """, (f'AVH/ISA/{year}/%', first_serial, first_serial + len(rows) - 1))
+    db_ids = dict(cursor.fetchall())
+
+    cursor.executemany("""
+        INSERT INTO agent_credentials (agent_id, email, password_hash, is_active, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    """, [
+        (db_ids[values['agent_id']], values['email'], values['password_hash'], 1, created_at)
+        for _, values in rows
+    ])
+    cursor.executemany("""
+        INSERT INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by, region, category)
+        VALUES (?, NULL, ?, ?, ?, ?, ?)
+    """, [
+        (db_ids[values['agent_id']], status, created_at, created_by, values['region'], values['Agentcategory'])
+        for _, values in rows
+    ])
+    conn.commit()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='CSV or XLSX file with a header row')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--status', default='Incomplete', choices=['Incomplete', 'Pending'],
+                        help='Application status for imported agents (Pending ones are submitted as of the import)')
+    parser.add_argument('--report', help='Error report path (default: <path>.errors.csv)')
+    parser.add_argument('--dry-run', action='store_true', help='Validate only; nothing is written to the database')
+    args = parser.parse_args()
+
+    report_path = args.report or f"{args.path}.errors.csv"
+    created_by = import_source_name(args.path)
+
+    conn = pyodbc.connect(get_settings().db_connection_string)
+    cursor = conn.cursor()
+    cursor.fast_executemany = True
+
+    started = time.monotonic()
+    seen_emails = set()
+    total = inserted = rejected = without_password = 0
+
+    with open(report_path, 'w', newline='', encoding='utf-8') as report_file:
+        report = csv.writer(report_file)
+        report.writerow(['row', 'email', 'error'])
+
+        def reject(row_number, email, error):
+            nonlocal rejected
+            report.writerow([row_number, email, error])
+            rejected += 1
+
+        def flush(chunk):
+            nonlocal inserted, without_password
+            if not chunk:
+                return
+            taken = existing_emails(cursor, [values['email'] for _, values in chunk])
+            for row_number, values in chunk:
+                if values['email'] in taken:
+                    reject(row_number, values['email'], 'An account with this email already exists')
+            chunk = [(row_number, values) for row_number, values in chunk if values['email'] not in taken]
+            if args.dry_run:
+                inserted += len(chunk)
+                return
+            if not chunk:
+                return
+            try:
+                inserted += insert_chunk(conn, cursor, chunk, args.status, created_by)
+                without_password += sum(not values['has_password'] for _, values in chunk)
+            except Exception as e:
+                conn.rollback()
+                for row_number, values in chunk:
+                    reject(row_number, values['email'], f'Chunk not imported: {e}')
+            print(f"Imported {inserted} agents, rejected {rejected} rows ({time.monotonic() - started:.1f}s)")
+
+        chunk = []
+        for row_number, raw in read_rows(args.path):
+            total += 1
+            values, error = validate_row(raw)
+            if error:
+                reject(row_number, raw.get('email'), error)
+                continue
+            if values['email'] in seen_emails:
+                reject(row_number, values['email'], 'Duplicate email earlier in this file')
+                continue
+            seen_emails.add(values['email'])
+            chunk.append((row_number, values))
+            if len(chunk) >= args.chunk_size:
+                flush(chunk)
+                chunk = []
+        flush(chunk)
+
+    conn.close()
+    elapsed = time.monotonic() - started
+    print(
+        f"Done in {elapsed:.1f}s: {total} rows read, {inserted} {'would be ' if args.dry_run else ''}imported "
+        f"({inserted / max(elapsed, 1e-9):.0f} rows/s), {rejected} rejected (see {report_path})"
+    )
+    if without_password:
+        print(f"{without_password} imported agents have no password and must have one set before they can sign in")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Fold new agent status history into the daily analytics rollups.
+
+Processes agent_status_history rows after the last recorded id, in batches,
+adding to analytics_daily_status (transitions into and out of each status)
+and analytics_daily_durations (time-to-submit and time-to-decision
+histograms). Region and category are the ones recorded on each history row
+(migration 010): a transition into a status is filed under the row's values
+and the exit from the previous status under the values of the agent's
+previous history row, so the two sides of every status always balance, even
+after the agent fills in or edits their profile. Each batch commits together with the new watermark, so the job
+can be stopped and rerun at any time. Run it daily (or more often).
+
+Rows from the last few minutes are left for the next run, so transactions
+still in flight when the job starts are never skipped. Works against the
+SQLite backend too (DB_BACKEND=sqlite).
+
+Usage:
+    python -m jobs.rollup_analytics [--batch-size 5000] [--rebuild]
+"""
+import argparse
+from collections import defaultdict
+
+from config import get_settings
+from services import sqlite_backend
+from services.analytics import UNKNOWN, duration_bucket
+
+ROLLUP_NAME = 'onboarding'
+
+# History rows younger than this are left for the next run
+SETTLE_MINUTES = 5
+
+DECISIONS = ('Approved', 'Rejected')
+
+
+def processing_limit(cursor):
+    """Highest history id that is safe to process (every lower id is committed)"""
+    cursor.execute("""
+        SELECT COALESCE(
+            (SELECT MIN(id) - 1 FROM agent_status_history WHERE changed_at >= DATEADD(minute, -?, SYSDATETIME())),
+            (SELECT MAX(id) FROM agent_status_history),
+            0)
+    """, (SETTLE_MINUTES,))
+    return cursor.fetchone()[0]
+
+
+def fetch_batch(cursor, last_id, limit_id, batch_size):
+    """
+    Next history rows with the keys to file their entry and exit under, and
+    the start times their durations need (all read from the history itself)
+    """
+    cursor.execute("""
+        SELECT TOP (?) h.id, h.from_status, h.to_status, h.changed_at,
+            COALESCE(h.region, ?), COALESCE(h.category, ?),
+            COALESCE(CASE WHEN p.id IS NULL THEN h.region ELSE p.region END, ?),
+            COALESCE(CASE WHEN p.id IS NULL THEN h.category ELSE p.category END, ?),
+            (SELECT MIN(s.changed_at) FROM agent_status_history s
+             WHERE s.agent_id = h.agent_id AND s.from_status IS NULL),
+            (SELECT MAX(s.changed_at) FROM agent_status_history s
+             WHERE s.agent_id = h.agent_id AND s.to_status = 'Pending' AND s.id < h.id)
+        FROM agent_status_history h
+        LEFT JOIN agent_status_history p ON p.id = (
+            SELECT MAX(q.id) FROM agent_status_history q WHERE q.agent_id = h.agent_id AND q.id < h.id)
+        WHERE h.id > ? AND h.id <= ?
+        ORDER BY h.id
+    """, (batch_size, UNKNOWN, UNKNOWN, UNKNOWN, UNKNOWN, last_id, limit_id))
+    return cursor.fetchall()
+
+
+def aggregate(rows):
+    """Return (status_counts, duration_counts) deltas for a batch of history rows"""
+    status_counts = defaultdict(lambda: [0, 0])
+    duration_counts = defaultdict(int)
+    for _, from_status, to_status, changed_at, region, category, from_region, from_category, created_at, submitted_at in rows:
+        day = changed_at.date()
+        status_counts[(day, region, category, to_status)][0] += 1
+        if from_status:
+            # The exit balances the entry the previous history row recorded
+            status_counts[(day, from_region, from_category, from_status)][1] += 1
+
+        started = None
+        if to_status == 'Pending' and from_status in (None, 'Incomplete'):
+            metric, started = 'time_to_submit', created_at
+        elif to_status in DECISIONS and from_status == 'Pending':
+            metric, started = 'time_to_decision', submitted_at
+        if started is not None:
+            hours = (changed_at - started).total_seconds() / 3600
+            duration_counts[(day, region, category, metric, duration_bucket(hours))] += 1
+    return status_counts, duration_counts
+
+
+def apply_batch(conn, cursor, status_counts, duration_counts, last_id):
+    """Add a batch's deltas to the rollups and move the watermark, in one transaction"""
+    if sqlite_backend.is_sqlite(cursor):
+        apply_batch_sqlite(conn, cursor, status_counts, duration_counts, last_id)
+        return
+    if status_counts:
+        cursor.executemany("""
+            MERGE analytics_daily_status AS t
+            USING (SELECT ? AS day, ? AS region, ? AS category, ? AS status, ? AS entered, ? AS exited) AS s
+            ON t.day = s.day AND t.region = s.region AND t.category = s.category AND t.status = s.status
+            WHEN MATCHED THEN UPDATE SET entered = t.entered + s.entered, exited = t.exited + s.exited
+            WHEN NOT MATCHED THEN INSERT (day, region, category, status, entered, exited)
+                VALUES (s.day, s.region, s.category, s.status, s.entered, s.exited);
+        """, [(*key, entered, exited) for key, (entered, exited) in status_counts.items()])
+    if duration_counts:
+        cursor.executemany("""
+            MERGE analytics_daily_durations AS t
+            USING (SELECT ? AS day, ? AS region, ? AS category, ? AS metric, ? AS bucket_hours, ? AS samples) AS s
+            ON t.day = s.day AND t.region = s.region AND t.category = s.category
+               AND t.metric = s.metric AND t.bucket_hours = s.bucket_hours
+            WHEN MATCHED THEN UPDATE SET samples = t.samples + s.samples
+            WHEN NOT MATCHED THEN INSERT (day, region, category, metric, bucket_hours, samples)
+                VALUES (s.day, s.region, s.category, s.metric, s.bucket_hours, s.samples);
+        """, [(*key, samples) for key, samples in duration_counts.items()])
+    cursor.execute("""
+        MERGE analytics_rollup_state AS t
+        USING (SELECT ? AS name, ? AS last_history_id) AS s ON t.name = s.name
+        WHEN MATCHED THEN UPDATE SET last_history_id = s.last_history_id
+        WHEN NOT MATCHED THEN INSERT (name, last_history_id) VALUES (s.name, s.last_history_id);
+    """, (ROLLUP_NAME, last_id))
+    conn.commit()
+
+
+def apply_batch_sqlite(conn, cursor, status_counts, duration_counts, last_id):
+    """apply_batch for the SQLite backend, with upserts in place of MERGE"""
+    cursor.executemany("""
+        INSERT INTO analytics_daily_status (day, region, category, status, entered, exited)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (day, region, category, status)
+        DO UPDATE SET entered = entered + excluded.entered, exited = exited + excluded.exited
+    """, [(*key, entered, exited) for key, (entered, exited) in status_counts.items()])
+    cursor.executemany("""
+        INSERT INTO analytics_daily_durations (day, region, category, metric, bucket_hours, samples)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (day, region, category, metric, bucket_hours) DO UPDATE SET samples = samples + excluded.samples
+    """, [(*key, samples) for key, samples in duration_counts.items()])
+    cursor.execute("""
+        INSERT INTO analytics_rollup_state (name, last_history_id) VALUES (?, ?)
+        ON CONFLICT (name) DO UPDATE SET last_history_id = excluded.last_history_id
+    """, (ROLLUP_NAME, last_id))
+    conn.commit()
+
+
+def rollup(conn, batch_size, rebuild=False):
+    """Fold every settled history row after the watermark into the rollups; returns the number of rows"""
+    cursor = conn.cursor()
+    cursor.fast_executemany = True
+
+    if rebuild:
+        cursor.execute("DELETE FROM analytics_daily_status")
+        cursor.execute("DELETE FROM analytics_daily_durations")
+        cursor.execute("DELETE FROM analytics_rollup_state WHERE name = ?", (ROLLUP_NAME,))
+        conn.commit()
+
+    cursor.execute("SELECT last_history_id FROM analytics_rollup_state WHERE name = ?", (ROLLUP_NAME,))
+    row = cursor.fetchone()
+    last_id = row[0] if row else 0
+    limit_id = processing_limit(cursor)
+
+    total = 0
+    while True:
+        rows = fetch_batch(cursor, last_id, limit_id, batch_size)
+        if not rows:
+            break
+        status_counts, duration_counts = aggregate(rows)
+        last_id = rows[-1][0]
+        apply_batch(conn, cursor, status_counts, duration_counts, last_id)
+        total += len(rows)
+        print(f"Rolled up {total} history rows (last id {last_id})")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--rebuild', action='store_true', help='Clear the rollups and rebuild them from all history')
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if settings.db_backend == 'sqlite':
+        conn = sqlite_backend.connect(settings.sqlite_path)
+    else:
+        import pyodbc
+        conn = pyodbc.connect(settings.db_connection_string)
+    total = rollup(conn, args.batch_size, args.rebuild)
+    conn.close()
+    print(f"Done: {total} history rows rolled up")
+
+
+if __name__ == '__main__':
+    main()
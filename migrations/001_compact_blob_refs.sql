@@ -0,0 +1,12 @@
+-- Store documents as compact blob references (name + content hash + size).
+-- Signed URLs are generated on demand by the app, so the *_blob_url columns
+-- are no longer written. Run jobs/backfill_blob_refs.py after this script,
+-- then 002_drop_blob_urls.sql once the backfill reports no remaining rows.
+
+ALTER TABLE agents ADD
+    id_document_blob_sha256 CHAR(64) NULL,
+    id_document_blob_size INT NULL,
+    passport_photo_blob_sha256 CHAR(64) NULL,
+    passport_photo_blob_size INT NULL,
+    address_proof_blob_sha256 CHAR(64) NULL,
+    address_proof_blob_size INT NULL;
@@ -0,0 +1,16 @@
+-- Drop the long-lived SAS URL columns once jobs/backfill_blob_refs.py has
+-- normalized every row (all *_blob_url values are NULL).
+
+IF NOT EXISTS (
+    SELECT 1 FROM agents
+    WHERE id_document_blob_url IS NOT NULL
+       OR passport_photo_blob_url IS NOT NULL
+       OR address_proof_blob_url IS NOT NULL
+)
+BEGIN
+    ALTER TABLE agents DROP COLUMN id_document_blob_url, passport_photo_blob_url, address_proof_blob_url;
+END
+ELSE
+BEGIN
+    RAISERROR('Blob URL columns still hold data; run jobs/backfill_blob_refs.py first', 16, 1);
+END
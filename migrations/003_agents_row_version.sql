@@ -0,0 +1,9 @@
+-- Change tracking for the admin dashboard. row_ver is bumped by SQL Server on
+-- every insert/update, so the dashboard can fetch only rows changed since its
+-- last load (row_ver >= high-water mark) and probe for changes with an index
+-- seek on MAX(row_ver). submitted_date is indexed for the new-submissions badge.
+
+ALTER TABLE agents ADD row_ver ROWVERSION;
+
+CREATE INDEX IX_agents_row_ver ON agents (row_ver);
+CREATE INDEX IX_agents_submitted_date ON agents (submitted_date);
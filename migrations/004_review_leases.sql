@@ -0,0 +1,11 @@
+-- Reviewer work queue. A reviewer claims a batch of pending applications by
+-- setting claimed_by and a lease expiry; other reviewers skip claimed rows
+-- (READPAST) until the lease runs out, so an abandoned claim frees itself.
+
+ALTER TABLE agents ADD
+    claimed_by NVARCHAR(100) NULL,
+    lease_expires_at DATETIME2 NULL;
+
+CREATE INDEX IX_agents_review_queue
+    ON agents (application_status, lease_expires_at)
+    INCLUDE (claimed_by, submitted_date);
@@ -0,0 +1,56 @@
+-- Onboarding analytics. Every status change is appended to
+-- agent_status_history by the app; jobs/rollup_analytics.py folds new history
+-- rows into the daily rollup tables, which are all the analytics page reads.
+
+CREATE TABLE agent_status_history (
+    id BIGINT IDENTITY(1, 1) PRIMARY KEY,
+    agent_id INT NOT NULL,
+    from_status NVARCHAR(20) NULL,
+    to_status NVARCHAR(20) NOT NULL,
+    changed_at DATETIME2 NOT NULL,
+    changed_by NVARCHAR(100) NULL
+);
+
+CREATE INDEX IX_agent_status_history_agent ON agent_status_history (agent_id, changed_at);
+
+-- Transitions into (entered) and out of (exited) each status per day. The
+-- number of agents in a status on day D is SUM(entered - exited) up to D.
+CREATE TABLE analytics_daily_status (
+    day DATE NOT NULL,
+    region NVARCHAR(50) NOT NULL,
+    category NVARCHAR(50) NOT NULL,
+    status NVARCHAR(20) NOT NULL,
+    entered INT NOT NULL DEFAULT 0,
+    exited INT NOT NULL DEFAULT 0,
+    CONSTRAINT PK_analytics_daily_status PRIMARY KEY (day, region, category, status)
+);
+
+-- Histogram of durations (time_to_submit, time_to_decision) per day, bucketed
+-- by an upper bound in hours, so percentiles can be read for any date range.
+CREATE TABLE analytics_daily_durations (
+    day DATE NOT NULL,
+    region NVARCHAR(50) NOT NULL,
+    category NVARCHAR(50) NOT NULL,
+    metric NVARCHAR(20) NOT NULL,
+    bucket_hours INT NOT NULL,
+    samples INT NOT NULL DEFAULT 0,
+    CONSTRAINT PK_analytics_daily_durations PRIMARY KEY (day, region, category, metric, bucket_hours)
+);
+
+CREATE TABLE analytics_rollup_state (
+    name NVARCHAR(50) PRIMARY KEY,
+    last_history_id BIGINT NOT NULL
+);
+GO
+
+-- Seed the history from the timestamps already on agents, so the rollups
+-- start complete: sign-up, submission, then the decision if there is one.
+INSERT INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by)
+SELECT id, NULL, 'Incomplete', created_at, 'backfill' FROM agents WHERE created_at IS NOT NULL;
+
+INSERT INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by)
+SELECT id, 'Incomplete', 'Pending', submitted_date, 'backfill' FROM agents WHERE submitted_date IS NOT NULL;
+
+INSERT INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by)
+SELECT id, 'Pending', application_status, COALESCE(updated_at, submitted_date), 'backfill'
+FROM agents WHERE application_status IN ('Approved', 'Rejected') AND submitted_date IS NOT NULL;
@@ -0,0 +1,26 @@
+-- Archive for agents removed from the hot table by jobs/archive_agents.py.
+-- The full row is kept as JSON so the archive does not have to track every
+-- schema change to agents; the lookup columns are copied out for searching.
+
+CREATE TABLE agents_archive (
+    id INT PRIMARY KEY,
+    agent_id NVARCHAR(50) NULL,
+    email NVARCHAR(255) NULL,
+    application_status NVARCHAR(20) NULL,
+    reason NVARCHAR(30) NOT NULL,
+    archived_at DATETIME2 NOT NULL,
+    record NVARCHAR(MAX) NOT NULL
+);
+
+CREATE INDEX IX_agents_archive_email ON agents_archive (email);
+
+CREATE TABLE agent_credentials_archive (
+    agent_id INT NOT NULL,
+    archived_at DATETIME2 NOT NULL,
+    record NVARCHAR(MAX) NOT NULL
+);
+
+CREATE INDEX IX_agent_credentials_archive_agent ON agent_credentials_archive (agent_id);
+
+-- Supports the retention scans (status + age)
+CREATE INDEX IX_agents_retention ON agents (application_status, updated_at, created_at);
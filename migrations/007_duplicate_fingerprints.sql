@@ -0,0 +1,43 @@
+-- Normalised fingerprints for spotting one person behind several accounts.
+-- They are persisted computed columns, so SQL Server keeps them in step with
+-- every insert and update and no application code has to write them.
+--   id_number_fp  upper-cased ID number without spaces, dashes, slashes or dots
+--   mobile_fp     last 10 digits of the mobile number (+234 80... and 080... match)
+--   account_fp    account number without separators
+--   name_key      SOUNDEX of first name and surname in either order
+-- Placeholders (the 00000000000 mobile from create_account, empty names) and
+-- values too short to identify anyone are NULL, so they never match.
+-- Adding persisted columns rewrites agents; run outside business hours.
+
+ALTER TABLE agents ADD
+    id_number_fp AS (
+        CASE WHEN LEN(REPLACE(REPLACE(REPLACE(REPLACE(id_number, ' ', ''), '-', ''), '/', ''), '.', '')) >= 6
+             THEN UPPER(REPLACE(REPLACE(REPLACE(REPLACE(id_number, ' ', ''), '-', ''), '/', ''), '.', ''))
+        END
+    ) PERSISTED,
+    mobile_fp AS (
+        CASE WHEN LEN(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(mobile_number, ' ', ''), '-', ''), '+', ''), '(', ''), ')', '')) >= 10
+              AND REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(mobile_number, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '0', '') <> ''
+             THEN RIGHT(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(mobile_number, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), 10)
+        END
+    ) PERSISTED,
+    account_fp AS (
+        CASE WHEN LEN(REPLACE(REPLACE(account_number, ' ', ''), '-', '')) >= 6
+              AND REPLACE(REPLACE(REPLACE(account_number, ' ', ''), '-', ''), '0', '') <> ''
+             THEN REPLACE(REPLACE(account_number, ' ', ''), '-', '')
+        END
+    ) PERSISTED,
+    name_key AS (
+        CASE WHEN COALESCE(first_name, '') <> '' AND COALESCE(surname, '') <> ''
+             THEN CASE WHEN SOUNDEX(first_name) <= SOUNDEX(surname)
+                       THEN SOUNDEX(first_name) + SOUNDEX(surname)
+                       ELSE SOUNDEX(surname) + SOUNDEX(first_name) END
+        END
+    ) PERSISTED;
+GO
+
+CREATE INDEX IX_agents_id_number_fp ON agents (id_number_fp);
+CREATE INDEX IX_agents_mobile_fp ON agents (mobile_fp);
+CREATE INDEX IX_agents_account_fp ON agents (account_fp);
+-- A similar-sounding name alone matches too often; it only counts with the same date of birth
+CREATE INDEX IX_agents_name_key ON agents (name_key, date_of_birth);
@@ -0,0 +1,10 @@
+-- Idempotency key of the agent's latest application submission. A repeat of
+-- the same submission within the window (double click, impatient retry) finds
+-- the key and returns the stored outcome instead of uploading, writing and
+-- emailing again. See services/submissions.py.
+
+ALTER TABLE agents ADD
+    submission_key CHAR(64) NULL,
+    submission_started_at DATETIME2 NULL,
+    submission_completed_at DATETIME2 NULL,
+    submission_outcome NVARCHAR(200) NULL;
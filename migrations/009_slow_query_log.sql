@@ -0,0 +1,19 @@
+-- Slow-query log, used when SLOW_QUERY_LOG=table (the default is a local
+-- JSON-lines file). Written by services/querylog.py for statements slower
+-- than SLOW_QUERY_MS; plan_xml holds the estimated plan (open it in SSMS as
+-- a .sqlplan file).
+
+CREATE TABLE slow_query_log (
+    id BIGINT IDENTITY(1,1) PRIMARY KEY,
+    logged_at DATETIME2 NOT NULL,
+    fingerprint CHAR(12) NOT NULL,
+    statement NVARCHAR(MAX) NOT NULL,
+    duration_ms FLOAT NOT NULL,
+    row_count INT NULL,
+    page NVARCHAR(50) NULL,
+    failed BIT NOT NULL,
+    plan_xml XML NULL,
+    plan_error NVARCHAR(MAX) NULL
+);
+
+CREATE INDEX IX_slow_query_log_fingerprint ON slow_query_log (fingerprint, logged_at);
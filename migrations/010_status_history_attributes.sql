@@ -0,0 +1,20 @@
+-- Region and category of the agent when each status change happened, so the
+-- rollups no longer read them from the agents row when the job runs (which
+-- filed a sign-up and the submission that ends it under different keys once
+-- the agent filled in their profile). jobs/rollup_analytics.py files every
+-- transition into a status under the row's own values and the matching exit
+-- under the values of the agent's previous history row.
+
+ALTER TABLE agent_status_history ADD
+    region NVARCHAR(50) NULL,
+    category NVARCHAR(50) NULL;
+GO
+
+-- Existing rows only have the agent's current values to go on
+UPDATE h SET region = a.region, category = a.Agentcategory
+FROM agent_status_history h
+JOIN agents a ON a.id = h.agent_id;
+GO
+
+-- Then rebuild the rollups from the backfilled history:
+--   python -m jobs.rollup_analytics --rebuild
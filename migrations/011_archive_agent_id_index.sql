@@ -0,0 +1,5 @@
+-- services/agent_ids.py takes the highest serial of the year over agents and
+-- agents_archive, so archiving the newest agent of a year cannot free its ID
+-- for the next sign-up or import. This index keeps that lookup a seek.
+
+CREATE INDEX IX_agents_archive_agent_id ON agents_archive (agent_id);
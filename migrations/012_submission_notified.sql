@@ -0,0 +1,6 @@
+-- When the notification emails of the agent's latest submission went out.
+-- services/submissions.py commits a submission before sending its emails; a
+-- run cut short in between (the agent navigates away) leaves this NULL, and
+-- the next run of the session sends the emails then. See migration 008.
+
+ALTER TABLE agents ADD submission_notified_at DATETIME2 NULL;
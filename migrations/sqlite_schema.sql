@@ -0,0 +1,222 @@
+-- Schema for the embedded SQLite backend (DB_BACKEND=sqlite), equivalent to
+-- the SQL Server schema after migrations 001-012. services/sqlite_backend.py
+-- applies it to a new database file on first connect; keep it in step when
+-- adding a migration. Differences from SQL Server:
+--   row_ver           an integer bumped by the triggers below from rowversion_counter
+--                     (MIN_ACTIVE_ROWVERSION() reads the counter)
+--   *_fp, name_key    generated columns; soundex() is registered by the backend,
+--                     so write to this file through the app, not the sqlite3 shell
+--   app_locks         one row per lock resource; updating the row takes SQLite's
+--                     write lock, which stands in for sp_getapplock
+
+CREATE TABLE agents (
+    id INTEGER PRIMARY KEY,
+    application_ref NVARCHAR(50) NULL,
+    agent_id NVARCHAR(50) NULL,
+    prefix NVARCHAR(20) NULL,
+    first_name NVARCHAR(100) NULL,
+    surname NVARCHAR(100) NULL,
+    date_of_birth DATE NULL,
+    age INT NULL,
+    gender NVARCHAR(20) NULL,
+    marital_status NVARCHAR(20) NULL,
+    email NVARCHAR(255) NULL,
+    mobile_number NVARCHAR(20) NULL,
+    residential_address NVARCHAR(500) NULL,
+    state NVARCHAR(50) NULL,
+    lga NVARCHAR(100) NULL,
+    region NVARCHAR(50) NULL,
+    preferred_territory NVARCHAR(100) NULL,
+    Agentcategory NVARCHAR(50) NULL,
+    TaxID NVARCHAR(50) NULL,
+    nok_name NVARCHAR(200) NULL,
+    nok_relationship NVARCHAR(50) NULL,
+    nok_contact NVARCHAR(20) NULL,
+    id_type NVARCHAR(50) NULL,
+    id_number NVARCHAR(50) NULL,
+    bank_name NVARCHAR(100) NULL,
+    account_number NVARCHAR(20) NULL,
+    account_name NVARCHAR(200) NULL,
+    id_document_blob_name NVARCHAR(300) NULL,
+    id_document_blob_sha256 CHAR(64) NULL,
+    id_document_blob_size INT NULL,
+    passport_photo_blob_name NVARCHAR(300) NULL,
+    passport_photo_blob_sha256 CHAR(64) NULL,
+    passport_photo_blob_size INT NULL,
+    address_proof_blob_name NVARCHAR(300) NULL,
+    address_proof_blob_sha256 CHAR(64) NULL,
+    address_proof_blob_size INT NULL,
+    application_status NVARCHAR(20) NULL,
+    submitted_date DATETIME2 NULL,
+    created_at DATETIME2 NULL,
+    created_by NVARCHAR(255) NULL,
+    updated_at DATETIME2 NULL,
+    -- 003
+    row_ver INTEGER NULL,
+    -- 004
+    claimed_by NVARCHAR(100) NULL,
+    lease_expires_at DATETIME2 NULL,
+    -- 007
+    id_number_fp NVARCHAR(50) GENERATED ALWAYS AS (
+        CASE WHEN LENGTH(REPLACE(REPLACE(REPLACE(REPLACE(id_number, ' ', ''), '-', ''), '/', ''), '.', '')) >= 6
+             THEN UPPER(REPLACE(REPLACE(REPLACE(REPLACE(id_number, ' ', ''), '-', ''), '/', ''), '.', ''))
+        END
+    ) STORED,
+    mobile_fp NVARCHAR(20) GENERATED ALWAYS AS (
+        CASE WHEN LENGTH(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(mobile_number, ' ', ''), '-', ''), '+', ''), '(', ''), ')', '')) >= 10
+              AND REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(mobile_number, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '0', '') <> ''
+             THEN SUBSTR(REPLACE(REPLACE(REPLACE(REPLACE(REPLACE(mobile_number, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), -10)
+        END
+    ) STORED,
+    account_fp NVARCHAR(20) GENERATED ALWAYS AS (
+        CASE WHEN LENGTH(REPLACE(REPLACE(account_number, ' ', ''), '-', '')) >= 6
+              AND REPLACE(REPLACE(REPLACE(account_number, ' ', ''), '-', ''), '0', '') <> ''
+             THEN REPLACE(REPLACE(account_number, ' ', ''), '-', '')
+        END
+    ) STORED,
+    name_key CHAR(8) GENERATED ALWAYS AS (
+        CASE WHEN COALESCE(first_name, '') <> '' AND COALESCE(surname, '') <> ''
+             THEN CASE WHEN soundex(first_name) <= soundex(surname)
+                       THEN soundex(first_name) || soundex(surname)
+                       ELSE soundex(surname) || soundex(first_name) END
+        END
+    ) STORED,
+    -- 008
+    submission_key CHAR(64) NULL,
+    submission_started_at DATETIME2 NULL,
+    submission_completed_at DATETIME2 NULL,
+    submission_outcome NVARCHAR(200) NULL,
+    -- 012
+    submission_notified_at DATETIME2 NULL
+);
+
+CREATE INDEX IX_agents_agent_id ON agents (agent_id);
+CREATE INDEX IX_agents_email ON agents (email);
+CREATE INDEX IX_agents_row_ver ON agents (row_ver);
+CREATE INDEX IX_agents_submitted_date ON agents (submitted_date);
+CREATE INDEX IX_agents_review_queue ON agents (application_status, lease_expires_at);
+CREATE INDEX IX_agents_retention ON agents (application_status, updated_at, created_at);
+CREATE INDEX IX_agents_id_number_fp ON agents (id_number_fp);
+CREATE INDEX IX_agents_mobile_fp ON agents (mobile_fp);
+CREATE INDEX IX_agents_account_fp ON agents (account_fp);
+CREATE INDEX IX_agents_name_key ON agents (name_key, date_of_birth);
+
+CREATE TABLE rowversion_counter (
+    value INTEGER NOT NULL
+);
+INSERT INTO rowversion_counter (value) VALUES (0);
+
+-- recursive_triggers is off, so the UPDATE inside a trigger does not fire it again
+CREATE TRIGGER agents_row_ver_insert AFTER INSERT ON agents
+BEGIN
+    UPDATE rowversion_counter SET value = value + 1;
+    UPDATE agents SET row_ver = (SELECT value FROM rowversion_counter) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER agents_row_ver_update AFTER UPDATE ON agents
+BEGIN
+    UPDATE rowversion_counter SET value = value + 1;
+    UPDATE agents SET row_ver = (SELECT value FROM rowversion_counter) WHERE id = NEW.id;
+END;
+
+CREATE TABLE app_locks (
+    resource NVARCHAR(100) PRIMARY KEY
+);
+INSERT INTO app_locks (resource) VALUES ('agent_id_serial');
+
+CREATE TABLE agent_credentials (
+    id INTEGER PRIMARY KEY,
+    agent_id INT NOT NULL REFERENCES agents (id),
+    email NVARCHAR(255) NOT NULL,
+    password_hash CHAR(64) NOT NULL,
+    is_active BIT NOT NULL DEFAULT 1,
+    created_at DATETIME2 NULL
+);
+
+CREATE UNIQUE INDEX IX_agent_credentials_email ON agent_credentials (email);
+CREATE INDEX IX_agent_credentials_agent ON agent_credentials (agent_id);
+
+CREATE TABLE dim_nigerian_states_lgas (
+    state_name NVARCHAR(50) NOT NULL,
+    lga_name NVARCHAR(100) NOT NULL,
+    PRIMARY KEY (state_name, lga_name)
+);
+
+-- 005
+CREATE TABLE agent_status_history (
+    id INTEGER PRIMARY KEY,
+    agent_id INT NOT NULL,
+    from_status NVARCHAR(20) NULL,
+    to_status NVARCHAR(20) NOT NULL,
+    changed_at DATETIME2 NOT NULL,
+    changed_by NVARCHAR(100) NULL,
+    -- 010
+    region NVARCHAR(50) NULL,
+    category NVARCHAR(50) NULL
+);
+
+CREATE INDEX IX_agent_status_history_agent ON agent_status_history (agent_id, changed_at);
+
+CREATE TABLE analytics_daily_status (
+    day DATE NOT NULL,
+    region NVARCHAR(50) NOT NULL,
+    category NVARCHAR(50) NOT NULL,
+    status NVARCHAR(20) NOT NULL,
+    entered INT NOT NULL DEFAULT 0,
+    exited INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, region, category, status)
+);
+
+CREATE TABLE analytics_daily_durations (
+    day DATE NOT NULL,
+    region NVARCHAR(50) NOT NULL,
+    category NVARCHAR(50) NOT NULL,
+    metric NVARCHAR(20) NOT NULL,
+    bucket_hours INT NOT NULL,
+    samples INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, region, category, metric, bucket_hours)
+);
+
+CREATE TABLE analytics_rollup_state (
+    name NVARCHAR(50) PRIMARY KEY,
+    last_history_id BIGINT NOT NULL
+);
+
+-- 006
+CREATE TABLE agents_archive (
+    id INT PRIMARY KEY,
+    agent_id NVARCHAR(50) NULL,
+    email NVARCHAR(255) NULL,
+    application_status NVARCHAR(20) NULL,
+    reason NVARCHAR(30) NOT NULL,
+    archived_at DATETIME2 NOT NULL,
+    record NVARCHAR NOT NULL
+);
+
+CREATE INDEX IX_agents_archive_email ON agents_archive (email);
+-- 011
+CREATE INDEX IX_agents_archive_agent_id ON agents_archive (agent_id);
+
+CREATE TABLE agent_credentials_archive (
+    agent_id INT NOT NULL,
+    archived_at DATETIME2 NOT NULL,
+    record NVARCHAR NOT NULL
+);
+
+CREATE INDEX IX_agent_credentials_archive_agent ON agent_credentials_archive (agent_id);
+
+-- 009
+CREATE TABLE slow_query_log (
+    id INTEGER PRIMARY KEY,
+    logged_at DATETIME2 NOT NULL,
+    fingerprint CHAR(12) NOT NULL,
+    statement NVARCHAR NOT NULL,
+    duration_ms FLOAT NOT NULL,
+    row_count INT NULL,
+    page NVARCHAR(50) NULL,
+    failed BIT NOT NULL,
+    plan_xml NVARCHAR NULL,
+    plan_error NVARCHAR NULL
+);
+
+CREATE INDEX IX_slow_query_log_fingerprint ON slow_query_log (fingerprint, logged_at);
@@ -0,0 +1,64 @@
+"""Allocation of AVH/ISA/YY/XXXXX agent IDs."""
+import datetime
+
+from services.sqlite_backend import is_sqlite
+
+# Serials are five digits, restarting every year
+MAX_SERIAL = 99999
+
+# sp_getapplock return codes below zero
+APPLOCK_ERRORS = {
+    -1: "Timed out waiting to allocate agent IDs",
+    -2: "Agent ID allocation was cancelled",
+    -3: "Agent ID allocation was chosen as a deadlock victim",
+    -999: "Agent ID allocation lock could not be requested (parameter or call error)",
+}
+
+
+def allocate_agent_ids(cursor, count=1):
+    """
+    Reserve count consecutive agent ID serials for the current year
+    Takes an exclusive application lock owned by the caller's transaction, so
+    sign-ups and bulk imports never hand out the same serial; the caller must
+    insert the agents and commit (or roll back) to release it. Archived
+    agents count too, so an archived agent's ID is never handed out again.
+    Returns: (year, first_serial) where year is the two-digit year string
+    """
+    if is_sqlite(cursor):
+        # SQLite has a single writer: taking the write lock first serialises allocations the same way
+        cursor.execute("UPDATE app_locks SET resource = resource WHERE resource = 'agent_id_serial'")
+    else:
+        # A transaction-owned applock needs an open transaction, and pyodbc's implicit
+        # transactions are not started by SET or EXEC, so open one here unless the caller
+        # already has (the caller's commit or rollback ends it either way)
+        cursor.execute("""
+            SET NOCOUNT ON;
+            IF @@TRANCOUNT = 0 BEGIN TRANSACTION;
+            DECLARE @result INT;
+            EXEC @result = sp_getapplock @Resource = 'agent_id_serial', @LockMode = 'Exclusive',
+                @LockOwner = 'Transaction', @LockTimeout = 30000;
+            SELECT @result;
+        """)
+        result = cursor.fetchone()[0]
+        if result < 0:
+            raise RuntimeError(APPLOCK_ERRORS.get(result, f"Agent ID allocation lock failed ({result})"))
+
+    year = datetime.datetime.now().strftime('%y')
+    cursor.execute("""
+        SELECT MAX(CAST(RIGHT(agent_id, 5) AS INT)) as max_serial
+        FROM (
+            SELECT agent_id FROM agents WHERE agent_id LIKE ? AND LEN(agent_id) > 14
+            UNION ALL
+            SELECT agent_id FROM agents_archive WHERE agent_id LIKE ? AND LEN(agent_id) > 14
+        ) ids
+    """, (f'AVH/ISA/{year}/%', f'AVH/ISA/{year}/%'))
+    result = cursor.fetchone()
+    first_serial = result[0] + 1 if result and result[0] is not None else 1
+    if first_serial + count - 1 > MAX_SERIAL:
+        raise RuntimeError(f"Only {MAX_SERIAL - first_serial + 1} agent IDs left for 20{year}")
+    return year, first_serial
+
+
+def format_agent_id(year, serial):
+    """Format: AVH/ISA/YY/XXXXX"""
+    return f"AVH/ISA/{year}/{serial:05d}"
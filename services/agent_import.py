@@ -0,0 +1,143 @@
+"""Reading and validating agent rows for bulk import."""
+import csv
+import datetime
+import hashlib
+import os
+import re
+import secrets
+
+# Columns accepted in an import file (header names, case-insensitive)
+IMPORT_COLUMNS = [
+    'email', 'first_name', 'surname', 'prefix', 'date_of_birth', 'gender', 'marital_status',
+    'mobile_number', 'residential_address', 'state', 'lga', 'region', 'preferred_territory',
+    'Agentcategory', 'TaxID', 'id_type', 'id_number', 'bank_name', 'account_number',
+    'account_name', 'password',
+]
+
+REQUIRED_COLUMNS = ['email', 'first_name', 'surname']
+
+# Placeholders create_account uses for a minimal agent record
+DEFAULT_DATE_OF_BIRTH = datetime.date(1990, 1, 1)
+DEFAULT_MOBILE_NUMBER = '00000000000'
+
+# Tried after ISO 8601 (YYYY-MM-DD)
+DATE_FORMATS = ['%d/%m/%Y', '%d-%m-%Y']
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def read_rows(path):
+    """
+    Yield (row_number, {column: value}) from a CSV or XLSX file, one row at a time
+    row_number is the line/row in the file (the header is row 1).
+    """
+    if path.lower().endswith('.xlsx'):
+        yield from _read_xlsx(path)
+    else:
+        yield from _read_csv(path)
+
+
+def _canonical_header(header):
+    by_lower = {col.lower(): col for col in IMPORT_COLUMNS}
+    return [by_lower.get(str(name or '').strip().lower(), str(name or '').strip()) for name in header]
+
+
+def _read_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = _canonical_header(next(reader, []))
+        for row_number, row in enumerate(reader, start=2):
+            if any(value.strip() for value in row):
+                yield row_number, dict(zip(header, row))
+
+
+def _read_xlsx(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("XLSX import requires openpyxl (pip install openpyxl)")
+    # read_only streams rows instead of loading the whole sheet
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _canonical_header(next(rows, []))
+        for row_number, row in enumerate(rows, start=2):
+            if any(value not in (None, '') for value in row):
+                yield row_number, dict(zip(header, row))
+    finally:
+        workbook.close()
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheets turn account and phone numbers into floats
+        value = int(value)
+    return str(value).strip()
+
+
+def _date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+    return None
+
+
+def validate_row(raw):
+    """
+    Check one imported row and normalize its values
+    Returns: (values, error) where values maps IMPORT_COLUMNS to cleaned values
+    (plus password_hash and age), or None with an error message
+    """
+    values = {col: _text(raw.get(col)) for col in IMPORT_COLUMNS}
+    missing = [col for col in REQUIRED_COLUMNS if not values[col]]
+    if missing:
+        return None, f"Missing {', '.join(missing)}"
+    values['email'] = values['email'].lower()
+    if not EMAIL_PATTERN.match(values['email']):
+        return None, f"Invalid email {values['email']!r}"
+
+    if values['date_of_birth']:
+        raw_date = raw.get('date_of_birth')
+        date_of_birth = _date(raw_date if isinstance(raw_date, datetime.date) else values['date_of_birth'])
+        if date_of_birth is None:
+            return None, f"Unrecognised date_of_birth {values['date_of_birth']!r} (use YYYY-MM-DD)"
+    else:
+        date_of_birth = DEFAULT_DATE_OF_BIRTH
+    values['date_of_birth'] = date_of_birth
+    values['age'] = (datetime.date.today() - date_of_birth).days // 365 if date_of_birth != DEFAULT_DATE_OF_BIRTH else None
+
+    mobile = re.sub(r'[\s\-()]', '', values['mobile_number'])
+    if mobile and not re.fullmatch(r'\+?\d{7,15}', mobile):
+        return None, f"Invalid mobile_number {values['mobile_number']!r}"
+    values['mobile_number'] = mobile or DEFAULT_MOBILE_NUMBER
+
+    if values['account_number'] and not values['account_number'].isdigit():
+        return None, "account_number must contain digits only"
+
+    # Without a password the account cannot sign in until one is set by HR
+    password = values.pop('password')
+    if password and len(password) < 8:
+        return None, "password must be at least 8 characters"
+    values['password_hash'] = hashlib.sha256((password or secrets.token_urlsafe(32)).encode()).hexdigest()
+    values['has_password'] = bool(password)
+    for col in IMPORT_COLUMNS:
+        if values.get(col) == '':
+            values[col] = None
+    return values, None
+
+
+def import_source_name(path):
+    """Value recorded in agents.created_by for rows from this file"""
+    return f"import:{os.path.basename(path)}"[:100]
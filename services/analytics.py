@@ -0,0 +1,49 @@
+"""Onboarding analytics shared by the rollup job and the analytics page."""
+import bisect
+
+# Upper bounds (hours) of the duration histogram buckets: 1h up to a year
+DURATION_BUCKETS = [1, 2, 4, 8, 12, 24, 48, 72, 120, 168, 336, 504, 720, 1440, 2160, 4320, 8760]
+OVERFLOW_BUCKET = 100000
+
+DURATION_METRICS = {
+    'time_to_submit': 'Sign-up to submission',
+    'time_to_decision': 'Submission to decision',
+}
+
+# Stored instead of NULL region/category, which cannot be part of a rollup key
+UNKNOWN = 'Unknown'
+
+
+def duration_bucket(hours):
+    """Histogram bucket (its upper bound in hours) for a duration"""
+    index = bisect.bisect_left(DURATION_BUCKETS, max(hours, 0))
+    return DURATION_BUCKETS[index] if index < len(DURATION_BUCKETS) else OVERFLOW_BUCKET
+
+
+def bucket_percentile(samples_by_bucket, fraction):
+    """
+    Estimate a percentile from histogram buckets
+    Returns the upper bound (hours) of the bucket containing the percentile,
+    or None when there are no samples.
+    """
+    total = sum(samples_by_bucket.values())
+    if not total:
+        return None
+    target = fraction * total
+    running = 0
+    for bucket in sorted(samples_by_bucket):
+        running += samples_by_bucket[bucket]
+        if running >= target:
+            return bucket
+    return max(samples_by_bucket)
+
+
+def format_hours(hours):
+    """Short human-readable form of a bucket bound"""
+    if hours is None:
+        return 'n/a'
+    if hours >= OVERFLOW_BUCKET:
+        return '> 1 year'
+    if hours < 48:
+        return f'≤ {hours}h'
+    return f'≤ {hours // 24}d'
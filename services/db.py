@@ -0,0 +1,156 @@
+"""Database access shared by the pages."""
+import functools
+import time
+
+import streamlit as st
+
+from config import get_settings
+from services import sqlite_backend
+from services.querylog import InstrumentedConnection, instrumented_connect
+from services.telemetry import span
+
+
+def sqlite_connect(path):
+    """Open the local SQLite database, timed like SQL Server connections"""
+    return InstrumentedConnection(sqlite_backend.connect(path))
+
+
+@st.cache_resource
+def get_connection_factory():
+    """Return a callable that opens a pooled connection to the configured database"""
+    settings = get_settings()
+    if settings.db_backend == 'sqlite':
+        return functools.partial(sqlite_connect, settings.sqlite_path)
+    # Imported here so the SQLite backend runs without an ODBC driver installed
+    import pyodbc
+    pyodbc.pooling = True
+    return functools.partial(instrumented_connect, settings.db_connection_string)
+
+# Database connection function
+def get_db_connection():
+    """Get or create a session-based database connection with validation"""
+    if 'db_conn' not in st.session_state or st.session_state.db_conn is None:
+        try:
+            with span('db.connect'):
+                st.session_state.db_conn = get_connection_factory()()
+        except Exception as e:
+            st.error(f"Database connection failed: {e}")
+            st.session_state.db_conn = None
+            return None
+    
+    # Validate connection
+    try:
+        with span('db.ping'):
+            cursor = st.session_state.db_conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        return st.session_state.db_conn
+    except Exception as e:
+        # Connection is invalid, try to reconnect
+        try:
+            st.session_state.db_conn.close()
+        except:
+            pass
+        try:
+            with span('db.connect'):
+                st.session_state.db_conn = get_connection_factory()()
+            return st.session_state.db_conn
+        except Exception as e:
+            st.error(f"Database reconnection failed: {e}")
+            st.session_state.db_conn = None
+            return None
+
+@st.cache_resource
+def get_read_connection_factory():
+    """Return a callable that opens a pooled read-only replica connection, or None if no replica is configured"""
+    settings = get_settings()
+    if not settings.db_read_server or settings.db_backend == 'sqlite':
+        return None
+    import pyodbc
+    pyodbc.pooling = True
+    return functools.partial(instrumented_connect, settings.db_read_connection_string, timeout=5)
+
+
+# Seconds to stay on the primary after the replica failed to connect
+READ_REPLICA_RETRY_SECONDS = 60
+
+REPLICA_LAG_PROBE = """
+    SELECT secondary_lag_seconds FROM sys.dm_hadr_database_replica_states
+    WHERE is_local = 1 AND database_id = DB_ID()
+"""
+
+
+def note_primary_write():
+    """Record a write by this session so its reads stay on the primary until replicas have caught up"""
+    st.session_state.db_last_write = time.monotonic()
+
+
+def get_read_connection():
+    """
+    Connection for read-only reporting queries
+    Returns the session's replica connection when a replica is configured,
+    reachable and within the allowed staleness, and this session has not
+    written recently; otherwise the primary connection from get_db_connection().
+    """
+    factory = get_read_connection_factory()
+    max_staleness = get_settings().db_read_max_staleness_seconds
+    now = time.monotonic()
+    if (
+        factory is None
+        or now - st.session_state.get('db_last_write', float('-inf')) < max_staleness
+        or now < st.session_state.get('db_read_retry_at', 0)
+    ):
+        return get_db_connection()
+
+    conn = st.session_state.get('db_read_conn')
+    try:
+        with span('db.replica_ping'):
+            if conn is None:
+                conn = factory()
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except Exception:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        st.session_state.db_read_conn = None
+        st.session_state.db_read_retry_at = now + READ_REPLICA_RETRY_SECONDS
+        return get_db_connection()
+    st.session_state.db_read_conn = conn
+
+    # Lag is unknown when the DMV is not visible to this login; the replica is used anyway
+    try:
+        cursor.execute(REPLICA_LAG_PROBE)
+        row = cursor.fetchone()
+        lag = row[0] if row else None
+    except Exception:
+        lag = None
+    if lag is not None and lag > max_staleness:
+        return get_db_connection()
+    return conn
+
+
+def is_replica_connection(conn):
+    """True if conn is this session's read replica connection"""
+    return conn is not None and conn is st.session_state.get('db_read_conn')
+
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def get_lgas_for_state(state_name):
+    """Fetch LGAs for a specific state from database"""
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT lga_name 
+            FROM dim_nigerian_states_lgas 
+            WHERE state_name = ? 
+            ORDER BY lga_name
+        """, (state_name,))
+        lgas = [row[0] for row in cursor.fetchall()]
+        return lgas if lgas else ['N/A']
+    except Exception as e:
+        st.error(f"Error fetching LGAs: {e}")
+        return ['N/A']
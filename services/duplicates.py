@@ -0,0 +1,63 @@
+"""Possible duplicate applicants, matched on the fingerprint columns (migration 007)."""
+import html
+
+# Fingerprint column -> how a match on it is described to reviewers
+FINGERPRINTS = {
+    'id_number_fp': 'ID number',
+    'mobile_fp': 'mobile number',
+    'account_fp': 'bank account',
+    'name_key': 'similar name and date of birth',
+}
+
+MAX_DUPLICATES = 10
+
+
+def find_duplicates(cursor, agent_id, limit=MAX_DUPLICATES):
+    """
+    Other agents sharing a fingerprint with this one
+    Each branch of the union is an index seek on one fingerprint column, so the
+    lookup stays in the milliseconds however large agents grows. Returns a list
+    of dicts (id, agent_id, name, application_status, matched_on), newest first.
+    """
+    branches = []
+    for column in FINGERPRINTS:
+        extra = " AND m.date_of_birth = s.date_of_birth" if column == 'name_key' else ""
+        branches.append(f"""
+            SELECT m.id, '{column}' AS fingerprint FROM agents s
+            JOIN agents m ON m.{column} = s.{column} AND m.id <> s.id{extra}
+            WHERE s.id = ?""")
+    cursor.execute(f"""
+        SELECT TOP (?) a.id, a.agent_id, a.first_name, a.surname, a.application_status, f.matched
+        FROM (
+            SELECT id, STRING_AGG(fingerprint, ',') AS matched
+            FROM ({' UNION ALL '.join(branches)}) AS u
+            GROUP BY id
+        ) AS f
+        JOIN agents a ON a.id = f.id
+        ORDER BY a.id DESC
+    """, (limit, *[agent_id] * len(branches)))
+    return [
+        {
+            'id': row[0],
+            'agent_id': row[1],
+            'name': f"{row[2] or ''} {row[3] or ''}".strip() or '(no name yet)',
+            'application_status': row[4],
+            'matched_on': [FINGERPRINTS[column] for column in row[5].split(',')],
+        }
+        for row in cursor.fetchall()
+    ]
+
+
+def describe_duplicate(duplicate):
+    """One-line summary of a possible duplicate"""
+    return (f"{duplicate['agent_id']} · {duplicate['name']} · {duplicate['application_status']}"
+            f" (same {', '.join(duplicate['matched_on'])})")
+
+
+def duplicates_html(duplicates):
+    """Paragraph for the HR notification emails; empty when there are no matches"""
+    if not duplicates:
+        return ''
+    items = ''.join(f"<li>{html.escape(describe_duplicate(d))}</li>" for d in duplicates)
+    return (f"<p><strong>⚠ Possible duplicate applicant:</strong> other records share details "
+            f"with this one. Please check them before approving.</p><ul>{items}</ul>")
@@ -0,0 +1,179 @@
+"""Streaming export of the agent register to CSV or Parquet."""
+import csv
+import datetime
+import decimal
+import io
+import os
+import tempfile
+import time
+import uuid
+
+# Columns of the agent register, in export order
+REGISTER_COLUMNS = [
+    'id', 'application_ref', 'agent_id', 'prefix', 'first_name', 'surname', 'date_of_birth', 'age',
+    'gender', 'marital_status', 'email', 'mobile_number', 'residential_address', 'state', 'lga',
+    'region', 'preferred_territory', 'Agentcategory', 'TaxID', 'id_type', 'id_number',
+    'bank_name', 'account_number', 'account_name', 'application_status', 'submitted_date', 'updated_at',
+]
+
+# Masked unless the export is explicitly unmasked
+SENSITIVE_COLUMNS = ['account_number', 'id_number']
+
+EXPORT_BATCH_SIZE = 5000
+
+# Format -> download MIME type
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Prepared exports older than this are deleted when the next one is prepared
+EXPORT_TTL_SECONDS = 3600
+
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), 'agent-exports')
+
+# Prepared exports are downloaded from blob storage under this prefix (give it
+# a lifecycle rule that deletes blobs after a day), through a link valid this long
+EXPORT_BLOB_PREFIX = 'exports'
+EXPORT_LINK_HOURS = 1
+
+
+def mask_value(value):
+    """Keep the last four characters of a sensitive value"""
+    if value is None:
+        return None
+    value = str(value)
+    return '*' * max(len(value) - 4, 0) + value[-4:]
+
+
+def query_register(cursor, where='1 = 1', params=()):
+    """Run the register query for a WHERE clause (as built by the admin dashboard filters)"""
+    cursor.execute(f"SELECT {', '.join(REGISTER_COLUMNS)} FROM agents WHERE {where} ORDER BY id", params)
+
+
+def iter_batches(cursor, mask=True, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield the rows of an executed register query, batch_size at a time
+    Only one batch is held in memory; sensitive columns are masked per batch.
+    """
+    masked = [REGISTER_COLUMNS.index(col) for col in SENSITIVE_COLUMNS] if mask else []
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        if masked:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for i in masked:
+                    row[i] = mask_value(row[i])
+        yield rows
+
+
+def write_csv(cursor, out, mask=True, batch_size=EXPORT_BATCH_SIZE):
+    """Stream an executed register query into the binary file out as UTF-8 CSV; returns the row count"""
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(REGISTER_COLUMNS)
+    count = 0
+    for rows in iter_batches(cursor, mask, batch_size):
+        writer.writerows(rows)
+        count += len(rows)
+    text.flush()
+    text.detach()
+    return count
+
+
+def _arrow_type(pa, description_row, masked):
+    """Arrow type for a column from its pyodbc cursor.description entry"""
+    type_code, precision, scale = description_row[1], description_row[4], description_row[5]
+    if masked or type_code is str:
+        return pa.string()
+    if type_code is bool:
+        return pa.bool_()
+    if type_code is int:
+        return pa.int64()
+    if type_code is float:
+        return pa.float64()
+    if type_code is decimal.Decimal:
+        return pa.decimal128(precision or 38, scale or 0)
+    if type_code is datetime.datetime:
+        return pa.timestamp('us')
+    if type_code is datetime.date:
+        return pa.date32()
+    if type_code in (bytes, bytearray):
+        return pa.binary()
+    return pa.string()
+
+
+def write_parquet(cursor, out, mask=True, batch_size=EXPORT_BATCH_SIZE):
+    """Stream an executed register query into the binary file out as Parquet, one row group per batch; returns the row count"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    # The schema comes from the result set, so all-NULL batches cannot change a column's type
+    schema = pa.schema([
+        (col, _arrow_type(pa, description_row, mask and col in SENSITIVE_COLUMNS))
+        for col, description_row in zip(REGISTER_COLUMNS, cursor.description)
+    ])
+    count = 0
+    with pq.ParquetWriter(out, schema, compression='snappy') as writer:
+        for rows in iter_batches(cursor, mask, batch_size):
+            writer.write_batch(pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                schema=schema
+            ))
+            count += len(rows)
+    return count
+
+
+WRITERS = {
+    'csv': write_csv,
+    'parquet': write_parquet,
+}
+
+
+def export_register(cursor, out, fmt='csv', where='1 = 1', params=(), mask=True, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Export the agent register matching where/params to the binary file out
+    Returns: (row_count, error)
+    """
+    try:
+        query_register(cursor, where, params)
+        return WRITERS[fmt](cursor, out, mask=mask, batch_size=batch_size), None
+    except Exception as e:
+        return None, str(e)
+
+
+def new_export_path(fmt):
+    """Return a fresh file path for a prepared export, clearing out expired ones"""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    cutoff = time.time() - EXPORT_TTL_SECONDS
+    with os.scandir(EXPORT_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+    return os.path.join(EXPORT_DIR, f"{uuid.uuid4().hex}.{fmt}")
+
+
+def publish_export(path, fmt):
+    """
+    Move a prepared export from local disk to blob storage, so the browser
+    downloads it from there instead of through the app server's memory
+    Returns: (blob_name, error)
+    """
+    from services.storage import upload_file_blob
+
+    blob_name = f"{EXPORT_BLOB_PREFIX}/{os.path.basename(path)}"
+    try:
+        error = upload_file_blob(
+            path, blob_name, EXPORT_FORMATS[fmt], f"agent_register_{datetime.date.today():%Y%m%d}.{fmt}"
+        )
+    finally:
+        os.remove(path)
+    return (None, error) if error else (blob_name, None)
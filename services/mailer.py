@@ -0,0 +1,94 @@
+"""Outgoing email."""
+import datetime
+import os
+import smtplib
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import streamlit as st
+
+from config import get_settings
+from services.telemetry import timed
+
+
+DISCLAIMER_HTML = '''
+<em>This email and any attachments are confidential and intended solely for the use of the named addressee. If you have received this message in error, please notify the sender immediately, delete it from your system, and refrain from copying, disclosing, or acting on its contents. Please note that internet communications are not guaranteed to be secure or free of viruses. Avon Healthcare Limited does not accept liability for any loss or damage arising from the unauthorized access to, or interference with, internet communications by any third party, or from the transmission of any viruses. Any views or opinions expressed that do not relate to the official business of Avon Healthcare Limited are those of the author and do not reflect the views or policies of Avon Healthcare Limited.</em>
+'''
+
+def build_message(to_emails, subject, body_html, cc_emails=None):
+    """Return (message, all_recipients) for an HTML email"""
+    msg = MIMEMultipart('alternative')
+    msg['From'] = get_settings().smtp.sender_email
+    msg['Subject'] = subject
+    if isinstance(to_emails, str):
+        to_emails = [to_emails]
+    msg['To'] = ', '.join(to_emails)
+    all_recipients = to_emails[:]
+    if cc_emails:
+        if isinstance(cc_emails, str):
+            cc_emails = [cc_emails]
+        msg['Cc'] = ', '.join(cc_emails)
+        all_recipients += cc_emails
+    msg.attach(MIMEText(body_html, 'html'))
+    return msg, all_recipients
+
+
+def send_email(to_emails, subject, body_html, cc_emails=None):
+    """
+    Send email using Outlook SMTP
+    to_emails: list of recipient emails
+    subject: email subject line
+    body_html: HTML formatted email body
+    cc_emails: list of CC recipient emails (optional)
+    Returns: True if successful, False otherwise
+    """
+    return send_emails([(to_emails, subject, body_html, cc_emails)])[0]
+
+
+@timed('email.send')
+def send_emails(emails):
+    """
+    Send several emails over one SMTP session
+    emails: list of (to_emails, subject, body_html, cc_emails) tuples
+    Returns: list of True/False, one per email, in order
+    """
+    results = [False] * len(emails)
+    if not emails:
+        return results
+    if get_settings().mail_outbox_dir:
+        return write_outbox(emails)
+    smtp = get_settings().smtp
+    try:
+        with smtplib.SMTP(smtp.host, smtp.port) as server:
+            server.starttls()
+            server.login(smtp.sender_email, smtp.app_password)
+            for i, email in enumerate(emails):
+                try:
+                    msg, all_recipients = build_message(*email)
+                    server.sendmail(smtp.sender_email, all_recipients, msg.as_string())
+                    results[i] = True
+                except smtplib.SMTPServerDisconnected:
+                    raise
+                except Exception as e:
+                    st.warning(f"Email to {email[0]} failed: {str(e)}")
+    except Exception as e:
+        st.warning(f"Email sending failed: {str(e)}")
+    return results
+
+
+def write_outbox(emails):
+    """Write each email to MAIL_OUTBOX_DIR as an .eml file instead of sending it; returns True/False per email"""
+    outbox = get_settings().mail_outbox_dir
+    os.makedirs(outbox, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    results = []
+    for i, email in enumerate(emails):
+        try:
+            msg, _ = build_message(*email)
+            with open(os.path.join(outbox, f"{stamp}-{i:03d}.eml"), 'w', encoding='utf-8') as f:
+                f.write(msg.as_string())
+            results.append(True)
+        except Exception as e:
+            st.warning(f"Email to {email[0]} failed: {str(e)}")
+            results.append(False)
+    return results
@@ -0,0 +1,148 @@
+"""Background loading of agent records for the admin review flow."""
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import streamlit as st
+
+from services.db import get_connection_factory
+from services.duplicates import find_duplicates
+from services.review_queue import CLAIMABLE
+from services.storage import blob_sas_url, get_blob_thumbnail
+from services.telemetry import span
+
+DOCUMENT_COLUMNS = ['passport_photo', 'id_document', 'address_proof']
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Agents loaded ahead of the one being reviewed
+PREFETCH_AHEAD = 3
+
+# Loaded agents kept per session (current, previous and the prefetched ones)
+PREFETCH_KEEP = 8
+
+# A loaded agent is reloaded after this long even if its row looks unchanged
+# (catches writes outside the app that leave updated_at alone)
+BUNDLE_TTL_SECONDS = 60
+
+
+@st.cache_resource
+def _prefetch_executor():
+    """Worker threads shared by every session in this process"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix='agent-prefetch')
+
+
+def load_agent_bundle(agent_id):
+    """
+    Load everything the detail page shows for one agent
+    Runs on a worker thread, so it uses its own pooled connection rather than
+    the session's. Returns a dict with 'agent' (the row, or None if missing),
+    'duplicates' (possible duplicate applicants), 'documents' mapping each
+    document column to its blob name, signed URL (or sas_error) and thumbnail
+    bytes (images only) and 'loaded_at' (time.monotonic()). Nothing here may
+    call Streamlit: errors are returned for the page to show.
+    """
+    loaded_at = time.monotonic()
+    conn = get_connection_factory()()
+    try:
+        cursor = conn.cursor()
+        with span('db.select_agent'):
+            cursor.execute("SELECT * FROM agents WHERE id = ?", (agent_id,))
+            row = cursor.fetchone()
+        if row is None:
+            return {'agent': None, 'duplicates': [], 'documents': {}, 'loaded_at': loaded_at}
+        columns = [col[0] for col in cursor.description]
+        agent = dict(zip(columns, row))
+        duplicates = find_duplicates(cursor, agent_id)
+    finally:
+        conn.close()
+
+    documents = {}
+    for doc in DOCUMENT_COLUMNS:
+        blob_name = agent.get(f'{doc}_blob_name')
+        if not blob_name:
+            continue
+        sas_url, sas_error = blob_sas_url(blob_name)
+        documents[doc] = {
+            'blob_name': blob_name,
+            'sas_url': sas_url,
+            'sas_error': sas_error,
+            'thumbnail': get_blob_thumbnail(blob_name) if blob_name.lower().endswith(IMAGE_EXTENSIONS) else None,
+        }
+    return {'agent': agent, 'duplicates': duplicates, 'documents': documents, 'loaded_at': loaded_at}
+
+
+def _session_prefetch():
+    return st.session_state.setdefault('admin_prefetch', {})
+
+
+def prefetch_agents(agent_ids):
+    """Start loading agents in the background (already loaded or loading ones are skipped)"""
+    futures = _session_prefetch()
+    for agent_id in agent_ids:
+        if agent_id not in futures:
+            futures[agent_id] = _prefetch_executor().submit(load_agent_bundle, agent_id)
+    # Oldest entries go first; dicts keep insertion order
+    while len(futures) > PREFETCH_KEEP:
+        futures.pop(next(iter(futures))).cancel()
+
+
+def is_current(cursor, bundle):
+    """
+    True if a loaded bundle still matches the agent's row
+    Compares status and updated_at, which every write that changes what the
+    detail page shows sets (other reviewers, the agent resubmitting, imports).
+    row_ver is no use here: the page renews the reviewer's lease on every
+    render, which bumps it. A deleted (archived) row never matches.
+    """
+    if time.monotonic() - bundle['loaded_at'] > BUNDLE_TTL_SECONDS:
+        return False
+    agent = bundle['agent']
+    cursor.execute("SELECT application_status, updated_at FROM agents WHERE id = ?", (agent['id'],))
+    row = cursor.fetchone()
+    return row is not None and (row[0], row[1]) == (agent['application_status'], agent['updated_at'])
+
+
+def get_agent_bundle(agent_id, cursor):
+    """
+    Return the loaded bundle for an agent, waiting for a prefetch in flight or loading it now
+    A loaded bundle is checked against the row first (one primary-key
+    lookup on cursor) and reloaded if the agent changed since.
+    """
+    future = _session_prefetch().pop(agent_id, None)
+    if future is not None:
+        try:
+            bundle = future.result()
+        except Exception:
+            # Fall through and load on this thread so the error surfaces normally
+            bundle = None
+        if bundle is not None and bundle['agent'] is not None and is_current(cursor, bundle):
+            _session_prefetch()[agent_id] = future
+            return bundle
+    bundle = load_agent_bundle(agent_id)
+    # Kept so reruns of the page (button clicks) do not reload documents and thumbnails
+    if bundle['agent'] is not None:
+        future = Future()
+        future.set_result(bundle)
+        _session_prefetch()[agent_id] = future
+    return bundle
+
+
+def forget_agent(agent_id):
+    """Drop a loaded agent, e.g. after its status changed"""
+    future = _session_prefetch().pop(agent_id, None)
+    if future is not None:
+        future.cancel()
+
+
+def next_pending_ids(cursor, after_id, reviewer, limit=PREFETCH_AHEAD):
+    """
+    Return the ids of the next pending agents reviewer can act on
+    Agents leased to reviewer come first, then unclaimed ones after after_id
+    (wrapping to the start); agents leased to other reviewers are skipped.
+    """
+    cursor.execute(f"""
+        SELECT TOP (?) id FROM agents
+        WHERE application_status = 'Pending' AND id <> ? AND {CLAIMABLE}
+        ORDER BY CASE WHEN claimed_by = ? THEN 0 ELSE 1 END, CASE WHEN id > ? THEN 0 ELSE 1 END, id
+    """, (limit, after_id, reviewer, reviewer, after_id))
+    return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,90 @@
+"""Diffing agent profile submissions against the stored row."""
+import datetime
+import html
+
+from services.export import SENSITIVE_COLUMNS, mask_value
+
+# Columns the agent edits on the agent info form -> label in notifications
+PROFILE_FIELDS = {
+    'prefix': 'Prefix',
+    'first_name': 'First name',
+    'surname': 'Surname',
+    'date_of_birth': 'Date of birth',
+    'gender': 'Gender',
+    'marital_status': 'Marital status',
+    'mobile_number': 'Mobile number',
+    'residential_address': 'Residential address',
+    'state': 'State',
+    'lga': 'LGA',
+    'nok_name': 'Next of kin name',
+    'nok_relationship': 'Next of kin relationship',
+    'nok_contact': 'Next of kin contact',
+    'id_type': 'ID type',
+    'id_number': 'ID number',
+    'bank_name': 'Bank',
+    'account_number': 'Account number',
+    'account_name': 'Account name',
+    'region': 'Region',
+    'preferred_territory': 'Preferred territory',
+    'Agentcategory': 'Agent category',
+    'TaxID': 'Tax ID',
+}
+
+# Document prefix -> label; each document is stored as <prefix>_blob_name/_blob_sha256/_blob_size
+DOCUMENT_FIELDS = {
+    'id_document': 'ID document',
+    'passport_photo': 'Passport photograph',
+    'address_proof': 'Address proof',
+}
+
+
+def _normalise(value):
+    """Comparable form of a stored or submitted value (None and '' are the same)"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def changed_fields(current, values):
+    """Return {column: (old, new)} for the submitted values that differ from the stored row"""
+    return {
+        column: (current.get(column), new)
+        for column, new in values.items()
+        if _normalise(current.get(column)) != _normalise(new)
+    }
+
+
+def update_statement(agent_id, changes, always):
+    """
+    UPDATE agents for the changed columns only
+    always holds columns written with every update (status, timestamps).
+    Returns (sql, params).
+    """
+    columns = {column: new for column, (_, new) in changes.items()}
+    columns.update(always)
+    assignments = ', '.join(f'{column} = ?' for column in columns)
+    return f"UPDATE agents SET {assignments} WHERE id = ?", [*columns.values(), agent_id]
+
+
+def describe_changes(changes):
+    """Human-readable lines for the changed fields (sensitive values masked, documents named)"""
+    lines = []
+    for column, (old, new) in changes.items():
+        if column in PROFILE_FIELDS:
+            if column in SENSITIVE_COLUMNS:
+                old, new = mask_value(old), mask_value(new)
+            lines.append(f"{PROFILE_FIELDS[column]}: {_normalise(old) or '(blank)'} → {_normalise(new) or '(blank)'}")
+    for prefix, label in DOCUMENT_FIELDS.items():
+        if f'{prefix}_blob_name' in changes:
+            lines.append(f"{label}: new file uploaded")
+    return lines
+
+
+def changes_html(changes):
+    """Bullet list of the changed fields for the HR notification emails"""
+    items = ''.join(f"<li>{html.escape(line)}</li>" for line in describe_changes(changes))
+    return f"<p><strong>Changed fields:</strong></p><ul>{items}</ul>" if items else ''
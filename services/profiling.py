@@ -0,0 +1,218 @@
+"""
+On-demand profiling of individual page renders.
+
+An admin arms the profiler from the performance page for the next N renders
+of one page (any session), or a user opens the app with
+?profile=<PROFILE_SECRET>[&profile_runs=N][&profile_mode=sampling] to profile
+their own next N reruns. Each profiled render writes a text report plus a dump
+to PROFILE_DIR:
+  cprofile  deterministic; <name>.prof for snakeviz / flameprof / pstats
+  sampling  stacks sampled every few ms; <name>.folded for flamegraph.pl or speedscope
+When nothing is armed the per-render cost is two dictionary lookups.
+"""
+import contextlib
+import cProfile
+import datetime
+import hmac
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+from config import get_settings
+
+PROFILE_MODES = ['cprofile', 'sampling']
+MAX_PROFILE_RUNS = 20
+
+SAMPLE_INTERVAL_SECONDS = 0.005
+REPORT_LINES = 40
+
+_lock = threading.Lock()
+_armed = {}  # page -> [runs left, mode] (process-wide, set by an admin)
+# Only one profiler runs at a time (cProfile cannot nest across threads on newer Pythons)
+_busy = threading.Lock()
+
+
+def profile_dir():
+    path = get_settings().profile_dir
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def arm_page(page, runs, mode):
+    """Profile the next `runs` renders of `page`, in any session"""
+    with _lock:
+        _armed[page] = [min(max(int(runs), 1), MAX_PROFILE_RUNS), mode]
+
+
+def disarm_page(page):
+    with _lock:
+        _armed.pop(page, None)
+
+
+def armed_pages():
+    """Return {page: (runs left, mode)}"""
+    with _lock:
+        return {page: tuple(state) for page, state in _armed.items()}
+
+
+def arm_from_query_params(query_params, session_state):
+    """
+    Arm profiling for this session from ?profile=<secret>
+    The parameters are removed from the URL either way. Returns an error
+    message when a profile was requested but not armed, else None.
+    """
+    if 'profile' not in query_params:
+        return None
+    given = query_params.pop('profile')
+    runs = query_params.pop('profile_runs', '1')
+    mode = query_params.pop('profile_mode', 'cprofile')
+    secret = get_settings().profile_secret
+    if not secret or not hmac.compare_digest(given.encode(), secret.encode()):
+        return "Profiling is not available."
+    if mode not in PROFILE_MODES or not runs.isdigit():
+        return f"profile_mode must be one of {', '.join(PROFILE_MODES)} and profile_runs a number."
+    session_state.profile_runs_left = min(max(int(runs), 1), MAX_PROFILE_RUNS)
+    session_state.profile_mode = mode
+    return None
+
+
+def _take_run(page, session_state):
+    """Mode to profile this render with (using up one armed run), or None"""
+    if session_state.get('profile_runs_left'):
+        session_state.profile_runs_left -= 1
+        return session_state.profile_mode
+    if page not in _armed:
+        return None
+    with _lock:
+        state = _armed.get(page)
+        if state is None:
+            return None
+        state[0] -= 1
+        if state[0] <= 0:
+            del _armed[page]
+        return state[1]
+
+
+def maybe_profile(page, session_state):
+    """Context manager for one page render: profiles it when armed, otherwise does nothing"""
+    if not session_state.get('profile_runs_left') and page not in _armed:
+        return contextlib.nullcontext()
+    # A render that finds another one being profiled runs normally and keeps the armed run
+    if not _busy.acquire(blocking=False):
+        return contextlib.nullcontext()
+    mode = _take_run(page, session_state)
+    if mode is None:
+        _busy.release()
+        return contextlib.nullcontext()
+    return _profiled(page, mode)
+
+
+@contextlib.contextmanager
+def _profiled(page, mode):
+    name = f"{datetime.datetime.now():%Y%m%d-%H%M%S-%f}-{page}-{mode}"
+    start = time.perf_counter()
+    try:
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                _write_cprofile(profiler, name, page, time.perf_counter() - start)
+        else:
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+            try:
+                yield
+            finally:
+                sampler.stop()
+                _write_sampling(sampler.stacks, name, page, time.perf_counter() - start)
+    finally:
+        _busy.release()
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into folded-stack counts"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL_SECONDS):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _header(page, mode, seconds):
+    return f"Page: {page}\nMode: {mode}\nWall time: {seconds * 1000:.1f} ms\nRecorded: {datetime.datetime.now():%Y-%m-%d %H:%M:%S}\n\n"
+
+
+def _write_cprofile(profiler, name, page, seconds):
+    path = os.path.join(profile_dir(), name)
+    profiler.dump_stats(f"{path}.prof")
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(REPORT_LINES)
+    with open(f"{path}.txt", 'w', encoding='utf-8') as f:
+        f.write(_header(page, 'cprofile', seconds) + report.getvalue())
+
+
+def _write_sampling(stacks, name, page, seconds):
+    path = os.path.join(profile_dir(), name)
+    with open(f"{path}.folded", 'w', encoding='utf-8') as f:
+        f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+    # Self samples (the innermost frame) and inclusive samples (counted once per stack) per function
+    total = sum(stacks.values())
+    own, inclusive = Counter(), Counter()
+    for stack, count in stacks.items():
+        functions = stack.split(';')
+        own[functions[-1]] += count
+        for function in set(functions):
+            inclusive[function] += count
+    lines = [f"{total} samples every {SAMPLE_INTERVAL_SECONDS * 1000:.0f} ms\n"]
+    for title, counts in (('Self', own), ('Inclusive', inclusive)):
+        lines.append(f"\n{title}\n{'samples':>8} {'%':>6}  function\n")
+        lines += [f"{count:>8} {count / total:>6.1%}  {function}\n" for function, count in counts.most_common(REPORT_LINES)]
+    with open(f"{path}.txt", 'w', encoding='utf-8') as f:
+        f.write(_header(page, 'sampling', seconds) + ''.join(lines if total else ['No samples (render too short)\n']))
+
+
+def saved_profiles():
+    """Saved profiles, newest first: dicts with name, report path and dump path"""
+    profiles = []
+    for entry in sorted(os.listdir(profile_dir()), reverse=True):
+        stem, extension = os.path.splitext(entry)
+        if extension != '.txt':
+            continue
+        dump = next(
+            (os.path.join(profile_dir(), stem + ext) for ext in ('.prof', '.folded')
+             if os.path.exists(os.path.join(profile_dir(), stem + ext))),
+            None
+        )
+        profiles.append({'name': stem, 'report': os.path.join(profile_dir(), entry), 'dump': dump})
+    return profiles
+
+
+def delete_profile(profile):
+    for path in (profile['report'], profile['dump']):
+        if path:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
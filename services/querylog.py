@@ -0,0 +1,324 @@
+"""
+Statement timing and the slow-query log.
+
+Connections from services.db are wrapped so that every cursor.execute is
+timed under a fingerprint of the statement (literals and parameter lists
+stripped). Per-fingerprint calls, total/max time and row counts are kept in
+process for the performance page. Statements slower than SLOW_QUERY_MS are
+written to the slow-query log (a JSON-lines file, or the slow_query_log table
+when SLOW_QUERY_LOG=table) with their estimated plan, captured on a side
+connection with SET SHOWPLAN_XML ON (EXPLAIN QUERY PLAN on the SQLite
+backend), so nothing is executed twice. Plans are captured in the
+background, at most once per statement every PLAN_CAPTURE_MINUTES.
+"""
+import collections
+import datetime
+import functools
+import hashlib
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import get_settings
+from services import sqlite_backend
+from services.telemetry import current_page
+
+# Distinct statements tracked per process; later new ones are counted under OTHER_STATEMENT
+MAX_STATEMENTS = 1000
+OTHER_STATEMENT = '(other statements)'
+
+PLAN_CAPTURE_MINUTES = 10
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_stats = {}  # fingerprint -> {'statement', 'calls', 'errors', 'total_ms', 'max_ms', 'rows'}
+_plans_captured = {}  # fingerprint -> monotonic time of the last plan capture
+_log_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """Return (fingerprint, normalised statement) with literals and parameter lists stripped"""
+    text = _COMMENTS.sub(' ', sql)
+    text = _STRINGS.sub('?', text)
+    text = _NUMBERS.sub('?', text)
+    text = _SPACE.sub(' ', text).strip()
+    text = _PARAM_LISTS.sub('(?, ...)', text)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12], text
+
+
+@functools.lru_cache(maxsize=1)
+def _slow_log_executor():
+    """Single background worker for plan capture and slow-log writes"""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='slow-query-log')
+
+
+def _record(sql, params, elapsed_ms, row_count, ok):
+    """Add one execution to the statement stats; hand slow ones to the background logger"""
+    key, text = fingerprint(sql)
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            if len(_stats) >= MAX_STATEMENTS:
+                key = text = OTHER_STATEMENT
+                stats = _stats.get(key)
+            if stats is None:
+                stats = _stats[key] = {'statement': text, 'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0}
+        stats['calls'] += 1
+        stats['errors'] += 0 if ok else 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        stats['rows'] += max(row_count, 0)
+
+        if elapsed_ms < get_settings().slow_query_ms or key == OTHER_STATEMENT:
+            return key
+        now = time.monotonic()
+        capture = now - _plans_captured.get(key, float('-inf')) >= PLAN_CAPTURE_MINUTES * 60
+        if capture:
+            _plans_captured[key] = now
+    entry = {
+        'logged_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'fingerprint': key,
+        'statement': text,
+        'duration_ms': round(elapsed_ms, 1),
+        'row_count': row_count if row_count >= 0 else None,
+        'page': current_page(),
+        'failed': not ok,
+    }
+    _slow_log_executor().submit(_log_slow, entry, sql, params if capture else None)
+    return key
+
+
+def _add_rows(key, count):
+    if key is not None and count:
+        with _lock:
+            if key in _stats:
+                _stats[key]['rows'] += count
+
+
+class InstrumentedCursor:
+    """pyodbc cursor wrapper that times every statement; everything else is passed through"""
+
+    def __init__(self, cursor):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_statement', None)
+
+    def _timed(self, method, sql, params, rows_hint=None):
+        start = time.perf_counter()
+        ok = False
+        try:
+            method(sql, *params)
+            ok = True
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            row_count = self._cursor.rowcount if ok else -1
+            if rows_hint is not None and ok:
+                row_count = rows_hint
+            object.__setattr__(self, '_statement', _record(sql, params, elapsed_ms, row_count, ok))
+        return self
+
+    def execute(self, sql, *params):
+        return self._timed(self._cursor.execute, sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        # The plan of one parameter set stands for the batch
+        return self._timed(
+            lambda statement, *_: self._cursor.executemany(statement, seq_of_params),
+            sql, seq_of_params[:1], rows_hint=len(seq_of_params)
+        )
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        _add_rows(self._statement, row is not None)
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        _add_rows(self._statement, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        _add_rows(self._statement, len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._cursor.__exit__(*exc_info)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+
+class InstrumentedConnection:
+    """pyodbc connection wrapper whose cursors are InstrumentedCursors"""
+
+    def __init__(self, conn):
+        object.__setattr__(self, '_conn', conn)
+
+    def cursor(self):
+        return InstrumentedCursor(self._conn.cursor())
+
+    def execute(self, sql, *params):
+        return self.cursor().execute(sql, *params)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._conn.__exit__(*exc_info)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+
+def instrumented_connect(*args, **kwargs):
+    """pyodbc.connect, returning an InstrumentedConnection"""
+    import pyodbc
+    return InstrumentedConnection(pyodbc.connect(*args, **kwargs))
+
+
+def _side_connection(autocommit=False):
+    """Uninstrumented connection for plan capture and the slow-log table, so they are not timed themselves"""
+    settings = get_settings()
+    if settings.db_backend == 'sqlite':
+        return sqlite_backend.connect(settings.sqlite_path)
+    import pyodbc
+    return pyodbc.connect(settings.db_connection_string, autocommit=autocommit, timeout=5)
+
+
+def capture_plan(sql, params):
+    """
+    Estimated plan XML for a statement, from a side connection with SHOWPLAN_XML on
+    The statement is compiled, not executed. On SQLite the plan is the text of
+    EXPLAIN QUERY PLAN. Returns (plan, error).
+    """
+    try:
+        conn = _side_connection(autocommit=True)
+    except Exception as e:
+        return None, f"Side connection failed: {e}"
+    if sqlite_backend.is_sqlite(conn):
+        try:
+            return _sqlite_plan(conn, sql, params), None
+        except Exception as e:
+            return None, str(e)
+        finally:
+            conn.close()
+    try:
+        cursor = conn.cursor()
+        # SET SHOWPLAN_XML must be alone in its batch
+        cursor.execute("SET SHOWPLAN_XML ON")
+        try:
+            cursor.execute(sql, *params)
+            plans = []
+            while True:
+                if cursor.description:
+                    plans.extend(row[0] for row in cursor.fetchall())
+                if not cursor.nextset():
+                    break
+        finally:
+            cursor.execute("SET SHOWPLAN_XML OFF")
+        return '\n'.join(plans) or None, None
+    except Exception as e:
+        return None, str(e)
+    finally:
+        conn.close()
+
+
+def _sqlite_plan(conn, sql, params):
+    """EXPLAIN QUERY PLAN output as an indented tree"""
+    cursor = conn.cursor()
+    cursor.execute(f"EXPLAIN QUERY PLAN {sqlite_backend.translate(sql)}", *params)
+    depth, lines = {0: -1}, []
+    for node, parent, _, detail in cursor.fetchall():
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append(f"{'  ' * depth[node]}{detail}")
+    return '\n'.join(lines) or None
+
+
+def _log_slow(entry, sql, params):
+    """Background task: capture the plan (when due) and append the entry to the slow-query log"""
+    plan_xml = plan_error = None
+    if params is not None:
+        plan_xml, plan_error = capture_plan(sql, params)
+    entry = {**entry, 'plan_xml': plan_xml, 'plan_error': plan_error}
+    settings = get_settings()
+    try:
+        if settings.slow_query_log == 'table':
+            conn = _side_connection()
+            try:
+                conn.cursor().execute("""
+                    INSERT INTO slow_query_log
+                        (logged_at, fingerprint, statement, duration_ms, row_count, page, failed, plan_xml, plan_error)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (entry['logged_at'], entry['fingerprint'], entry['statement'], entry['duration_ms'],
+                      entry['row_count'], entry['page'], entry['failed'], plan_xml, plan_error))
+                conn.commit()
+            finally:
+                conn.close()
+        else:
+            with _log_lock, open(settings.slow_query_log, 'a', encoding='utf-8') as log:
+                log.write(json.dumps(entry) + '\n')
+    except Exception as e:
+        # The log must never break a page; report on the server console instead
+        print(f"Slow-query log write failed: {e}")
+
+
+def statement_summary():
+    """Per-statement stats since start or the last reset, slowest total first"""
+    with _lock:
+        rows = [{'fingerprint': key, **stats} for key, stats in _stats.items()]
+    return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+
+def recent_slow_queries(limit=50):
+    """Latest slow-query log entries, newest first (plan XML included)"""
+    settings = get_settings()
+    if settings.slow_query_log == 'table':
+        conn = _side_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT TOP (?) logged_at, fingerprint, statement, duration_ms, row_count, page, failed,
+                    CAST(plan_xml AS NVARCHAR(MAX)), plan_error
+                FROM slow_query_log ORDER BY id DESC
+            """, (limit,))
+            columns = ['logged_at', 'fingerprint', 'statement', 'duration_ms', 'row_count', 'page', 'failed',
+                       'plan_xml', 'plan_error']
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+    try:
+        with _log_lock, open(settings.slow_query_log, encoding='utf-8') as log:
+            lines = collections.deque(log, maxlen=limit)
+    except FileNotFoundError:
+        return []
+    return [json.loads(line) for line in reversed(lines)]
+
+
+def reset():
+    """Forget the per-statement stats (the slow-query log is kept)"""
+    with _lock:
+        _stats.clear()
+        _plans_captured.clear()
@@ -0,0 +1,124 @@
+"""Reviewer work queue: leased claims on pending applications."""
+import uuid
+
+import streamlit as st
+
+from services.sqlite_backend import is_sqlite
+
+# A claim lapses this long after it was taken or last renewed
+LEASE_MINUTES = 15
+
+CLAIM_BATCH_SIZE = 5
+
+# Longest display name a reviewer can type; with the session suffix it fits claimed_by (NVARCHAR(100))
+REVIEWER_NAME_MAX_CHARS = 50
+
+# Rows a reviewer may act on: unclaimed, claimed by them, or with a lapsed lease
+CLAIMABLE = "(claimed_by IS NULL OR claimed_by = ? OR lease_expires_at < SYSDATETIME())"
+
+
+def reviewer_name():
+    """
+    Name this session's claims are recorded under (one per browser session, not per login)
+    The typed display name (or the admin login) always gets a per-session
+    suffix, so two reviewers who type the same name never share claims.
+    """
+    if 'reviewer' not in st.session_state:
+        display = st.session_state.get('reviewer_display') or st.session_state.get('admin_user', 'admin')
+        st.session_state.reviewer = f"{display[:REVIEWER_NAME_MAX_CHARS]}-{uuid.uuid4().hex[:6]}"
+    return st.session_state.reviewer
+
+
+def claim_batch(conn, reviewer, batch_size=CLAIM_BATCH_SIZE):
+    """
+    Claim up to batch_size pending applications for reviewer, oldest first
+    Rows the reviewer already holds are renewed and count towards the batch.
+    UPDLOCK + READPAST make concurrent claims skip each other's rows instead
+    of blocking or double-claiming.
+    Returns: (claimed_ids, error)
+    """
+    try:
+        cursor = conn.cursor()
+        if is_sqlite(cursor):
+            return _claim_batch_sqlite(conn, cursor, reviewer, batch_size), None
+        cursor.execute(f"""
+            WITH next_batch AS (
+                SELECT TOP (?) id, claimed_by, lease_expires_at
+                FROM agents WITH (UPDLOCK, READPAST, ROWLOCK)
+                WHERE application_status = 'Pending' AND {CLAIMABLE}
+                ORDER BY CASE WHEN claimed_by = ? THEN 0 ELSE 1 END, submitted_date, id
+            )
+            UPDATE next_batch
+            SET claimed_by = ?, lease_expires_at = DATEADD(minute, ?, SYSDATETIME())
+            OUTPUT inserted.id
+        """, (batch_size, reviewer, reviewer, reviewer, LEASE_MINUTES))
+        claimed = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+        return claimed, None
+    except Exception as e:
+        conn.rollback()
+        return None, str(e)
+
+
+def _claim_batch_sqlite(conn, cursor, reviewer, batch_size):
+    """claim_batch for SQLite: no updatable CTEs or lock hints, but writers are serialised anyway"""
+    cursor.execute(f"""
+        UPDATE agents
+        SET claimed_by = ?, lease_expires_at = DATEADD(minute, ?, SYSDATETIME())
+        WHERE id IN (
+            SELECT id FROM agents
+            WHERE application_status = 'Pending' AND {CLAIMABLE}
+            ORDER BY CASE WHEN claimed_by = ? THEN 0 ELSE 1 END, submitted_date, id
+            LIMIT ?
+        )
+        RETURNING id
+    """, (reviewer, LEASE_MINUTES, reviewer, reviewer, batch_size))
+    claimed = [row[0] for row in cursor.fetchall()]
+    conn.commit()
+    return claimed
+
+
+def renew_lease(conn, reviewer, agent_id):
+    """Extend the reviewer's claim on an agent they are looking at; returns True if they hold it"""
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            UPDATE agents
+            SET claimed_by = ?, lease_expires_at = DATEADD(minute, ?, SYSDATETIME())
+            WHERE id = ? AND application_status = 'Pending' AND {CLAIMABLE}
+        """, (reviewer, LEASE_MINUTES, agent_id, reviewer))
+        renewed = cursor.rowcount > 0
+        conn.commit()
+        return renewed
+    except Exception:
+        conn.rollback()
+        return False
+
+
+def release_claims(conn, reviewer, agent_ids=None):
+    """Give back the reviewer's claims (all of them, or only agent_ids)"""
+    try:
+        cursor = conn.cursor()
+        query = "UPDATE agents SET claimed_by = NULL, lease_expires_at = NULL WHERE claimed_by = ?"
+        params = [reviewer]
+        if agent_ids:
+            query += f" AND id IN ({', '.join('?' * len(agent_ids))})"
+            params.extend(agent_ids)
+        cursor.execute(query, params)
+        conn.commit()
+        return None
+    except Exception as e:
+        conn.rollback()
+        return str(e)
+
+
+def my_queue(cursor, reviewer):
+    """Return the pending agents currently leased to reviewer, oldest submission first"""
+    cursor.execute("""
+        SELECT id, first_name, surname, agent_id, email, state, region, submitted_date, application_ref, lease_expires_at
+        FROM agents
+        WHERE claimed_by = ? AND application_status = 'Pending' AND lease_expires_at > SYSDATETIME()
+        ORDER BY submitted_date, id
+    """, (reviewer,))
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -0,0 +1,247 @@
+"""
+Embedded SQLite backend for local runs, tests and load tests.
+
+With DB_BACKEND=sqlite the connection factories open SQLITE_PATH instead of
+SQL Server; a new database file gets migrations/sqlite_schema.sql on first
+connect, and bench/seed_sqlite.py fills it with a deterministic dataset.
+The app's statements stay in T-SQL: the cursor rewrites the constructs
+SQLite lacks (SYSDATETIME, DATEADD, TOP, OUTPUT inserted.*, LEN, RIGHT,
+STRING_AGG, table hints, MIN_ACTIVE_ROWVERSION) with translate(). The few
+statements that cannot be rewritten mechanically (sp_getapplock,
+OUTPUT ... INTO, updatable CTEs, MERGE) check is_sqlite() at their call site.
+row_ver is kept by triggers from a counter, and the fingerprint columns of
+migration 007 are generated columns. Needs SQLite 3.35+ (RETURNING).
+With MAIL_OUTBOX_DIR and BLOB_LOCAL_DIR set too, the app needs no external service.
+"""
+import datetime
+import functools
+import itertools
+import os
+import re
+import sqlite3
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations', 'sqlite_schema.sql')
+
+# Seconds a writer waits for another connection's write transaction (sp_getapplock waits 30s)
+BUSY_TIMEOUT_SECONDS = 30
+
+# Same text format as SQLite's own timestamps, so stored and computed times compare as strings
+NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+DATEADD_UNITS = {'second': 'seconds', 'minute': 'minutes', 'hour': 'hours', 'day': 'days'}
+
+_PLACEHOLDERS = re.compile(r"'(?:[^']|'')*'|\?")
+_TOP = re.compile(r"^(\s*SELECT\s+)TOP\s*\(\s*(\?|\d+)\s*\)", re.I)
+_OUTPUT = re.compile(r"\bOUTPUT\s+((?:inserted\.\w+\s*,\s*)*inserted\.\w+)\b(?!\s*(?:,|INTO\b))", re.I)
+_DATEADD = re.compile(r"\bDATEADD\(\s*(\w+)\s*,\s*(-?\s*(?:\?|\d+))\s*,\s*SYSDATETIME\(\)\s*\)", re.I)
+_TABLE_HINTS = re.compile(r"\bWITH\s*\(\s*(?:UPDLOCK|READPAST|ROWLOCK|NOLOCK|HOLDLOCK)(?:\s*,\s*(?:UPDLOCK|READPAST|ROWLOCK|NOLOCK|HOLDLOCK))*\s*\)", re.I)
+_RIGHT = re.compile(r"\bRIGHT\(\s*([\w.]+)\s*,\s*(\d+)\s*\)", re.I)
+_REWRITES = [
+    (re.compile(r"\bSYSDATETIME\(\)", re.I), NOW),
+    (re.compile(r"\bMIN_ACTIVE_ROWVERSION\(\)", re.I), "(SELECT value + 1 FROM rowversion_counter)"),
+    (re.compile(r"\bLEN\(", re.I), "LENGTH("),
+    (re.compile(r"\bSTRING_AGG\(", re.I), "GROUP_CONCAT("),
+    (re.compile(r"\bAS\s+NVARCHAR\(MAX\)", re.I), "AS TEXT"),
+]
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}\Z")
+_ISO_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d{1,6})?\Z")
+
+# Declared column type -> Python type reported in cursor.description (as pyodbc does)
+DECLARED_TYPES = [
+    ('DATETIME', datetime.datetime), ('DATE', datetime.date), ('BIT', bool),
+    ('INT', int), ('FLOAT', float), ('REAL', float), ('CHAR', str), ('TEXT', str),
+]
+
+
+def is_sqlite(cursor_or_conn):
+    """True for connections and cursors of this backend (also through the querylog wrappers)"""
+    return getattr(cursor_or_conn, 'dialect', None) == 'sqlite'
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(sql):
+    """Rewrite a T-SQL statement into SQLite's dialect (only the constructs the app uses)"""
+    sql = _DATEADD.sub(lambda m: f"strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime', ({m.group(2)}) || ' {DATEADD_UNITS[m.group(1).lower()]}')", sql)
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+    sql = _RIGHT.sub(r"SUBSTR(\1, -\2)", sql)
+    sql = _TABLE_HINTS.sub('', sql)
+
+    returning = _OUTPUT.search(sql)
+    if returning:
+        columns = re.sub(r"(?i)\binserted\.", '', returning.group(1))
+        sql = sql[:returning.start()] + sql[returning.end():]
+        sql = f"{sql.rstrip().rstrip(';')} RETURNING {columns}"
+
+    top = _TOP.match(sql)
+    if top:
+        limit = top.group(2)
+        sql = top.group(1) + sql[top.end():]
+        if limit == '?':
+            # TOP's parameter comes first but LIMIT goes last, so the placeholders are numbered
+            numbers = itertools.count(2)
+            sql = _PLACEHOLDERS.sub(lambda m: f"?{next(numbers)}" if m.group(0) == '?' else m.group(0), sql)
+            limit = '?1'
+        sql = f"{sql.rstrip().rstrip(';')} LIMIT {limit}"
+    return sql
+
+
+def soundex(value):
+    """SOUNDEX as SQL Server computes it (letter + three digits), for migration 007's name_key"""
+    letters = [c for c in (value or '').upper() if 'A' <= c <= 'Z']
+    if not letters:
+        return None
+    codes = {c: str(digit) for digit, group in enumerate(['AEIOUYHW', 'BFPV', 'CGJKQSXZ', 'DT', 'L', 'MN', 'R']) for c in group}
+    result, previous = letters[0], codes[letters[0]]
+    for c in letters[1:]:
+        code = codes[c]
+        if code != '0' and code != previous:
+            result += code
+        # H and W do not separate letters with the same code
+        if c not in 'HW':
+            previous = code
+    return (result + '000')[:4]
+
+
+def _convert_value(value):
+    """ISO date/datetime text back to date/datetime, as SQL Server's typed columns come back from pyodbc"""
+    if isinstance(value, str) and 10 <= len(value) <= 26 and value[4:5] == '-':
+        if _ISO_DATE.match(value):
+            return datetime.date.fromisoformat(value)
+        if _ISO_DATETIME.match(value):
+            return datetime.datetime.fromisoformat(value)
+    return value
+
+
+def _convert_row(cursor, row):
+    return tuple(_convert_value(value) for value in row)
+
+
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(' '))
+
+
+class SqliteCursor:
+    """sqlite3 cursor with the pyodbc calling conventions the app uses"""
+    dialect = 'sqlite'
+
+    def __init__(self, conn, cursor):
+        self._conn = conn
+        self._cursor = cursor
+        self.fast_executemany = False  # accepted for pyodbc compatibility; executemany is always batched
+
+    def execute(self, sql, *params):
+        # pyodbc takes parameters either spread out or as one sequence
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = params[0]
+        self._cursor.execute(translate(sql), params)
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(translate(sql), seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def nextset(self):
+        return None
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        if self._cursor.description is None:
+            return None
+        types = self._conn.column_types()
+        return [(col[0], types.get(col[0]), None, None, None, None, True) for col in self._cursor.description]
+
+    def close(self):
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        # Like pyodbc: commit when the block succeeds
+        if exc_type is None:
+            self._conn.commit()
+
+
+class SqliteConnection:
+    """sqlite3 connection with the pyodbc interface the app uses (cursor, commit, rollback, close)"""
+    dialect = 'sqlite'
+
+    def __init__(self, path):
+        # Streamlit runs each rerun on a new thread, so a session's connection moves between threads
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        self._conn.row_factory = _convert_row
+        self._conn.create_function('soundex', 1, soundex, deterministic=True)
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._column_types = None
+
+    def cursor(self):
+        return SqliteCursor(self, self._conn.cursor())
+
+    def execute(self, sql, *params):
+        return self.cursor().execute(sql, *params)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+    def column_types(self):
+        """Column name -> Python type from the declared types (agents wins where names repeat)"""
+        if self._column_types is None:
+            types = {}
+            tables = [row[0] for row in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+            for table in sorted(tables, key=lambda name: name == 'agents'):
+                for _, name, declared, *_ in self._conn.execute(f'PRAGMA table_info("{table}")'):
+                    types[name] = next((t for prefix, t in DECLARED_TYPES if prefix in declared.upper()), None)
+            self._column_types = types
+        return self._column_types
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+@functools.lru_cache(maxsize=None)
+def bootstrap(path):
+    """Create the schema in a database file that does not have it yet (once per process and path)"""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS)
+    try:
+        conn.create_function('soundex', 1, soundex, deterministic=True)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'agents'").fetchone() is None:
+            with open(SCHEMA_PATH, encoding='utf-8') as f:
+                conn.executescript(f.read())
+    finally:
+        conn.close()
+    return path
+
+
+def connect(path):
+    """Open the SQLite database at path (creating its schema if needed)"""
+    return SqliteConnection(bootstrap(path))
@@ -0,0 +1,230 @@
+"""Azure Blob Storage helpers for agent documents."""
+import datetime
+import hashlib
+import io
+import os
+import pathlib
+from datetime import timedelta
+
+import streamlit as st
+from azure.storage.blob import BlobServiceClient, BlobBlock, ContentSettings, generate_blob_sas, BlobSasPermissions
+from PIL import Image
+
+from config import get_settings
+from services.telemetry import timed
+
+
+@st.cache_resource
+def get_blob_service_client():
+    """Blob service client shared by every session in this process"""
+    return BlobServiceClient.from_connection_string(get_settings().blob_conn_str)
+
+
+class LocalBlobClient:
+    """The part of the Azure BlobClient used here, backed by files under BLOB_LOCAL_DIR (local runs, load tests)"""
+
+    def __init__(self, root, blob_name):
+        self.blob_name = blob_name
+        self.path = os.path.join(root, *blob_name.split('/'))
+
+    def _block_path(self, block_id):
+        return f"{self.path}.{block_id}.block"
+
+    def stage_block(self, block_id, data):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self._block_path(block_id), 'wb') as f:
+            f.write(data)
+
+    def commit_block_list(self, blocks, content_settings=None):
+        with open(f"{self.path}.tmp", 'wb') as out:
+            for block in blocks:
+                with open(self._block_path(block.id), 'rb') as f:
+                    out.write(f.read())
+        os.replace(f"{self.path}.tmp", self.path)
+        for block in blocks:
+            os.remove(self._block_path(block.id))
+
+    def download_blob(self):
+        # Stands in for the downloader too: download_blob().readall()
+        return self
+
+    def readall(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def delete_blob(self):
+        os.remove(self.path)
+
+
+def get_blob_client(blob_name):
+    """Client for one blob in the configured container (or local directory)"""
+    settings = get_settings()
+    if settings.blob_local_dir:
+        return LocalBlobClient(settings.blob_local_dir, blob_name)
+    return get_blob_service_client().get_blob_client(container=settings.blob_container, blob=blob_name)
+
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Leading bytes of each accepted document type: (signature, extension, content type)
+FILE_SIGNATURES = [
+    (b'%PDF-', 'pdf', 'application/pdf'),
+    (b'\xff\xd8\xff', 'jpg', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'png', 'image/png'),
+]
+
+def sniff_file_type(header):
+    """Return (extension, content_type) detected from the first bytes of a file"""
+    for signature, extension, content_type in FILE_SIGNATURES:
+        if header.startswith(signature):
+            return extension, content_type
+    return None, None
+
+@timed('blob.stage_upload')
+def stage_blob_upload(file, document_type, application_ref, max_size_mb, allowed_extensions):
+    """
+    Validate and upload a file in a single streaming pass.
+    Each chunk is checked (magic bytes on the first, running size limit),
+    hashed and staged as an uncommitted block. Nothing becomes visible until
+    commit_blob_upload() is called, so rejected files leave no blob behind.
+    Returns (staged, error): staged is a dict describing the upload, or None with an error message.
+    """
+    if file is None:
+        return None, "No file uploaded"
+
+    max_bytes = int(max_size_mb * 1024 * 1024)
+    allowed = {'jpg' if ext == 'jpeg' else ext for ext in allowed_extensions}
+    digest = hashlib.sha256()
+    block_ids = []
+    size = 0
+    blob_client = None
+    extension = content_type = None
+
+    try:
+        file.seek(0)
+        while True:
+            chunk = file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if not block_ids:
+                extension, content_type = sniff_file_type(chunk[:16])
+                if extension not in allowed:
+                    return None, f"File content is not an allowed type. Allowed: {', '.join(allowed_extensions)}"
+                timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+                blob_name = f"{document_type}/{application_ref}_{document_type}_{timestamp}.{extension}"
+                blob_client = get_blob_client(blob_name)
+            size += len(chunk)
+            if size > max_bytes:
+                return None, f"File size exceeds {max_size_mb}MB limit"
+            digest.update(chunk)
+            block_id = f"{len(block_ids):06d}"
+            blob_client.stage_block(block_id, chunk)
+            block_ids.append(block_id)
+    except Exception as e:
+        return None, f"Upload failed: {e}"
+    finally:
+        file.seek(0)
+
+    if not block_ids:
+        return None, "File is empty"
+    return {
+        'blob_name': blob_client.blob_name,
+        'block_ids': block_ids,
+        'content_type': content_type,
+        'sha256': digest.hexdigest(),
+        'size': size,
+    }, None
+
+@timed('blob.commit_upload')
+def commit_blob_upload(staged):
+    """Commit a staged upload and return (blob_name, sha256, size_bytes)"""
+    try:
+        blob_client = get_blob_client(staged['blob_name'])
+        blob_client.commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in staged['block_ids']],
+            content_settings=ContentSettings(content_type=staged['content_type'])
+        )
+        # Only the blob reference is stored; signed URLs are generated on demand
+        return staged['blob_name'], staged['sha256'], staged['size']
+    except Exception as e:
+        st.error(f"Error uploading {staged['blob_name']}: {e}")
+        return None, None, None
+
+@timed('blob.upload_file')
+def upload_file_blob(path, blob_name, content_type, download_name):
+    """
+    Upload a local file in blocks (never held in memory whole), served as an
+    attachment named download_name. Returns an error message, or None.
+    """
+    try:
+        blob_client = get_blob_client(blob_name)
+        block_ids = []
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                block_id = f"{len(block_ids):06d}"
+                blob_client.stage_block(block_id, chunk)
+                block_ids.append(block_id)
+        blob_client.commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in block_ids],
+            content_settings=ContentSettings(
+                content_type=content_type, content_disposition=f'attachment; filename="{download_name}"'
+            )
+        )
+        return None
+    except Exception as e:
+        return f"Upload failed: {e}"
+
+def delete_blob(blob_name):
+    """Delete a blob if it exists"""
+    try:
+        get_blob_client(blob_name).delete_blob()
+    except Exception:
+        pass
+
+@timed('blob.sas_url')
+def blob_sas_url(blob_name, hours=24):
+    """
+    Generate a read-only SAS URL (24 hours unless given) for a stored blob name
+    Safe off the script thread (no Streamlit calls). Returns (url, error).
+    """
+    if not blob_name:
+        return None, None
+    if get_settings().blob_local_dir:
+        return pathlib.Path(get_blob_client(blob_name).path).resolve().as_uri(), None
+
+    try:
+        blob_service_client = get_blob_service_client()
+        sas_token = generate_blob_sas(
+            account_name=blob_service_client.account_name,
+            container_name=get_settings().blob_container,
+            blob_name=blob_name,
+            account_key=blob_service_client.credential.account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.datetime.now(datetime.timezone.utc) + timedelta(hours=hours)
+        )
+        return f"{get_settings().blob_base_url}/{blob_name}?{sas_token}", None
+    except Exception as e:
+        return None, f"Error generating SAS URL: {e}"
+
+def get_blob_sas_url(blob_name, hours=24):
+    """blob_sas_url for the script thread: shows the error and returns the URL or None"""
+    url, error = blob_sas_url(blob_name, hours)
+    if error:
+        st.error(error)
+    return url
+
+@timed('blob.thumbnail')
+def get_blob_thumbnail(blob_name, max_px=400):
+    """Download an image blob and return it as JPEG thumbnail bytes (None if it cannot be read)"""
+    try:
+        blob_client = get_blob_client(blob_name)
+        image = Image.open(io.BytesIO(blob_client.download_blob().readall()))
+        image.thumbnail((max_px, max_px))
+        output = io.BytesIO()
+        image.convert('RGB').save(output, format='JPEG', quality=85)
+        return output.getvalue()
+    except Exception:
+        return None
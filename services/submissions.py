@@ -0,0 +1,87 @@
+"""Idempotent agent application submissions."""
+import hashlib
+import json
+
+from services.mailer import send_emails
+
+# A repeat of the same submission within this window returns the stored result
+SUBMISSION_WINDOW_SECONDS = 600
+
+
+def submission_key(agent_id, values, upload_handles):
+    """
+    Idempotency key for one submission: a hash of the agent, the form values and
+    the pending uploads (each spooled upload has a unique path), so clicking
+    submit again with the same form gives the same key
+    """
+    payload = json.dumps(
+        [agent_id, values, [handle['path'] if handle else None for handle in upload_handles]],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def claim_submission(conn, agent_id, key):
+    """
+    Record that a submission with this key has started (committed straight away)
+    Returns (claimed, outcome): claimed is False when the same submission was
+    started within the window; outcome is its stored result, or None while it
+    is still running.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE agents SET submission_key = ?, submission_started_at = SYSDATETIME(),
+            submission_completed_at = NULL, submission_outcome = NULL, submission_notified_at = NULL
+        WHERE id = ? AND (submission_key IS NULL OR submission_key <> ?
+                          OR submission_started_at < DATEADD(second, -?, SYSDATETIME()))
+    """, (key, agent_id, key, SUBMISSION_WINDOW_SECONDS))
+    claimed = cursor.rowcount == 1
+    conn.commit()
+    if claimed:
+        return True, None
+    cursor.execute("SELECT submission_outcome FROM agents WHERE id = ? AND submission_key = ?", (agent_id, key))
+    row = cursor.fetchone()
+    return False, row[0] if row else None
+
+
+def complete_submission(cursor, agent_id, key, outcome):
+    """Store the result of a submission; runs in the caller's transaction so it commits with the update"""
+    cursor.execute("""
+        UPDATE agents SET submission_completed_at = SYSDATETIME(), submission_outcome = ?
+        WHERE id = ? AND submission_key = ?
+    """, (outcome, agent_id, key))
+
+
+def release_submission(conn, agent_id, key):
+    """Forget a submission that failed or wrote nothing, so it can be retried straight away"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE agents SET submission_key = NULL, submission_started_at = NULL
+        WHERE id = ? AND submission_key = ? AND submission_completed_at IS NULL
+    """, (agent_id, key))
+    conn.commit()
+
+
+def send_submission_emails(conn, pending):
+    """
+    Send the notification emails of a committed submission and record that they went out
+    pending: dict with agent_id, key and emails (send_emails tuples). The caller
+    keeps it in session state from before the commit until this returns, so a
+    run cut short in between sends them on the session's next run. Nothing is
+    sent if that submission never committed or its emails already went out.
+    Returns: list of True/False per email (empty when nothing was sent)
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT 1 FROM agents
+        WHERE id = ? AND submission_key = ? AND submission_completed_at IS NOT NULL AND submission_notified_at IS NULL
+    """, (pending['agent_id'], pending['key']))
+    if cursor.fetchone() is None:
+        conn.commit()
+        return []
+    results = send_emails(pending['emails'])
+    cursor.execute("""
+        UPDATE agents SET submission_notified_at = SYSDATETIME() WHERE id = ? AND submission_key = ?
+    """, (pending['agent_id'], pending['key']))
+    conn.commit()
+    return results
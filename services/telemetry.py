@@ -0,0 +1,158 @@
+"""
+Lightweight timing of hot-path calls and page renders.
+
+Every span's duration is kept in a process-wide ring buffer per operation
+(the last SPAN_SAMPLES calls), from which the admin performance page reports
+p50/p95/p99. Recording a span costs a few microseconds. When
+OTEL_EXPORTER_OTLP_ENDPOINT is set and the OpenTelemetry SDK is installed
+(pip install opentelemetry-sdk opentelemetry-exporter-otlp-proto-http), spans
+are also exported to that collector.
+"""
+import contextlib
+import functools
+import math
+import threading
+import time
+from collections import deque
+
+from config import get_settings
+
+# Durations kept per operation; percentiles cover this many most recent calls
+SPAN_SAMPLES = 1000
+
+# Span names for page renders are PAGE_PREFIX + page name
+PAGE_PREFIX = 'page.'
+
+_lock = threading.Lock()
+_samples = {}  # name -> deque of durations (ms)
+_totals = {}   # name -> [calls, errors, total_ms] since start or the last reset
+_otel = {'checked': False, 'tracer': None, 'error_status': None}
+_context = threading.local()
+
+
+def _otel_tracer():
+    """OpenTelemetry tracer for the configured collector, or None (export is optional)"""
+    if _otel['checked']:
+        return _otel['tracer']
+    with _lock:
+        if not _otel['checked']:
+            endpoint = get_settings().otel_endpoint
+            if endpoint:
+                try:
+                    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+                    from opentelemetry.sdk.resources import Resource
+                    from opentelemetry.sdk.trace import TracerProvider
+                    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+                    from opentelemetry.trace import Status, StatusCode
+                except ImportError:
+                    pass
+                else:
+                    provider = TracerProvider(resource=Resource.create({'service.name': 'agent-onboarding'}))
+                    provider.add_span_processor(BatchSpanProcessor(
+                        OTLPSpanExporter(endpoint=f"{endpoint.rstrip('/')}/v1/traces")
+                    ))
+                    _otel['tracer'] = provider.get_tracer(__name__)
+                    _otel['error_status'] = Status(StatusCode.ERROR)
+            _otel['checked'] = True
+    return _otel['tracer']
+
+
+def otel_enabled():
+    """True when spans are also exported to an OpenTelemetry collector"""
+    return _otel_tracer() is not None
+
+
+def set_page(page):
+    """Note the page this thread (a Streamlit script run) is rendering"""
+    _context.page = page
+
+
+def current_page():
+    """Page being rendered by this thread, or None (background threads, fragment reruns)"""
+    return getattr(_context, 'page', None)
+
+
+def record(name, duration_ms, ok=True):
+    """Add one timed call to the ring buffer"""
+    with _lock:
+        samples = _samples.get(name)
+        if samples is None:
+            samples = _samples[name] = deque(maxlen=SPAN_SAMPLES)
+            _totals[name] = [0, 0, 0.0]
+        samples.append(duration_ms)
+        totals = _totals[name]
+        totals[0] += 1
+        totals[1] += 0 if ok else 1
+        totals[2] += duration_ms
+
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """
+    Time the enclosed block as one call of operation `name`
+    Exceptions count as errors; Streamlit's rerun/stop signals do not.
+    attributes are only sent to OpenTelemetry.
+    """
+    tracer = _otel_tracer()
+    # Streamlit control flow (st.rerun, st.stop) raises BaseExceptions; only real errors are recorded
+    otel_span = (
+        tracer.start_as_current_span(name, attributes=attributes, record_exception=False, set_status_on_exception=False)
+        if tracer else contextlib.nullcontext()
+    )
+    start = time.perf_counter()
+    ok = True
+    with otel_span as current:
+        try:
+            yield
+        except Exception as e:
+            ok = False
+            if current is not None:
+                current.record_exception(e)
+                current.set_status(_otel['error_status'])
+            raise
+        finally:
+            record(name, (time.perf_counter() - start) * 1000, ok)
+
+
+def timed(name):
+    """Decorator: time every call of the function as operation `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)) - 1, 0)]
+
+
+def summary():
+    """One dict per operation: calls, errors, total seconds and p50/p95/p99/max (ms) of recent calls"""
+    with _lock:
+        snapshot = [(name, sorted(samples), list(_totals[name])) for name, samples in _samples.items()]
+    rows = []
+    for name, durations, (calls, errors, total_ms) in sorted(snapshot):
+        rows.append({
+            'operation': name,
+            'calls': calls,
+            'errors': errors,
+            'total_s': total_ms / 1000,
+            'p50_ms': percentile(durations, 0.50),
+            'p95_ms': percentile(durations, 0.95),
+            'p99_ms': percentile(durations, 0.99),
+            'max_ms': durations[-1] if durations else None,
+        })
+    return rows
+
+
+def reset():
+    """Forget all recorded spans"""
+    with _lock:
+        _samples.clear()
+        _totals.clear()
@@ -0,0 +1,157 @@
+"""Agent application status transitions and their notifications."""
+import datetime
+
+from services.mailer import DISCLAIMER_HTML, send_emails
+from services.review_queue import CLAIMABLE
+from services.sqlite_backend import is_sqlite
+
+HR_CC_EMAILS = ['humanresources@avonhealthcare.com','salesdepartment@avonhealthcare.com','ifeoluwa.adeniyi@avonhealthcare.com', 'adebola.adesoyin@avonhealthcare.com']
+
+# SQL Server accepts at most 2100 parameters per statement
+TRANSITION_CHUNK_SIZE = 2000
+
+# Columns returned by the UPDATE for building notifications
+NOTIFY_COLUMNS = ['id', 'first_name', 'surname', 'email', 'agent_id', 'application_ref']
+
+
+def transition_agents(conn, agent_ids, new_status, reviewer, from_status='Pending'):
+    """
+    Move agents from from_status to new_status on behalf of reviewer
+    Only rows still in from_status and not leased to another reviewer are
+    updated, so concurrent reviewers cannot both act on the same agent. The
+    notification fields of the updated rows come back from the UPDATE itself
+    (OUTPUT inserted.*), the change is appended to agent_status_history in the
+    same statement, and the reviewer's claim on them is cleared.
+    Returns: ((updated_rows, conflicts, when), error) where conflicts maps each
+    skipped agent id to (current_status, claimed_by), or (None, None) if the
+    row no longer exists
+    """
+    agent_ids = list(agent_ids)
+    when = datetime.datetime.now()
+    output = ', '.join(f'inserted.{col}' for col in NOTIFY_COLUMNS)
+    try:
+        cursor = conn.cursor()
+        updated = []
+        for start in range(0, len(agent_ids), TRANSITION_CHUNK_SIZE):
+            chunk = agent_ids[start:start + TRANSITION_CHUNK_SIZE]
+            if is_sqlite(cursor):
+                updated.extend(_transition_chunk_sqlite(cursor, chunk, new_status, reviewer, from_status, when))
+                continue
+            cursor.execute(f"""
+                UPDATE agents SET application_status = ?, updated_at = ?,
+                    claimed_by = NULL, lease_expires_at = NULL
+                OUTPUT inserted.id, deleted.application_status, inserted.application_status, inserted.updated_at, ?,
+                    inserted.region, inserted.Agentcategory
+                    INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by, region, category)
+                OUTPUT {output}
+                WHERE application_status = ? AND {CLAIMABLE}
+                  AND id IN ({', '.join('?' * len(chunk))})
+            """, (new_status, when, reviewer, from_status, reviewer, *chunk))
+            updated.extend(dict(zip(NOTIFY_COLUMNS, row)) for row in cursor.fetchall())
+        conn.commit()
+
+        # Only look up rows that lost the race
+        updated_ids = {agent['id'] for agent in updated}
+        conflicts = {agent_id: (None, None) for agent_id in agent_ids if agent_id not in updated_ids}
+        missing = list(conflicts)
+        for start in range(0, len(missing), TRANSITION_CHUNK_SIZE):
+            chunk = missing[start:start + TRANSITION_CHUNK_SIZE]
+            cursor.execute(
+                f"SELECT id, application_status, claimed_by FROM agents WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            conflicts.update({row[0]: (row[1], row[2]) for row in cursor.fetchall()})
+        return (updated, conflicts, when), None
+    except Exception as e:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return None, str(e)
+
+
+def _transition_chunk_sqlite(cursor, chunk, new_status, reviewer, from_status, when):
+    """
+    SQLite version of the UPDATE above: RETURNING has no deleted.* or INTO, but
+    every updated row was in from_status, so the history rows are inserted
+    from the returned ids in the same transaction
+    """
+    cursor.execute(f"""
+        UPDATE agents SET application_status = ?, updated_at = ?,
+            claimed_by = NULL, lease_expires_at = NULL
+        WHERE application_status = ? AND {CLAIMABLE}
+          AND id IN ({', '.join('?' * len(chunk))})
+        RETURNING {', '.join(NOTIFY_COLUMNS)}, region, Agentcategory
+    """, (new_status, when, from_status, reviewer, *chunk))
+    rows = cursor.fetchall()
+    if rows:
+        cursor.executemany("""
+            INSERT INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by, region, category)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(row[0], from_status, new_status, when, reviewer, *row[-2:]) for row in rows])
+    return [dict(zip(NOTIFY_COLUMNS, row)) for row in rows]
+
+
+def describe_conflict(status, claimed_by, from_status='Pending'):
+    """Short reason an agent was skipped by transition_agents"""
+    if status is None:
+        return 'not found'
+    if status == from_status and claimed_by:
+        return f'claimed by {claimed_by}'
+    return f'already {status}'
+
+
+def notify_transitions(updated, new_status, when):
+    """Email every agent in updated over one SMTP session; returns one True/False per agent"""
+    build = NOTIFICATIONS[new_status]
+    return send_emails([
+        (agent['email'], *build(agent, when), HR_CC_EMAILS) for agent in updated
+    ])
+
+
+def approval_email(agent, when):
+    """Return (subject, body_html) for an approval notification"""
+    return 'Congratulations! Your Agent Application has been Approved', f'''
+<html>
+<body>
+<p>Dear {agent['first_name']} {agent['surname']},</p>
+<p>Congratulations! Your application to become a freelance sales agent with Avon Healthcare has been approved.</p>
+<p><strong>Your Agent Details:</strong><br>
+- Agent ID: {agent['agent_id']}<br>
+- Application Reference: {agent['application_ref']}<br>
+- Status: Approved<br>
+- Approval Date: {when.strftime('%Y-%m-%d')}</p>
+<p>You can now log in to your agent portal and begin your work https://independent-agentapp.streamlit.app/ . If you have any questions, please contact our HR team.</p>
+<p>Best regards,<br>Avon Healthcare Limited</p>
+<hr>
+{DISCLAIMER_HTML}
+</body>
+</html>
+'''
+
+
+def rejection_email(agent, when):
+    """Return (subject, body_html) for a rejection notification"""
+    return 'Agent Application Update - Application Not Approved', f'''
+<html>
+<body>
+<p>Dear {agent['first_name']} {agent['surname']},</p>
+<p>Thank you for your interest in becoming a freelance sales agent with Avon Healthcare.</p>
+<p>After careful review, we regret to inform you that your application has not been approved at this time.</p>
+<p><strong>Your Application Details:</strong><br>
+- Application Reference: {agent['application_ref']}<br>
+- Status: Not Approved<br>
+- Review Date: {when.strftime('%Y-%m-%d')}</p>
+<p>If you have any questions about this decision, please contact our HR team at humanresources@avonhealthcare.com.</p>
+<p>Best regards,<br>Avon Healthcare Limited</p>
+<hr>
+{DISCLAIMER_HTML}
+</body>
+</html>
+'''
+
+
+NOTIFICATIONS = {
+    'Approved': approval_email,
+    'Rejected': rejection_email,
+}
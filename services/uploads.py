@@ -0,0 +1,138 @@
+"""On-disk spool for uploads that have been picked but not yet submitted."""
+import os
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+from config import get_settings
+
+SPOOL_CHUNK_SIZE = 256 * 1024
+
+
+@st.cache_resource
+def _upload_spool_state():
+    """Process-wide spool bookkeeping shared by all sessions"""
+    os.makedirs(get_settings().upload_spool_dir, exist_ok=True)
+    # reserved: bytes of uploads still being copied in (they count against the cap)
+    return {'lock': threading.Lock(), 'last_sweep': 0.0, 'reserved': 0}
+
+def upload_spool_usage():
+    """Return (file_count, total_bytes) of the completed uploads in the spool"""
+    count, total = 0, 0
+    try:
+        with os.scandir(get_settings().upload_spool_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith('.upload'):
+                    count += 1
+                    total += entry.stat().st_size
+    except FileNotFoundError:
+        pass
+    return count, total
+
+def sweep_upload_spool(force=False):
+    """Delete spooled uploads older than the TTL (at most once a minute unless forced)"""
+    state = _upload_spool_state()
+    now = time.time()
+    if not force and now - state['last_sweep'] < 60:
+        return
+    state['last_sweep'] = now
+    cutoff = now - get_settings().upload_spool_ttl_minutes * 60
+    with os.scandir(get_settings().upload_spool_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+def _spool_has_room(state, size):
+    """Whether size more bytes fit under the spool cap (call with state['lock'] held)"""
+    capacity = get_settings().upload_spool_max_mb * 1024 * 1024
+    return upload_spool_usage()[1] + state['reserved'] + size <= capacity
+
+def spool_upload(file, max_size_mb):
+    """
+    Copy an UploadedFile to the on-disk spool in chunks.
+    The lock is only held to reserve space and to publish the finished file,
+    so a slow upload does not hold up other sessions' uploads.
+    Returns (handle, error): handle is a small dict safe to keep in session state.
+    """
+    state = _upload_spool_state()
+    sweep_upload_spool()
+    max_bytes = int(max_size_mb * 1024 * 1024)
+    reserved = min(file.size, max_bytes)
+    with state['lock']:
+        if not _spool_has_room(state, reserved):
+            sweep_upload_spool(force=True)
+            if not _spool_has_room(state, reserved):
+                return None, "The server is busy processing other uploads. Please try again in a few minutes."
+        state['reserved'] += reserved
+
+    name = uuid.uuid4().hex
+    path = os.path.join(get_settings().upload_spool_dir, f"{name}.upload")
+    # Written under a temporary name, renamed once complete
+    part_path = os.path.join(get_settings().upload_spool_dir, f"{name}.part")
+    size = 0
+    try:
+        file.seek(0)
+        with open(part_path, 'wb') as out:
+            while True:
+                chunk = file.read(SPOOL_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"File size exceeds {max_size_mb}MB limit")
+                out.write(chunk)
+    except Exception as e:
+        try:
+            os.remove(part_path)
+        except FileNotFoundError:
+            pass
+        with state['lock']:
+            state['reserved'] -= reserved
+        return None, str(e)
+    with state['lock']:
+        state['reserved'] -= reserved
+        os.replace(part_path, path)
+    return {'path': path, 'name': file.name, 'size': size}, None
+
+def open_spooled_upload(handle):
+    """Open a spooled upload for reading, or return None if it has expired"""
+    try:
+        return open(handle['path'], 'rb')
+    except (FileNotFoundError, TypeError, KeyError):
+        return None
+
+def release_spooled_upload(handle):
+    """Remove a spooled upload from disk"""
+    if handle:
+        try:
+            os.remove(handle['path'])
+        except (FileNotFoundError, KeyError):
+            pass
+
+def pending_upload_input(label, state_key, max_size_mb, **uploader_kwargs):
+    """
+    Render a file uploader whose selection is spooled to disk straight away.
+    Only the spool handle is kept in st.session_state[state_key]; the uploader
+    widget is reset so Streamlit can drop its in-memory copy of the file.
+    Must be called inside an st.fragment. Returns the pending handle (or None).
+    """
+    revision = st.session_state.get(f'{state_key}_rev', 0)
+    uploaded = st.file_uploader(label, key=f'{state_key}_widget_{revision}', **uploader_kwargs)
+    if uploaded is not None:
+        handle, error = spool_upload(uploaded, max_size_mb)
+        if error:
+            st.error(error)
+        else:
+            release_spooled_upload(st.session_state.get(state_key))
+            st.session_state[state_key] = handle
+            st.session_state[f'{state_key}_rev'] = revision + 1
+            st.rerun(scope="fragment")
+    handle = st.session_state.get(state_key)
+    if handle:
+        st.caption(f"📎 {handle['name']} ({handle['size'] / 1024:.0f} KB) ready to submit")
+    return handle
@@ -0,0 +1,184 @@
+"""Admin agent detail view."""
+import streamlit as st
+
+from services.db import get_db_connection, note_primary_write
+from services.duplicates import describe_duplicate
+from services.prefetch import forget_agent, get_agent_bundle, next_pending_ids, prefetch_agents
+from services.review_queue import release_claims, renew_lease, reviewer_name
+from services.transitions import describe_conflict, notify_transitions, transition_agents
+
+DOCUMENT_LABELS = {
+    'passport_photo': 'Passport Photograph',
+    'id_document': 'ID Document',
+    'address_proof': 'Address Proof',
+}
+
+
+def render():
+    """Render the full record of the selected agent"""
+    conn = get_db_connection()
+    if conn is None:
+        st.stop()
+    cursor = conn.cursor()
+    if not st.session_state.get('is_admin', False):
+        st.error("Unauthorized access. Please log in as admin.")
+        st.session_state.page = 'admin_login'
+        st.rerun()
+        st.stop()
+
+    agent_id = st.session_state.get('selected_agent_id')
+    if not agent_id:
+        st.error("No agent selected")
+        st.session_state.page = 'admin_dashboard'
+        st.rerun()
+        st.stop()
+
+    st.title('Agent Details')
+    notice = st.session_state.pop('admin_detail_notice', None)
+    if notice:
+        level, message = notice
+        getattr(st, level)(message)
+    try:
+        # Usually already loaded in the background while the previous agent was reviewed
+        bundle = get_agent_bundle(agent_id, cursor)
+        agent = bundle['agent']
+        if agent:
+            name = f"{agent.get('prefix', '')} {agent.get('first_name', '')} {agent.get('surname', '')}".strip()
+            st.subheader(f"{name} ({agent.get('agent_id', 'N/A')})")
+            status = agent.get('application_status', 'Unknown')
+            status_emoji = {
+                'Approved': '🟢',
+                'Pending': '🟡',
+                'Incomplete': '⚪',
+                'Rejected': '🔴'
+            }.get(status, '')
+            st.write(f"**Status:** {status_emoji} {status}")
+
+            duplicates = bundle['duplicates']
+            if duplicates:
+                st.warning(f"Possible duplicate applicant: {len(duplicates)} other record(s) share details with this one.")
+                for duplicate in duplicates:
+                    st.button(
+                        describe_duplicate(duplicate), key=f"duplicate_{duplicate['id']}",
+                        on_click=show_agent, args=(duplicate['id'],)
+                    )
+            
+            with st.expander("Personal Information", expanded=True):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write(f"**Name:** {name}")
+                    st.write(f"**Date of Birth:** {agent.get('date_of_birth', 'N/A')}")
+                    st.write(f"**Gender:** {agent.get('gender', 'N/A')}")
+                with col2:
+                    st.write(f"**Age:** {agent.get('age', 'N/A')}")
+                    st.write(f"**Marital Status:** {agent.get('marital_status', 'N/A')}")
+
+            with st.expander("Contact Information"):
+                st.write(f"**Email:** {agent.get('email', 'N/A')}")
+                st.write(f"**Mobile:** {agent.get('mobile_number', 'N/A')}")
+                st.write(f"**Address:** {agent.get('residential_address', 'N/A')}")
+                st.write(f"**State:** {agent.get('state', 'N/A')}")
+                st.write(f"**LGA:** {agent.get('lga', 'N/A')}")
+
+            with st.expander("Next of Kin"):
+                st.write(f"**Name:** {agent.get('nok_name', 'N/A')}")
+                st.write(f"**Relationship:** {agent.get('nok_relationship', 'N/A')}")
+                st.write(f"**Contact:** {agent.get('nok_contact', 'N/A')}")
+
+            with st.expander("Identification"):
+                st.write(f"**ID Type:** {agent.get('id_type', 'N/A')}")
+                st.write(f"**ID Number:** {agent.get('id_number', 'N/A')}")
+
+            with st.expander("Banking Information"):
+                st.write(f"**Bank:** {agent.get('bank_name', 'N/A')}")
+                st.write(f"**Account Number:** {agent.get('account_number', 'N/A')}")
+                st.write(f"**Account Name:** {agent.get('account_name', 'N/A')}")
+
+            with st.expander("Business Information"):
+                st.write(f"**Region:** {agent.get('region', 'N/A')}")
+                st.write(f"**Agent Category:** {agent.get('Agentcategory', 'N/A')}")
+                st.write(f"**Preferred Territory:** {agent.get('preferred_territory', 'N/A')}")
+                st.write(f"**Tax ID:** {agent.get('TaxID', 'N/A')}")
+
+            with st.expander("Documents"):
+                for doc, label in DOCUMENT_LABELS.items():
+                    document = bundle['documents'].get(doc)
+                    if not document:
+                        st.info(f"{label}: Not uploaded")
+                    elif not document['sas_url']:
+                        st.warning(f"Unable to generate access URL for {label.lower()}: {document['sas_error']}")
+                    else:
+                        st.write(f"**{label}:**")
+                        if document['thumbnail']:
+                            st.image(document['thumbnail'], width=200)
+                        st.link_button(f"Download {label}", document['sas_url'])
+
+            # Load the next few pending applications while this one is reviewed
+            upcoming = next_pending_ids(cursor, agent_id, reviewer_name())
+            prefetch_agents(upcoming)
+
+            # Actions (approve/reject only while Pending)
+            st.write("---")
+            st.subheader("Actions")
+            col1, col2, col3 = st.columns(3)
+            # Opening a pending application claims it (or renews this reviewer's lease)
+            if status == 'Pending' and not renew_lease(conn, reviewer_name(), agent_id):
+                st.warning("Another reviewer is working on this application; actions are unavailable until their claim lapses.")
+            elif status == 'Pending':
+                with col1:
+                    st.button("Approve Application", key=f"approve_detail_{agent_id}", on_click=transition_agent, args=(agent_id, 'Approved'))
+                with col2:
+                    st.button("Reject Application", key=f"reject_detail_{agent_id}", on_click=transition_agent, args=(agent_id, 'Rejected'))
+            with col3:
+                st.button(
+                    "Next pending ➡", key='next_pending', disabled=not upcoming,
+                    on_click=show_agent, args=(upcoming[0] if upcoming else None,)
+                )
+
+        else:
+            st.error("Agent not found")
+            st.session_state.page = 'admin_dashboard'
+            st.rerun()
+    except Exception as e:
+        st.error(f"Error loading agent details: {e}")
+
+    # Navigation
+    st.write('---')
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button('Back to Dashboard'):
+            st.session_state.page = 'admin_dashboard'
+            st.rerun()
+    with col2:
+        if st.button('Logout'):
+            release_claims(conn, reviewer_name())
+            st.session_state.clear()
+            st.rerun()
+
+
+def transition_agent(agent_id, new_status):
+    """Button callback: move this agent out of Pending and report the outcome on the rerun"""
+    verb = 'approved' if new_status == 'Approved' else 'rejected'
+    result, error = transition_agents(get_db_connection(), [agent_id], new_status, reviewer_name())
+    note_primary_write()
+    forget_agent(agent_id)
+    if error:
+        st.session_state.admin_detail_notice = ('error', f"Error updating agent: {error}")
+        return
+    updated, conflicts, when = result
+    if conflicts:
+        st.session_state.admin_detail_notice = (
+            'warning', f"No change made: this application is {describe_conflict(*conflicts[agent_id])}"
+        )
+        return
+    agent = updated[0]
+    if notify_transitions(updated, new_status, when)[0]:
+        message = f"Agent {agent['agent_id']} {verb} and notification sent"
+    else:
+        message = f"Agent {agent['agent_id']} {verb} (email notification failed)"
+    st.session_state.admin_detail_notice = ('success', message)
+
+
+def show_agent(agent_id):
+    """Button callback: move the detail page to another agent"""
+    st.session_state.selected_agent_id = agent_id
@@ -0,0 +1,169 @@
+"""Admin onboarding analytics."""
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from services.analytics import DURATION_METRICS, bucket_percentile, format_hours
+from services.db import get_read_connection
+
+STATUSES = ['Incomplete', 'Pending', 'Approved', 'Rejected']
+
+
+def render():
+    """Render the onboarding funnel and SLA page from the daily rollups"""
+    if not st.session_state.get('is_admin', False):
+        st.error("Unauthorized access. Please log in as admin.")
+        st.session_state.page = 'admin_login'
+        st.rerun()
+        st.stop()
+
+    st.title('Onboarding Analytics')
+    try:
+        regions, categories, latest_day = load_filter_options()
+    except Exception as e:
+        st.error(f"Error loading analytics: {e}")
+        regions, categories, latest_day = [], [], None
+    st.caption(
+        f"Daily rollups up to {latest_day:%Y-%m-%d}" if latest_day
+        else "No rollups yet. Run `python -m jobs.rollup_analytics` to build them."
+    )
+
+    today = datetime.date.today()
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        date_range = st.date_input("Period", (today - datetime.timedelta(days=30), today), key="analytics_period")
+    with col2:
+        region = st.selectbox("Region", ['All'] + regions, key="analytics_region")
+    with col3:
+        category = st.selectbox("Agent Category", ['All'] + categories, key="analytics_category")
+    if len(date_range) != 2:
+        st.info("Select the end of the period.")
+        st.stop()
+    start, end = date_range
+
+    try:
+        daily = load_status_rollup(region, category)
+        durations = load_durations(start, end, region, category)
+        breakdown = load_breakdown(start, end)
+    except Exception as e:
+        st.error(f"Error loading analytics: {e}")
+        st.stop()
+
+    # Agents in each status at the end of the period (sum of entries minus exits)
+    st.subheader(f"Applications by status on {end:%Y-%m-%d}")
+    upto_end = daily[daily['day'] <= end]
+    current = (upto_end.groupby('status')['entered'].sum() - upto_end.groupby('status')['exited'].sum())
+    cols = st.columns(len(STATUSES))
+    for col, status in zip(cols, STATUSES):
+        with col:
+            st.metric(status, int(current.get(status, 0)))
+
+    # Funnel for the period
+    st.subheader("In this period")
+    in_period = daily[(daily['day'] >= start) & (daily['day'] <= end)]
+    entered = in_period.groupby('status')['entered'].sum()
+    signups = int(entered.get('Incomplete', 0))
+    submissions = int(entered.get('Pending', 0))
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Sign-ups", signups)
+    with col2:
+        st.metric("Submissions", submissions)
+    with col3:
+        st.metric("Approved", int(entered.get('Approved', 0)))
+    with col4:
+        st.metric("Rejected", int(entered.get('Rejected', 0)))
+    with col5:
+        st.metric("Submitted / signed up", f"{submissions / signups:.0%}" if signups else "n/a")
+
+    # Time-to-submit and time-to-decision percentiles
+    st.subheader("Turnaround")
+    cols = st.columns(len(DURATION_METRICS))
+    for col, (metric, label) in zip(cols, DURATION_METRICS.items()):
+        buckets = durations.get(metric, {})
+        with col:
+            st.write(f"**{label}** ({sum(buckets.values())} applications)")
+            st.write(f"Median: {format_hours(bucket_percentile(buckets, 0.5))} · "
+                     f"90th percentile: {format_hours(bucket_percentile(buckets, 0.9))}")
+
+    st.subheader("Daily activity")
+    if in_period.empty:
+        st.info("No activity in this period.")
+    else:
+        st.line_chart(in_period.pivot_table(index='day', columns='status', values='entered', aggfunc='sum', fill_value=0))
+
+    st.subheader("By region and category")
+    if not breakdown.empty:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.dataframe(
+                breakdown.pivot_table(index='region', columns='status', values='entered', aggfunc='sum', fill_value=0),
+                use_container_width=True
+            )
+        with col2:
+            st.dataframe(
+                breakdown.pivot_table(index='category', columns='status', values='entered', aggfunc='sum', fill_value=0),
+                use_container_width=True
+            )
+
+    st.write('---')
+    if st.button('Back to Dashboard'):
+        st.session_state.page = 'admin_dashboard'
+        st.rerun()
+
+
+# Rollups change when the rollup job runs, so a few minutes of caching is safe
+
+@st.cache_data(ttl=300)
+def load_filter_options():
+    """Return (regions, categories, latest rolled-up day)"""
+    cursor = get_read_connection().cursor()
+    cursor.execute("SELECT DISTINCT region FROM analytics_daily_status ORDER BY region")
+    regions = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT DISTINCT category FROM analytics_daily_status ORDER BY category")
+    categories = [row[0] for row in cursor.fetchall()]
+    cursor.execute("SELECT MAX(day) FROM analytics_daily_status")
+    return regions, categories, cursor.fetchone()[0]
+
+
+@st.cache_data(ttl=300)
+def load_status_rollup(region, category):
+    """Daily entries into and exits out of each status (all days; a few rows per day)"""
+    cursor = get_read_connection().cursor()
+    cursor.execute("""
+        SELECT day, status, SUM(entered), SUM(exited)
+        FROM analytics_daily_status
+        WHERE (? = 'All' OR region = ?) AND (? = 'All' OR category = ?)
+        GROUP BY day, status
+    """, (region, region, category, category))
+    return pd.DataFrame([tuple(row) for row in cursor.fetchall()], columns=['day', 'status', 'entered', 'exited'])
+
+
+@st.cache_data(ttl=300)
+def load_durations(start, end, region, category):
+    """Return {metric: {bucket_hours: samples}} for the period"""
+    cursor = get_read_connection().cursor()
+    cursor.execute("""
+        SELECT metric, bucket_hours, SUM(samples)
+        FROM analytics_daily_durations
+        WHERE day BETWEEN ? AND ? AND (? = 'All' OR region = ?) AND (? = 'All' OR category = ?)
+        GROUP BY metric, bucket_hours
+    """, (start, end, region, region, category, category))
+    durations = {}
+    for metric, bucket, samples in cursor.fetchall():
+        durations.setdefault(metric, {})[bucket] = samples
+    return durations
+
+
+@st.cache_data(ttl=300)
+def load_breakdown(start, end):
+    """Entries into each status per region and category for the period"""
+    cursor = get_read_connection().cursor()
+    cursor.execute("""
+        SELECT region, category, status, SUM(entered)
+        FROM analytics_daily_status
+        WHERE day BETWEEN ? AND ?
+        GROUP BY region, category, status
+    """, (start, end))
+    return pd.DataFrame([tuple(row) for row in cursor.fetchall()], columns=['region', 'category', 'status', 'entered'])
@@ -0,0 +1,487 @@
+"""Admin dashboard."""
+import datetime
+import os
+
+import pandas as pd
+import streamlit as st
+
+from config import get_settings
+from services.db import get_db_connection, get_read_connection, is_replica_connection, note_primary_write
+from services.export import EXPORT_FORMATS, EXPORT_LINK_HOURS, export_register, new_export_path, publish_export
+from services import transitions
+from services.review_queue import (
+    CLAIM_BATCH_SIZE, LEASE_MINUTES, claim_batch, my_queue, release_claims, reviewer_name
+)
+from services.storage import delete_blob, get_blob_sas_url
+from services.uploads import upload_spool_usage
+
+
+def render():
+    """Render the HR/admin dashboard"""
+    conn = get_db_connection()
+    if conn is None:
+        st.stop()
+    if not st.session_state.get('is_admin', False):
+        st.error("Unauthorized access. Please log in as admin.")
+        st.session_state.page = 'admin_login'
+        st.rerun()
+        st.stop()
+
+    st.session_state.setdefault('admin_status_overrides', {})
+
+    st.title('HR/Admin Dashboard')
+    st.write(f"Welcome, {st.session_state.get('admin_user', 'Admin')}")
+
+    # Summary Metrics (redrawn in place by the agent list fragment after a status change)
+    metrics_slot = st.empty()
+    read_conn = get_read_connection() or conn
+    render_metrics(read_conn.cursor(), metrics_slot)
+    if is_replica_connection(read_conn):
+        st.caption(f"Reporting from a read replica (at most {get_settings().db_read_max_staleness_seconds}s behind)")
+
+    # Pending uploads held on this server across all sessions
+    spool_files, spool_bytes = upload_spool_usage()
+    spool_capacity = get_settings().upload_spool_max_mb * 1024 * 1024
+    st.progress(
+        min(spool_bytes / spool_capacity, 1.0),
+        text=f"Pending uploads on disk: {spool_bytes / (1024 * 1024):.1f} MB of {get_settings().upload_spool_max_mb} MB ({spool_files} files)"
+    )
+
+    view = st.radio("View", ["All agents", "My review queue"], horizontal=True, key="admin_view")
+    if view == "My review queue":
+        review_queue_panel()
+    else:
+        agent_search(metrics_slot)
+
+    # Navigation
+    st.write('---')
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button('Onboarding Analytics'):
+            st.session_state.page = 'admin_analytics'
+            st.rerun()
+    with col2:
+        if st.button('Logout'):
+            release_claims(conn, reviewer_name())
+            st.session_state.clear()
+            st.rerun()
+
+
+def agent_search(metrics_slot):
+    """Filters and the full agent list"""
+    # Filter and Search
+    st.subheader("Filter and Search Agents")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        status_filter = st.selectbox(
+            "Filter by Status",
+            ["All", "Pending", "Approved", "Incomplete", "Rejected"],
+            key="status_filter"
+        )
+    with col2:
+        region_list = ['All', 'North', 'South', 'East', 'West', 'Central', 'Multi-Region']
+        region_filter = st.selectbox("Filter by Region", region_list, key="region_filter")
+    with col3:
+        search_query = st.text_input("Search by Name, Email, or Agent ID", key="search_query")
+
+    # Build SQL filter
+    conditions = []
+    params = []
+
+    if status_filter != "All":
+        conditions.append("application_status = ?")
+        params.append(status_filter)
+    if region_filter != "All":
+        conditions.append("region = ?")
+        params.append(region_filter)
+    if search_query:
+        conditions.append("(first_name LIKE ? OR surname LIKE ? OR email LIKE ? OR agent_id LIKE ?)")
+        search_term = f"%{search_query}%"
+        params.extend([search_term, search_term, search_term, search_term])
+
+    where = " AND ".join(conditions) if conditions else "1 = 1"
+
+    # Agent List (brought up to date on every full page run)
+    st.session_state.admin_list_stale = True
+    agent_list(where, params, metrics_slot)
+    export_panel(where, params)
+
+
+def render_metrics(cursor, slot):
+    """Draw the application summary into slot using one aggregate query"""
+    try:
+        cursor.execute("""
+            SELECT COUNT(*),
+                SUM(CASE WHEN application_status = 'Pending' THEN 1 ELSE 0 END),
+                SUM(CASE WHEN application_status = 'Approved' THEN 1 ELSE 0 END),
+                SUM(CASE WHEN application_status = 'Incomplete' THEN 1 ELSE 0 END),
+                SUM(CASE WHEN application_status = 'Rejected' THEN 1 ELSE 0 END)
+            FROM agents
+        """)
+        total_apps, pending_count, approved_count, incomplete_count, rejected_count = [
+            value or 0 for value in cursor.fetchone()
+        ]
+
+        with slot.container():
+            st.subheader("Application Summary")
+            col1, col2, col3, col4, col5 = st.columns(5)
+            with col1:
+                st.metric("Total Applications", total_apps)
+            with col2:
+                st.metric("Pending Review", pending_count)
+            with col3:
+                st.metric("Approved", approved_count)
+            with col4:
+                st.metric("Incomplete", incomplete_count)
+            with col5:
+                st.metric("Rejected", rejected_count)
+    except Exception as e:
+        slot.error(f"Error fetching metrics: {e}")
+
+
+LIST_COLUMNS = "id, first_name, surname, agent_id, email, application_status, state, region, submitted_date, application_ref, claimed_by, lease_expires_at"
+
+# Deletions are not visible to the row_ver delta, so the list is reloaded in full this often
+FULL_RELOAD_SECONDS = 600
+
+
+def refresh_agent_rows(cursor, where, params, cache, source):
+    """
+    Bring the cached agent list for this filter up to date
+    A cheap probe (MAX(row_ver), new submissions) runs every time; the list
+    itself is only queried for rows whose row_ver is at or above the last
+    high-water mark, and those rows are merged into the cache. A replica
+    lags the primary, so switching source forces a full reload.
+    Returns: (cache, error)
+    """
+    key = (where, tuple(params))
+    now = datetime.datetime.now()
+    seen_at = st.session_state.setdefault('admin_seen_at', now)
+    try:
+        cursor.execute("""
+            SELECT (SELECT MAX(row_ver) FROM agents),
+                   (SELECT COUNT(*) FROM agents WHERE submitted_date > ?)
+        """, (seen_at,))
+        latest, new_submissions = cursor.fetchone()
+
+        full_reload = (
+            cache is None or cache['key'] != key or cache['source'] != source
+            or (now - cache['loaded_at']).total_seconds() > FULL_RELOAD_SECONDS
+        )
+        if not full_reload and (latest is None or latest < cache['hwm']):
+            return dict(cache, new_submissions=new_submissions), None
+
+        # Rows committed after this point carry a row_ver >= hwm, so the next delta sees them
+        cursor.execute("SELECT MIN_ACTIVE_ROWVERSION()")
+        hwm = cursor.fetchone()[0]
+
+        if full_reload:
+            cursor.execute(f"SELECT {LIST_COLUMNS} FROM agents WHERE {where}", params)
+            columns = [col[0] for col in cursor.description]
+            rows = {row[0]: dict(zip(columns, row)) for row in cursor.fetchall()}
+            loaded_at = now
+        else:
+            # Changed rows that no longer match the filter are dropped from the list
+            cursor.execute(f"""
+                SELECT {LIST_COLUMNS}, CASE WHEN {where} THEN 1 ELSE 0 END AS in_filter
+                FROM agents WHERE row_ver >= ?
+            """, (*params, cache['hwm']))
+            columns = [col[0] for col in cursor.description]
+            rows = dict(cache['rows'])
+            for row in cursor.fetchall():
+                agent = dict(zip(columns, row))
+                if agent.pop('in_filter'):
+                    rows[agent['id']] = agent
+                else:
+                    rows.pop(agent['id'], None)
+            loaded_at = cache['loaded_at']
+    except Exception as e:
+        return None, str(e)
+
+    # Fresh rows from the database supersede statuses changed in place
+    st.session_state.admin_status_overrides = {}
+    return {
+        'key': key,
+        'source': source,
+        'rows': rows,
+        'hwm': hwm,
+        'loaded_at': loaded_at,
+        'new_submissions': new_submissions,
+    }, None
+
+
+def mark_submissions_seen():
+    """Button callback: reset the new-submissions badge"""
+    st.session_state.admin_seen_at = datetime.datetime.now()
+    st.session_state.admin_agent_rows = dict(st.session_state.admin_agent_rows, new_submissions=0)
+
+
+STATUS_COLOURS = {
+    'Approved': 'background-color: #d4edda; color: #155724',
+    'Pending': 'background-color: #fff3cd; color: #856404',
+    'Incomplete': 'background-color: #e2e3e5; color: #383d41',
+    'Rejected': 'background-color: #f8d7da; color: #721c24',
+}
+
+
+@st.fragment
+def agent_list(where, params, metrics_slot):
+    """Agent grid and actions; selecting or acting on a row reruns only this fragment"""
+    if st.session_state.get('admin_metrics_stale'):
+        st.session_state.admin_metrics_stale = False
+        conn = get_read_connection()
+        if conn is not None:
+            render_metrics(conn.cursor(), metrics_slot)
+
+    # Changes are merged in on full page runs (filters, navigation) and reused by fragment reruns
+    cache = st.session_state.get('admin_agent_rows')
+    if st.session_state.get('admin_list_stale', True) or cache is None or cache['key'] != (where, tuple(params)):
+        conn = get_read_connection()
+        if conn is None:
+            return
+        source = 'replica' if is_replica_connection(conn) else 'primary'
+        cache, error = refresh_agent_rows(conn.cursor(), where, params, cache, source)
+        if error:
+            st.error(f"Error fetching agent list: {error}")
+            return
+        st.session_state.admin_agent_rows = cache
+        st.session_state.admin_list_stale = False
+    agent_data = list(cache['rows'].values())
+
+    st.subheader("Agent List")
+    if cache['new_submissions']:
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.info(f"🆕 {cache['new_submissions']} new submissions since {st.session_state.admin_seen_at:%Y-%m-%d %H:%M}")
+        with col2:
+            st.button("Mark as seen", on_click=mark_submissions_seen, use_container_width=True)
+    bulk_results = st.session_state.pop('admin_bulk_results', None)
+    if bulk_results:
+        summary, results = bulk_results
+        st.success(summary)
+        st.dataframe(pd.DataFrame(results), hide_index=True, use_container_width=True)
+    if not agent_data:
+        st.info("No agents found matching the criteria.")
+        return
+
+    overrides = st.session_state.admin_status_overrides
+    now = datetime.datetime.now()
+    grid = pd.DataFrame([{
+        'id': agent['id'],
+        'Name': f"{agent.get('first_name') or ''} {agent.get('surname') or ''}".strip(),
+        'Agent ID': agent.get('agent_id'),
+        'Email': agent.get('email'),
+        'Status': overrides.get(agent['id'], agent.get('application_status')),
+        'State': agent.get('state'),
+        'Region': agent.get('region'),
+        'Submitted On': agent.get('submitted_date'),
+        'Application Ref': agent.get('application_ref'),
+        'Claimed By': agent.get('claimed_by') if (agent.get('lease_expires_at') or now) > now else None,
+    } for agent in agent_data])
+    selection = st.dataframe(
+        grid.style.map(lambda status: STATUS_COLOURS.get(status, ''), subset=['Status']),
+        key='admin_agent_grid',
+        on_select='rerun',
+        selection_mode='multi-row',
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'id': None,
+            'Email': st.column_config.TextColumn(width='medium'),
+            'Submitted On': st.column_config.DateColumn(format='YYYY-MM-DD'),
+        },
+    )
+    st.caption(f"{len(grid)} agents · select one row to view it, or several to approve or reject together")
+
+    selected = grid.iloc[selection.selection.rows]
+    pending_ids = [int(agent_id) for agent_id in selected.loc[selected['Status'] == 'Pending', 'id']]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("View Details", disabled=len(selected) != 1, use_container_width=True):
+            st.session_state.selected_agent_id = int(selected['id'].iloc[0])
+            st.session_state.page = 'admin_agent_detail'
+            st.rerun()
+    with col2:
+        st.button(
+            f"Approve {len(pending_ids)} pending" if len(pending_ids) > 1 else "Approve",
+            key='admin_approve_selected', disabled=not pending_ids, use_container_width=True,
+            on_click=approve_selected, args=(pending_ids,)
+        )
+    with col3:
+        st.button(
+            f"Reject {len(pending_ids)} pending" if len(pending_ids) > 1 else "Reject",
+            key='admin_reject_selected', disabled=not pending_ids, use_container_width=True,
+            on_click=reject_selected, args=(pending_ids,)
+        )
+
+
+@st.fragment
+def export_panel(where, params):
+    """Export the agents matching the current filters without rerunning the page"""
+    with st.expander("Export agent register"):
+        col1, col2 = st.columns(2)
+        with col1:
+            fmt = st.radio("Format", list(EXPORT_FORMATS), format_func=str.upper, horizontal=True, key="export_format")
+        with col2:
+            mask = st.checkbox("Mask account and ID numbers", value=True, key="export_mask")
+
+        if st.button("Prepare export"):
+            conn = get_read_connection()
+            if conn is None:
+                return
+            # This session's previous export is replaced
+            previous = st.session_state.pop('admin_export_blob', None)
+            if previous:
+                delete_blob(previous)
+            path = new_export_path(fmt)
+            with st.spinner("Exporting..."), open(path, 'wb') as out:
+                count, error = export_register(conn.cursor(), out, fmt, where, params, mask)
+            if error:
+                os.remove(path)
+                st.error(f"Error exporting agents: {error}")
+                return
+            with st.spinner("Uploading..."):
+                blob_name, error = publish_export(path, fmt)
+            if error:
+                st.error(f"Error exporting agents: {error}")
+                return
+            st.session_state.admin_export_blob = blob_name
+            # The browser downloads straight from storage; the link is only offered on this run
+            url = get_blob_sas_url(blob_name, hours=EXPORT_LINK_HOURS)
+            if url:
+                st.link_button(f"Download {count} agents ({fmt.upper()})", url)
+                st.caption(f"The link expires in {EXPORT_LINK_HOURS} hour(s); prepare the export again after that.")
+
+
+def approve_selected(agent_ids):
+    """Button callback: approve the selected agents that are still pending"""
+    apply_transition(agent_ids, 'Approved')
+
+
+def reject_selected(agent_ids):
+    """Button callback: reject the selected agents that are still pending"""
+    apply_transition(agent_ids, 'Rejected')
+
+
+def apply_transition(agent_ids, new_status):
+    """Move the selected pending agents to new_status and record a per-agent summary"""
+    verb = 'approved' if new_status == 'Approved' else 'rejected'
+    result, error = transitions.transition_agents(get_db_connection(), agent_ids, new_status, reviewer_name())
+    note_primary_write()
+    if error:
+        st.error(f"Error updating agents: {error}")
+        return
+    updated, conflicts, when = result
+    sent = transitions.notify_transitions(updated, new_status, when)
+
+    results = []
+    for agent, email_sent in zip(updated, sent):
+        st.session_state.admin_status_overrides[agent['id']] = new_status
+        results.append({
+            'Agent ID': agent['agent_id'],
+            'Name': f"{agent['first_name']} {agent['surname']}",
+            'Result': verb.capitalize(),
+            'Notification': 'Sent' if email_sent else 'Failed',
+        })
+    # Rows another reviewer moved out of Pending or holds a claim on
+    listed = st.session_state.admin_agent_rows['rows'] if 'admin_agent_rows' in st.session_state else {}
+    for agent_id, (current, claimed_by) in conflicts.items():
+        agent = listed.get(agent_id, {})
+        if current:
+            st.session_state.admin_status_overrides[agent_id] = current
+        results.append({
+            'Agent ID': agent.get('agent_id', agent_id),
+            'Name': f"{agent.get('first_name') or ''} {agent.get('surname') or ''}".strip(),
+            'Result': f"Skipped ({transitions.describe_conflict(current, claimed_by)})",
+            'Notification': '',
+        })
+    st.session_state.admin_bulk_results = (
+        f"{len(updated)} of {len(updated) + len(conflicts)} agents {verb}, {sum(sent)} notifications sent",
+        results,
+    )
+    st.session_state.admin_metrics_stale = True
+
+
+# ==========================================
+# Reviewer work queue
+# ==========================================
+
+@st.fragment
+def review_queue_panel():
+    """The pending applications leased to this reviewer"""
+    conn = get_db_connection()
+    if conn is None:
+        return
+    reviewer = reviewer_name()
+    st.subheader(f"My Review Queue ({reviewer})")
+    st.caption(f"Claimed applications are hidden from other reviewers until you act on them or {LEASE_MINUTES} minutes pass without you opening them.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button(f"Claim next {CLAIM_BATCH_SIZE}", on_click=claim_next, use_container_width=True)
+    with col2:
+        st.button("Release all", on_click=release_all, use_container_width=True)
+    notice = st.session_state.pop('admin_queue_notice', None)
+    if notice:
+        level, message = notice
+        getattr(st, level)(message)
+
+    try:
+        queue = my_queue(conn.cursor(), reviewer)
+    except Exception as e:
+        st.error(f"Error fetching review queue: {e}")
+        return
+    if not queue:
+        st.info("Your queue is empty. Claim a batch to start reviewing.")
+        return
+
+    grid = pd.DataFrame([{
+        'id': agent['id'],
+        'Name': f"{agent.get('first_name') or ''} {agent.get('surname') or ''}".strip(),
+        'Agent ID': agent.get('agent_id'),
+        'State': agent.get('state'),
+        'Region': agent.get('region'),
+        'Submitted On': agent.get('submitted_date'),
+        'Lease Expires': agent.get('lease_expires_at'),
+    } for agent in queue])
+    selection = st.dataframe(
+        grid,
+        key='admin_queue_grid',
+        on_select='rerun',
+        selection_mode='single-row',
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'id': None,
+            'Submitted On': st.column_config.DateColumn(format='YYYY-MM-DD'),
+            'Lease Expires': st.column_config.DatetimeColumn(format='HH:mm'),
+        },
+    )
+    selected = selection.selection.rows
+    if st.button("Review", disabled=not selected, use_container_width=True):
+        st.session_state.selected_agent_id = int(grid['id'].iloc[selected[0]])
+        st.session_state.page = 'admin_agent_detail'
+        st.rerun()
+
+
+def claim_next():
+    """Button callback: lease the next batch of pending applications to this reviewer"""
+    claimed, error = claim_batch(get_db_connection(), reviewer_name())
+    note_primary_write()
+    if error:
+        st.session_state.admin_queue_notice = ('error', f"Error claiming applications: {error}")
+    elif not claimed:
+        st.session_state.admin_queue_notice = ('info', "No unclaimed pending applications left")
+    else:
+        st.session_state.admin_queue_notice = ('success', f"{len(claimed)} applications in your queue")
+
+
+def release_all():
+    """Button callback: hand this reviewer's claims back to the shared pool"""
+    error = release_claims(get_db_connection(), reviewer_name())
+    note_primary_write()
+    if error:
+        st.session_state.admin_queue_notice = ('error', f"Error releasing claims: {error}")
+    else:
+        st.session_state.admin_queue_notice = ('success', "Your claims were released")
@@ -0,0 +1,41 @@
+"""Admin login page."""
+import streamlit as st
+
+from config import get_settings
+from services.review_queue import REVIEWER_NAME_MAX_CHARS
+
+
+def render():
+    """Render the HR/admin login page"""
+    st.title('HR/Admin Portal Login')
+    st.write('Authorized personnel only')
+    st.write('Debug: Admin login form rendered')
+    
+    with st.form('admin_login_form', clear_on_submit=True):
+        admin_username = st.text_input('Username', key='admin_username_input')
+        admin_password = st.text_input('Password', type='password', key='admin_password_input')
+        reviewer_name = st.text_input(
+            'Your name (shown to other reviewers)', key='admin_reviewer_input', max_chars=REVIEWER_NAME_MAX_CHARS
+        )
+        admin_login_button = st.form_submit_button('Login as Admin', use_container_width=True)
+        
+        if admin_login_button:
+            if admin_username and admin_password:
+                # Simple hardcoded admin check (replace with database check later)
+                if admin_username == get_settings().admin_login and admin_password == get_settings().admin_password: 
+                    st.session_state.is_admin = True
+                    st.session_state.admin_user = admin_username
+                    # Display only: reviewer_name() adds the per-session suffix claims are recorded under
+                    st.session_state.pop('reviewer', None)
+                    st.session_state.reviewer_display = reviewer_name.strip()[:REVIEWER_NAME_MAX_CHARS]
+                    st.session_state.page = 'admin_dashboard'
+                    st.rerun()
+                else:
+                    st.error('Invalid admin credentials')
+            else:
+                st.warning('Please enter username and password')
+    
+    st.write('---')
+    if st.button('← Back to Agent Login'):
+        st.session_state.page = 'login'
+        st.rerun()
@@ -0,0 +1,188 @@
+"""Admin performance page (hidden: open with ?page=admin_performance)."""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from config import get_settings
+from services import profiling, querylog
+from services.telemetry import PAGE_PREFIX, SPAN_SAMPLES, otel_enabled, reset, summary
+
+# Statements listed in the top-statements table
+TOP_STATEMENTS = 25
+
+STAT_COLUMNS = {
+    'calls': st.column_config.NumberColumn('Calls'),
+    'errors': st.column_config.NumberColumn('Errors'),
+    'total_s': st.column_config.NumberColumn('Total (s)', format='%.2f'),
+    'p50_ms': st.column_config.NumberColumn('p50 (ms)', format='%.1f'),
+    'p95_ms': st.column_config.NumberColumn('p95 (ms)', format='%.1f'),
+    'p99_ms': st.column_config.NumberColumn('p99 (ms)', format='%.1f'),
+    'max_ms': st.column_config.NumberColumn('Max (ms)', format='%.1f'),
+}
+
+
+def render():
+    """Render per-page and per-operation timings recorded by this server process"""
+    if not st.session_state.get('is_admin', False):
+        st.error("Unauthorized access. Please log in as admin.")
+        st.session_state.page = 'admin_login'
+        st.rerun()
+        st.stop()
+
+    st.title('Performance')
+    st.caption(
+        f"Timings recorded by this server process since it started or was last cleared. "
+        f"Percentiles cover the last {SPAN_SAMPLES} calls of each operation. "
+        + ("Spans are also exported to the OpenTelemetry collector." if otel_enabled()
+           else "OpenTelemetry export is off (set OTEL_EXPORTER_OTLP_ENDPOINT to enable).")
+    )
+
+    stats = pd.DataFrame(summary(), columns=['operation', *STAT_COLUMNS])
+    pages = stats[stats['operation'].str.startswith(PAGE_PREFIX)].copy()
+    pages['operation'] = pages['operation'].str[len(PAGE_PREFIX):]
+    operations = stats[~stats['operation'].str.startswith(PAGE_PREFIX)]
+
+    st.subheader('Page renders')
+    if pages.empty:
+        st.info('No page renders recorded yet.')
+    else:
+        st.dataframe(
+            pages.sort_values('p95_ms', ascending=False), hide_index=True, use_container_width=True,
+            column_config={'operation': st.column_config.TextColumn('Page'), **STAT_COLUMNS}
+        )
+
+    st.subheader('Operations')
+    if operations.empty:
+        st.info('No operations recorded yet.')
+    else:
+        st.dataframe(
+            operations.sort_values('total_s', ascending=False), hide_index=True, use_container_width=True,
+            column_config={'operation': st.column_config.TextColumn('Operation'), **STAT_COLUMNS}
+        )
+
+    statements_panel()
+    profiler_panel()
+
+    st.write('---')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.button('Refresh')
+    with col2:
+        st.button('Clear timings', on_click=clear_timings)
+    with col3:
+        if st.button('Back to Dashboard'):
+            st.session_state.page = 'admin_dashboard'
+            st.rerun()
+
+
+def statements_panel():
+    """Top SQL statements by total time, and the latest entries of the slow-query log"""
+    settings = get_settings()
+    st.subheader('SQL statements')
+    st.caption("Grouped by fingerprint (literals and parameter lists stripped). "
+               f"Statements over {settings.slow_query_ms} ms are written to the slow-query log "
+               f"({'slow_query_log table' if settings.slow_query_log == 'table' else settings.slow_query_log}).")
+    statements = pd.DataFrame(
+        querylog.statement_summary()[:TOP_STATEMENTS],
+        columns=['fingerprint', 'statement', 'calls', 'errors', 'total_ms', 'max_ms', 'rows']
+    )
+    if statements.empty:
+        st.info('No statements recorded yet.')
+    else:
+        statements['avg_ms'] = statements['total_ms'] / statements['calls']
+        st.dataframe(
+            statements[['statement', 'calls', 'errors', 'total_ms', 'avg_ms', 'max_ms', 'rows', 'fingerprint']],
+            hide_index=True, use_container_width=True,
+            column_config={
+                'statement': st.column_config.TextColumn('Statement', width='large'),
+                'calls': st.column_config.NumberColumn('Calls'),
+                'errors': st.column_config.NumberColumn('Errors'),
+                'total_ms': st.column_config.NumberColumn('Total (ms)', format='%.0f'),
+                'avg_ms': st.column_config.NumberColumn('Avg (ms)', format='%.1f'),
+                'max_ms': st.column_config.NumberColumn('Max (ms)', format='%.1f'),
+                'rows': st.column_config.NumberColumn('Rows'),
+                'fingerprint': st.column_config.TextColumn('Fingerprint'),
+            }
+        )
+
+    st.subheader('Slow statements')
+    try:
+        slow = querylog.recent_slow_queries()
+    except Exception as e:
+        st.error(f"Error reading the slow-query log: {e}")
+        return
+    if not slow:
+        st.info('No slow statements logged.')
+        return
+    for i, entry in enumerate(slow):
+        with st.expander(f"{entry['logged_at']} · {entry['duration_ms']:.0f} ms · "
+                         f"{entry['page'] or 'unknown page'} · {entry['fingerprint']}"):
+            st.code(entry['statement'], language='sql')
+            if entry['row_count'] is not None:
+                st.write(f"Rows affected: {entry['row_count']}")
+            if entry['plan_xml'] and not entry['plan_xml'].startswith('<'):
+                # EXPLAIN QUERY PLAN text from the SQLite backend
+                st.code(entry['plan_xml'], language=None)
+            elif entry['plan_xml']:
+                st.download_button(
+                    'Download plan (.sqlplan)', entry['plan_xml'], file_name=f"{entry['fingerprint']}.sqlplan",
+                    mime='application/xml', key=f"slow_plan_{i}", on_click='ignore'
+                )
+            elif entry['plan_error']:
+                st.caption(f"No plan: {entry['plan_error']}")
+            else:
+                st.caption(f"Plan captured at most once every {querylog.PLAN_CAPTURE_MINUTES} minutes per statement.")
+
+
+def profiler_panel():
+    """Arm the profiler for the next renders of a page and download saved profiles"""
+    st.subheader('Profiler')
+    st.caption("Profiles the next renders of a page in any session. A single session can also be profiled with "
+               "?profile=<PROFILE_SECRET>&profile_runs=N&profile_mode=cprofile|sampling. "
+               f"Reports are saved to {get_settings().profile_dir}.")
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+    with col1:
+        # Pages rendered by this process so far (the ones with timings above)
+        pages = sorted(row['operation'][len(PAGE_PREFIX):] for row in summary() if row['operation'].startswith(PAGE_PREFIX))
+        page = st.selectbox('Page', pages, key='profile_page')
+    with col2:
+        runs = st.number_input('Renders', min_value=1, max_value=profiling.MAX_PROFILE_RUNS, value=1, key='profile_runs')
+    with col3:
+        mode = st.selectbox('Profiler', profiling.PROFILE_MODES, key='profile_mode_choice')
+    with col4:
+        st.button('Arm', on_click=profiling.arm_page, args=(page, runs, mode), disabled=page is None, use_container_width=True)
+    for armed_page, (runs_left, armed_mode) in profiling.armed_pages().items():
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.write(f"Armed: next {runs_left} render(s) of **{armed_page}** ({armed_mode})")
+        with col2:
+            st.button('Disarm', key=f"disarm_{armed_page}", on_click=profiling.disarm_page, args=(armed_page,))
+
+    try:
+        profiles = profiling.saved_profiles()
+    except Exception as e:
+        st.error(f"Error listing profiles: {e}")
+        return
+    for profile in profiles:
+        with st.expander(profile['name']):
+            with open(profile['report'], encoding='utf-8') as f:
+                report = f.read()
+            st.code(report, language=None)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.download_button('Report', report, file_name=f"{profile['name']}.txt",
+                                   key=f"report_{profile['name']}", on_click='ignore')
+            with col2:
+                if profile['dump']:
+                    with open(profile['dump'], 'rb') as f:
+                        st.download_button('Dump', f.read(), file_name=profile['dump'].rsplit(os.sep, 1)[-1],
+                                           key=f"dump_{profile['name']}", on_click='ignore')
+            with col3:
+                st.button('Delete', key=f"delete_{profile['name']}", on_click=profiling.delete_profile, args=(profile,))
+
+
+def clear_timings():
+    """Button callback: forget the span and statement timings"""
+    reset()
+    querylog.reset()
@@ -0,0 +1,505 @@
+"""Agent information form."""
+import datetime
+import time
+from datetime import timedelta
+
+import streamlit as st
+
+from services.db import get_db_connection, get_lgas_for_state
+from services.duplicates import duplicates_html, find_duplicates
+from services.mailer import DISCLAIMER_HTML
+from services.profile_changes import DOCUMENT_FIELDS, changed_fields, changes_html, update_statement
+from services.storage import commit_blob_upload, stage_blob_upload
+from services.submissions import (
+    claim_submission, complete_submission, release_submission, send_submission_emails, submission_key
+)
+from services.telemetry import span
+from services.uploads import open_spooled_upload, pending_upload_input, release_spooled_upload
+from views.navigation import agent_sidebar
+
+# The submit button stays disabled this long at most if a submission run is cut
+# short (the idempotency key still guards against a repeat after that)
+SUBMIT_BUTTON_LOCK_SECONDS = 120
+
+HR_RECIPIENTS = [
+    'humanresources@avonhealthcare.com', 'salesdepartment@avonhealthcare.com',
+    'ifeoluwa.adeniyi@avonhealthcare.com', 'adebola.adesoyin@avonhealthcare.com',
+]
+
+
+def render():
+    """Render the agent information form"""
+    conn = get_db_connection()
+    if conn is None:
+        st.stop()
+    cursor = conn.cursor()
+    agent_sidebar()
+    st.title('Agent Information Form')
+    st.write('Please complete all required fields and upload necessary documents.')
+    # Field edits are batched in one st.form and sent together on submit. Only the
+    # State -> LGA pair and the document uploaders rerun on interaction, each in
+    # its own small fragment. Pending uploads are spooled to disk; session state
+    # only holds their handles
+    for key in ['uploaded_id_doc', 'uploaded_passport', 'uploaded_address_proof']:
+        if key not in st.session_state:
+            st.session_state[key] = None
+    # Outcome of the last submission, shown after the rerun that re-enables the button
+    for level, message in st.session_state.pop('agent_info_notices', []):
+        getattr(st, level)(message)
+
+    # Fetch agent data outside form context
+    agent_data_prefill = {}
+    if st.session_state.db_id:
+        try:
+            with span('db.select_agent'):
+                cursor.execute("SELECT * FROM agents WHERE id = ?", (st.session_state.db_id,))
+                row = cursor.fetchone()
+            if row:
+                columns = [column[0] for column in cursor.description]
+                agent_data_prefill = dict(zip(columns, row))
+        except Exception as e:
+            st.error(f'Error fetching agent data: {e}')
+
+        # Agent ID input
+        st.subheader('Agent Identification')
+        st.text_input('Agent ID', value=agent_data_prefill.get('agent_id', st.session_state.get('agent_id', '')), key='agent_id_display', disabled=True, help='This ID is automatically generated by the system')
+        agent_id_input = st.session_state.get('agent_id')  # Keep compatibility with backend logic
+
+        location_inputs(agent_data_prefill)
+        document_inputs(agent_data_prefill)
+
+        # Determine if this is an update or initial submission
+        is_update = agent_data_prefill.get('application_status') not in [None, 'Incomplete']
+        button_text = 'Update Application' if is_update else 'Submit Application'
+        submitting = time.time() - st.session_state.get('agent_submitting_since', 0) < SUBMIT_BUTTON_LOCK_SECONDS
+
+        with st.form('agent_info_form'):
+            # Personal Information
+            st.subheader('Personal Information')
+            col1, col2 = st.columns(2)
+            prefixes = ['Mr', 'Mrs', 'Miss', 'Dr', 'Prof', 'Engr']
+            prefix_index = prefixes.index(agent_data_prefill.get('prefix', 'Mr')) if agent_data_prefill.get('prefix') in prefixes else 0
+            with col1:
+                prefix = st.selectbox('Prefix *', prefixes, index=prefix_index, key='prefix')
+                first_name = st.text_input('First Name *', value=agent_data_prefill.get('first_name', ''), key='first_name')
+
+                # Get default date - use prefill if available and valid, otherwise use safe default
+                default_dob = agent_data_prefill.get('date_of_birth', datetime.date(1990, 1, 1))
+                min_dob = datetime.date(1924, 1, 1)
+                max_dob = datetime.date.today() - timedelta(days=365*18)
+
+                # Ensure default is within valid range
+                if default_dob < min_dob:
+                    default_dob = datetime.date(1990, 1, 1)
+                elif default_dob > max_dob:
+                    default_dob = max_dob
+                date_of_birth = st.date_input(
+                    'Date of Birth *', 
+                    value=default_dob,
+                    min_value=min_dob,
+                    max_value=max_dob,
+                    key='date_of_birth'
+                )
+                gender_options = ['Male', 'Female', 'Other']
+                gender_index = gender_options.index(agent_data_prefill.get('gender', 'Male')) if agent_data_prefill.get('gender') in gender_options else 0
+                gender = st.selectbox('Gender *', gender_options, index=gender_index, key='gender')
+            with col2:
+                surname = st.text_input('Surname *', value=agent_data_prefill.get('surname', ''), key='surname')
+                # Age is auto-calculated but not displayed in the form
+                age = (datetime.date.today() - date_of_birth).days // 365
+                marital_options = ['Single', 'Married', 'Divorced', 'Widowed']
+                marital_index = marital_options.index(agent_data_prefill.get('marital_status', 'Single')) if agent_data_prefill.get('marital_status') in marital_options else 0
+                marital_status = st.selectbox('Marital Status *', marital_options, index=marital_index, key='marital_status')
+
+            # Contact Information
+            st.subheader('Contact Information')
+            col3, col4 = st.columns(2)
+            with col3:
+                mobile_number = st.text_input('Mobile Number *', value=agent_data_prefill.get('mobile_number', ''), key='mobile_number', help='11 digits starting with 0')
+            with col4:
+                email_display = st.text_input('Email', value=st.session_state.get('email', ''), disabled=True, key='email_display')
+                residential_address = st.text_area('Residential Address *', value=agent_data_prefill.get('residential_address', ''), key='residential_address')
+
+            # Next of Kin
+            st.subheader('Next of Kin')
+            col5, col6 = st.columns(2)
+            with col5:
+                nok_name = st.text_input('Next of Kin Full Name *', value=agent_data_prefill.get('nok_name', ''), key='nok_name')
+                nok_relationship_options = ['Spouse', 'Parent', 'Sibling', 'Child', 'Friend', 'Other']
+                nok_index = nok_relationship_options.index(agent_data_prefill.get('nok_relationship', 'Spouse')) if agent_data_prefill.get('nok_relationship') in nok_relationship_options else 0
+                nok_relationship = st.selectbox('Relationship *', nok_relationship_options, index=nok_index, key='nok_relationship')
+            with col6:
+                nok_contact = st.text_input('Next of Kin Contact *', value=agent_data_prefill.get('nok_contact', ''), key='nok_contact')
+
+            # Identification
+            st.subheader('Identification')
+            col7, col8 = st.columns(2)
+            with col7:
+                id_type_options = ['NIN', 'Driver\'s License', 'International Passport', 'Voter\'s Card']
+                id_index = id_type_options.index(agent_data_prefill.get('id_type', 'NIN')) if agent_data_prefill.get('id_type') in id_type_options else 0
+                id_type = st.selectbox('ID Type *', id_type_options, index=id_index, key='id_type')
+            with col8:
+                id_number = st.text_input('ID Number *', value=agent_data_prefill.get('id_number', ''), key='id_number')
+
+            # Banking Information
+            st.subheader('Banking Information')
+            col9, col10 = st.columns(2)
+            with col9:
+                bank_list = [
+                    'Access Bank', 'Citibank', 'Diamond Bank', 'Ecobank Nigeria', 
+                    'Fidelity Bank', 'First Bank of Nigeria', 'First City Monument Bank', 
+                    'Guaranty Trust Bank', 'Heritage Bank', 'Keystone Bank', 'Polaris Bank',
+                    'Providus Bank', 'Stanbic IBTC Bank', 'Standard Chartered Bank', 
+                    'Sterling Bank', 'Union Bank of Nigeria', 'United Bank for Africa', 
+                    'Unity Bank', 'Wema Bank', 'Zenith Bank'
+                ]
+                bank_index = bank_list.index(agent_data_prefill.get('bank_name', 'Access Bank')) if agent_data_prefill.get('bank_name') in bank_list else 0
+                bank_name = st.selectbox('Bank Name *', bank_list, index=bank_index, key='bank_name')
+                account_number = st.text_input('Account Number *', value=agent_data_prefill.get('account_number', ''), key='account_number', max_chars=10, help='10 digits')
+            with col10:
+                account_name = st.text_input('Account Name *', value=agent_data_prefill.get('account_name', ''), key='account_name')
+
+            # Business Information
+            st.subheader('Business Information')
+            col11, col12 = st.columns(2)
+            with col11:
+                region_list = ['North', 'South', 'East', 'West', 'Central', 'Multi-Region']
+                region_index = region_list.index(agent_data_prefill.get('region', 'North')) if agent_data_prefill.get('region') in region_list else 0
+                region = st.selectbox('Region/Zone of Operation *', region_list, index=region_index, key='region')
+            with col12:
+                agent_category_list = ['Heirs Agent', 'Independent Agent']
+                agent_category_index = agent_category_list.index(agent_data_prefill.get('Agentcategory', 'Independent Agent')) if agent_data_prefill.get('Agentcategory') in agent_category_list else 1
+                agent_category = st.selectbox('Agent Category *', agent_category_list, index=agent_category_index, key='agent_category')
+        
+            col14, col15 = st.columns(2)
+            with col14:
+                preferred_territory = st.text_input('Preferred Territory (Optional)', value=agent_data_prefill.get('preferred_territory', ''), key='preferred_territory')
+            with col15:
+                tax_id = st.text_input('Tax ID (Optional)', value=agent_data_prefill.get('TaxID', ''), key='tax_id', help='Enter your Tax Identification Number if available')
+
+            st.write('---')
+            st.form_submit_button(
+                button_text, key='submit_application', use_container_width=True, type='primary',
+                disabled=submitting, on_click=request_submission
+            )
+        # A disabled button reports no click, so the callback records it instead
+        submit_info = st.session_state.pop('agent_submit_requested', False)
+
+        # Values owned by the location and document fragments
+        state = st.session_state.state
+        lga = st.session_state.lga
+        id_document = st.session_state.uploaded_id_doc
+        passport_photo = st.session_state.uploaded_passport
+        address_proof = st.session_state.uploaded_address_proof
+        
+        if submit_info:
+            # Validation
+            errors = []
+            
+            
+            if not first_name or not surname:
+                errors.append("First name and surname are required")
+            if not agent_category:
+                errors.append("Agent category is required")
+            if not mobile_number or len(mobile_number) != 11:
+                errors.append("Mobile number must be 11 digits")
+            if not account_number or len(account_number) != 10:
+                errors.append("Account number must be 10 digits")
+            if not id_document and not agent_data_prefill.get('id_document_blob_name'):
+                errors.append("ID document is required")
+            if not passport_photo and not agent_data_prefill.get('passport_photo_blob_name'):
+                errors.append("Passport photograph is required")
+            if not address_proof and not agent_data_prefill.get('address_proof_blob_name'):
+                errors.append("Proof of address is required")
+            
+            form_values = {
+                'prefix': prefix, 'first_name': first_name, 'surname': surname,
+                'date_of_birth': date_of_birth, 'gender': gender, 'marital_status': marital_status,
+                'mobile_number': mobile_number, 'residential_address': residential_address,
+                'state': state, 'lga': lga, 'nok_name': nok_name, 'nok_relationship': nok_relationship,
+                'nok_contact': nok_contact, 'id_type': id_type, 'id_number': id_number,
+                'bank_name': bank_name, 'account_number': account_number, 'account_name': account_name,
+                'region': region, 'preferred_territory': preferred_territory,
+                'Agentcategory': agent_category, 'TaxID': tax_id,
+            }
+            notices = []
+
+            # A repeat of a submission already started returns its stored outcome instead of running again
+            claimed = False
+            if not errors:
+                submit_key = submission_key(st.session_state.db_id, form_values, [id_document, passport_photo, address_proof])
+                try:
+                    claimed, outcome = claim_submission(conn, st.session_state.db_id, submit_key)
+                except Exception as e:
+                    errors.append(f'Error submitting application: {e}')
+                else:
+                    if not claimed and outcome:
+                        notices.append(('success', f'{outcome} (already received, nothing was sent again)'))
+                    elif not claimed:
+                        notices.append(('info', 'This submission is already being processed. Please wait a moment.'))
+
+            settled = False
+            try:
+                # Validate and stage file uploads in one streaming pass (content is checked, not the extension)
+                application_ref = st.session_state.get('application_ref', f"APP-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}")
+                staged_uploads = {}
+                if claimed:
+                    with st.spinner('Checking and uploading documents...'):
+                        for doc_key, doc_label, doc_file, document_type, max_size_mb, allowed in [
+                            ('passport_photo', 'Passport photo', passport_photo, 'passport-photos', 2, ['jpg', 'jpeg', 'png']),
+                            ('id_document', 'ID document', id_document, 'id-documents', 5, ['pdf', 'jpg', 'jpeg', 'png']),
+                            ('address_proof', 'Address proof', address_proof, 'address-proofs', 5, ['pdf', 'jpg', 'jpeg', 'png']),
+                        ]:
+                            if doc_file:
+                                spooled = open_spooled_upload(doc_file)
+                                if spooled is None:
+                                    errors.append(f"{doc_label}: upload expired, please upload the file again")
+                                    continue
+                                with spooled:
+                                    staged, msg = stage_blob_upload(spooled, document_type, application_ref, max_size_mb, allowed)
+                                if staged is None:
+                                    errors.append(f"{doc_label}: {msg}")
+                                else:
+                                    staged_uploads[doc_key] = staged
+            
+                if errors:
+                    notices.extend(('error', error) for error in errors)
+                elif claimed:
+                    try:
+                        with st.spinner('Submitting application...'):
+                            is_first_submission = agent_data_prefill.get('application_status') == 'Incomplete'
+                            # Commit staged uploads; a re-upload of the file already on record is not committed again
+                            documents = {}
+                            for doc in DOCUMENT_FIELDS:
+                                blob_name = agent_data_prefill.get(f'{doc}_blob_name')
+                                blob_sha256 = agent_data_prefill.get(f'{doc}_blob_sha256')
+                                blob_size = agent_data_prefill.get(f'{doc}_blob_size')
+                                staged = staged_uploads.get(doc)
+                                if staged and not (blob_name and staged['sha256'] == blob_sha256):
+                                    blob_name, blob_sha256, blob_size = commit_blob_upload(staged)
+                                documents[f'{doc}_blob_name'] = blob_name
+                                documents[f'{doc}_blob_sha256'] = blob_sha256
+                                documents[f'{doc}_blob_size'] = blob_size
+
+                            # Only columns that differ from the stored row are written
+                            changes = changed_fields(agent_data_prefill, {**form_values, **documents})
+
+                            if not all(documents[f'{doc}_blob_name'] for doc in DOCUMENT_FIELDS):
+                                notices.append(('error', 'Error uploading documents. Please try again.'))
+                            elif not changes and not is_first_submission:
+                                # Nothing to write, re-review or email
+                                notices.append(('info', 'No changes to save. Your application is unchanged.'))
+                            else:
+                                now = datetime.datetime.now()
+                                # Record the move to Pending (committed together with the update below)
+                                cursor.execute('''
+                                    INSERT INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by, region, category)
+                                    SELECT id, application_status, 'Pending', ?, email, ?, ? FROM agents
+                                    WHERE id = ? AND application_status <> 'Pending'
+                                ''', (now, region, agent_category, st.session_state.db_id))
+
+                                sql, params = update_statement(st.session_state.db_id, changes, {
+                                    'age': age, 'application_status': 'Pending', 'submitted_date': now, 'updated_at': now,
+                                })
+                                cursor.execute(sql, params)
+                                complete_submission(
+                                    cursor, st.session_state.db_id, submit_key,
+                                    f"{'Application submitted' if is_first_submission else 'Profile updated'} (reference {application_ref})"
+                                )
+                                # Possible duplicates go to the reviewers in the HR email, never to the applicant
+                                try:
+                                    duplicates = find_duplicates(cursor, st.session_state.db_id)
+                                except Exception:
+                                    duplicates = []
+                                if is_first_submission:
+                                    # Send Welcome Email to Agent (ONLY on first submission)
+                                    welcome_body = f'''
+        <html>
+        <body>
+        <p>Dear {first_name},</p>
+        <p>Thank you for registering as a freelance, independent sales agent. Please note the following rules:</p>
+        <ol>
+        <li><strong>Confidentiality and Privacy</strong> – As a freelance agent, you may encounter sensitive business and client information. All information received in the course of business is strictly confidential and shall be treated as such. You shall only use such information for the purpose of promoting our plans and never disclose it to any third parties without prior written approval first had and obtained. All client data and personal information must also be handled in line with data protection and privacy standards. Please read our privacy policy here.</li>
+        <li><strong>Plans Available for Sale:</strong><br>
+        a. <strong>Local (Retail)</strong> – Couples Plan, Life Plus, Premium Life, Boss Life, and Executive Boss.<br>
+        b. <strong>Local (Corporate)</strong> – Plus, Premium, Premium Plus, Prestige, Prestige Plus, and Executive Prestige.<br>
+        c. <strong>Local (SME)</strong> – SME Plus, SME Premium, SME Boss.<br>
+        d. <strong>International</strong> – BUPA and ACE.</li>
+        <li><strong>Commission</strong> – Commission is earned only on completed new sales where the premium has been fully paid, and enrolment finalised. Commissions accrue monthly and are payable within 10 days after the end of each month, at the following rates:<br>
+        * Local Plans (Retail) – 10% per individual or family. The Couples Plan should only be sold to couples.<br>
+        * Local SME Plans – 10% per individual or family.<br>
+        * Local Plans (Corporate) – 10% per individual or family.<br>
+        * International Plans (BUPA) – 2.5% (sold alone), 3% (with local plans), 4% (with ACE), 5% (with ACE + local plans).<br>
+        * International Plans (ACE) – 3% (sold alone), 4% (with Bupa or local plans), 5% (with Bupa + local plans).<br><br>
+        Notwithstanding the foregoing, where plans are sold at a discount or are customised, the commission payable shall range between 2% and 7%, depending on the extent of the discount or customization applied. No commission shall be payable on brokered sales.<br>
+        We may review our commission rates from time to time and notify you in such instances.</li>
+        <li><strong>Family Definition and Age Limits</strong> – For local plans, a "Family" means a principal, one spouse, and up to 4 children (maximum of 6 persons). Children must be under 18 years for retail plans and under 21 years for corporate plans. The age limit for a principal or spouse is 60 years for retail plans and 65 years for corporate plans.</li>
+        </ol>
+        <p>Best regards,<br>Avon Healthcare Limited</p>
+        <hr>
+        {DISCLAIMER_HTML}
+        </body>
+        </html>
+    '''
+                                    # Send HR/Sales Notification for NEW application
+                                    hr_body = f'''
+        <html>
+        <body>
+        <p>Dear HR/Sales Team,</p>
+        <p>A new agent has submitted their application for review.</p>
+        <p><strong>Agent Details:</strong><br> - Name: {first_name} {surname}<br> - Email: {st.session_state.email}<br> - Application Reference: {application_ref}<br> - Agent ID: {agent_id_input}<br> - Submitted Date: {datetime.datetime.now().strftime('%Y-%m-%d')}</p>
+        {duplicates_html(duplicates)}
+        <p>Please log in to the admin portal to review this application https://independent-agentapp.streamlit.app/ </p>
+        <p>Best regards,<br>Avon Healthcare System</p>
+        </body>
+        </html>
+    '''
+                                    emails = [
+                                        (st.session_state.email, 'Welcome to Avon Healthcare - Freelance Sales Agent Registration', welcome_body, None),
+                                        (HR_RECIPIENTS, 'New Agent Application Submitted - Review Required', hr_body, None),
+                                    ]
+                                else:
+                                    # Send update confirmation to agent only (no welcome email)
+                                    update_body = f'''
+        <html>
+        <body>
+        <p>Dear {first_name},</p>
+        <p>Your profile information has been updated successfully.</p>
+        <p><strong>Your Details:</strong><br> - Agent ID: {agent_id_input}<br> - Application Reference: {application_ref}<br> - Updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}</p>
+        <p>If you did not make this change, please contact HR immediately.</p>
+        <p>Best regards,<br>Avon Healthcare Limited</p>
+        <hr>
+        {DISCLAIMER_HTML}
+        </body>
+        </html>
+    '''
+                                    # Send HR notification for UPDATE
+                                    hr_update_body = f'''
+        <html>
+        <body>
+        <p>Dear HR/Sales Team,</p>
+        <p>An agent has updated their profile information.</p>
+        <p><strong>Agent Details:</strong><br> - Name: {first_name} {surname}<br> - Email: {st.session_state.email}<br> - Application Reference: {application_ref}<br> - Agent ID: {agent_id_input}<br> - Updated Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M')}<br> - Current Status: {agent_data_prefill.get('application_status', 'Unknown')}</p>
+        {changes_html(changes)}
+        {duplicates_html(duplicates)}
+        <p>Please log in to the admin portal to review the changes if necessary https://independent-agentapp.streamlit.app/ </p>
+        <p>Best regards,<br>Avon Healthcare System</p>
+        </body>
+        </html>
+    '''
+                                    emails = [
+                                        (st.session_state.email, 'Profile Updated Successfully', update_body, None),
+                                        (HR_RECIPIENTS, 'Agent Profile Updated - Information Changed', hr_update_body, None),
+                                    ]
+                                # Kept until sent: a run cut short after the commit sends them on the next run
+                                st.session_state.submission_emails = {
+                                    'agent_id': st.session_state.db_id, 'key': submit_key, 'emails': emails,
+                                }
+                                conn.commit()
+                                settled = True
+                                # Clear spooled uploads after successful submission
+                                for key in ['uploaded_id_doc', 'uploaded_passport', 'uploaded_address_proof']:
+                                    release_spooled_upload(st.session_state.get(key))
+                                st.session_state.uploaded_id_doc = None
+                                st.session_state.uploaded_passport = None
+                                st.session_state.uploaded_address_proof = None
+
+                                agent_sent, hr_sent = send_submission_emails(conn, st.session_state.submission_emails) or (False, False)
+                                st.session_state.pop('submission_emails', None)
+                                if is_first_submission:
+                                    if not agent_sent:
+                                        notices.append(('warning', 'Welcome email could not be sent'))
+                                    if hr_sent:
+                                        notices.append(('success', '✅ Application submitted and notifications sent successfully!'))
+                                    else:
+                                        notices.append(('success', '✅ Application submitted (notification to HR/Sales failed)'))
+                                elif agent_sent and hr_sent:
+                                    notices.append(('success', '✅ Profile updated and notifications sent successfully!'))
+                                elif agent_sent:
+                                    notices.append(('success', '✅ Profile updated (HR notification failed)'))
+                                else:
+                                    notices.append(('warning', '✅ Profile updated, but the confirmation email could not be sent'))
+                                notices.append(('info', f'Your application reference number is: **{application_ref}**'))
+                                # Shown by the profile page after the rerun
+                                st.session_state.pop('agent_submitting_since', None)
+                                st.session_state.profile_notices = notices
+                                st.session_state.page = 'profile'
+                                st.rerun()
+                
+                    except Exception as e:
+                        notices.append(('error', f'Error submitting application: {e}'))
+            finally:
+                # Runs on errors and when Streamlit cuts the run short (a rerun or stop is a
+                # BaseException): a claim whose write never committed is given back for a retry
+                if claimed and not settled:
+                    try:
+                        conn.rollback()
+                        release_submission(conn, st.session_state.db_id, submit_key)
+                    except Exception:
+                        pass  # the claim lapses after the window anyway
+
+            # Re-enable the submit button and show the outcome on a fresh run
+            st.session_state.pop('agent_submitting_since', None)
+            st.session_state.agent_info_notices = notices
+            st.rerun()
+
+
+def request_submission():
+    """Submit button callback: disable the button until this submission has finished"""
+    st.session_state.agent_submitting_since = time.time()
+    st.session_state.agent_submit_requested = True
+
+
+@st.fragment
+def location_inputs(agent_data_prefill):
+    """State and LGA selectors; changing the State reruns only this fragment"""
+    st.subheader('Location')
+    col1, col2 = st.columns(2)
+    with col1:
+        state_list = [
+            'Abia', 'Adamawa', 'Akwa Ibom', 'Anambra', 'Bauchi', 'Bayelsa', 
+            'Benue', 'Borno', 'Cross River', 'Delta', 'Ebonyi', 'Edo', 
+            'Ekiti', 'Enugu', 'Federal Capital Territory', 'Gombe', 'Imo', 'Jigawa', 'Kaduna', 
+            'Kano', 'Katsina', 'Kebbi', 'Kogi', 'Kwara', 'Lagos', 'Nasarawa', 
+            'Niger', 'Ogun', 'Ondo', 'Osun', 'Oyo', 'Plateau', 'Rivers', 
+            'Sokoto', 'Taraba', 'Yobe', 'Zamfara'
+        ]
+        state_index = state_list.index(agent_data_prefill.get('state', 'Lagos')) if agent_data_prefill.get('state') in state_list else 0
+        state = st.selectbox('State *', state_list, index=state_index, key='state')
+    with col2:
+        # Get LGAs for selected state
+        lga_options = get_lgas_for_state(state)
+        
+        # Find index of prefilled LGA
+        prefilled_lga = agent_data_prefill.get('lga', '')
+        lga_index = 0
+        if prefilled_lga and prefilled_lga in lga_options:
+            lga_index = lga_options.index(prefilled_lga)
+        
+        st.selectbox('Local Government Area *', lga_options, index=lga_index, key='lga')
+        st.caption(f"{len(lga_options)} LGAs available in {state}")
+
+
+@st.fragment
+def document_inputs(agent_data_prefill):
+    """Document uploaders; picking a file reruns only this fragment"""
+    st.subheader('Document Uploads')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if agent_data_prefill.get('id_document_blob_name'):
+            st.write('ID Document already uploaded ✅')
+        if agent_data_prefill.get('id_document_blob_name'):
+            st.success('ID Document already uploaded')
+        pending_upload_input('Upload ID Document *', 'uploaded_id_doc', 5, type=['pdf', 'jpg', 'jpeg', 'png'], help='Max 5MB')
+    with col2:
+        if agent_data_prefill.get('passport_photo_blob_name'):
+            st.write('Passport photo already uploaded ✅')
+        if agent_data_prefill.get('passport_photo_blob_name'):
+            st.success('Passport photo already uploaded')
+        pending_upload_input('Passport Photograph *', 'uploaded_passport', 2, type=['jpg', 'jpeg', 'png'], help='Max 2MB')
+    with col3:
+        if agent_data_prefill.get('address_proof_blob_name'):
+            st.write('Address proof already uploaded ✅')
+        if agent_data_prefill.get('address_proof_blob_name'):
+            st.success('Address proof already uploaded')
+        pending_upload_input('Proof of Address *', 'uploaded_address_proof', 5, type=['pdf', 'jpg', 'jpeg', 'png'], help='Max 5MB')
@@ -0,0 +1,96 @@
+"""Create account page."""
+import datetime
+import hashlib
+
+import streamlit as st
+
+from services.agent_ids import allocate_agent_ids, format_agent_id
+from services.db import get_db_connection
+
+
+def render():
+    """Render the agent sign-up page"""
+    conn = get_db_connection()
+    if conn is None:
+        st.stop()
+    cursor = conn.cursor()
+    st.title('Create a New Account')
+    st.write('Register to start your agent application process.')
+    
+    with st.form('create_account_form'):
+        email = st.text_input('Email Address', help='Use a valid email address', key='create_email')
+        new_password = st.text_input('Password', type='password', help='Minimum 8 characters', key='create_password')
+        confirm_password = st.text_input('Confirm Password', type='password', key='create_confirm_password')
+        submit_button = st.form_submit_button('Create Account')
+        
+        if submit_button:
+            # Validate inputs
+            if not email or not new_password or not confirm_password:
+                st.error('Please fill in all fields')
+            elif new_password != confirm_password:
+                st.error('Passwords do not match')
+            elif len(new_password) < 8:
+                st.error('Password must be at least 8 characters')
+            else:
+                try:
+                    # Check if email already exists
+                    cursor.execute("SELECT email FROM agent_credentials WHERE email = ?", (email,))
+                    existing = cursor.fetchone()
+                    
+                    if existing:
+                        st.error('An account with this email already exists')
+                    else:
+                        # Auto-generate agent ID (serial reserved under a lock until commit)
+                        current_year, next_serial = allocate_agent_ids(cursor)
+                        auto_agent_id = format_agent_id(current_year, next_serial)
+                        application_ref = f"APP-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+                        password_hash = hashlib.sha256(new_password.encode()).hexdigest()
+                        created_at = datetime.datetime.now()
+                        # Create a minimal agent record (required for foreign key)
+                        cursor.execute('''
+                            INSERT INTO agents (
+                                application_ref, agent_id, first_name, surname, date_of_birth,
+                                mobile_number, email, application_status, created_at, created_by
+                            )
+                            OUTPUT INSERTED.id
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ''', (application_ref, auto_agent_id, '', '',  # Empty strings instead of 'Pending' and 'Completion' 
+                            datetime.date(1990, 1, 1), '00000000000', email, 
+                            'Incomplete', created_at, email))
+                        # Get the auto-generated ID
+                        result = cursor.fetchone()
+                        if result is None:
+                            raise Exception("Failed to retrieve agent ID after insert")
+                        
+                        agent_db_id = result[0]
+                        cursor.execute('''
+                            INSERT INTO agent_status_history (agent_id, from_status, to_status, changed_at, changed_by)
+                            VALUES (?, NULL, 'Incomplete', ?, ?)
+                        ''', (agent_db_id, created_at, email))
+                        # Insert into agent_credentials table
+                        cursor.execute('''
+                            INSERT INTO agent_credentials (
+                                agent_id, email, password_hash, is_active, created_at
+                            )
+                            VALUES (?, ?, ?, ?, ?)
+                        ''', (agent_db_id, email, password_hash, 1, created_at))
+                        
+                        conn.commit()
+                        
+                        st.success('Account created successfully! Now complete your profile.')
+                        st.session_state.agent_id = auto_agent_id
+                        st.session_state.db_id = agent_db_id
+                        st.session_state.email = email
+                        st.session_state.application_ref = application_ref
+                        st.session_state.is_new_user = True
+                        st.session_state.page = 'agent_info'
+                        st.rerun()
+                
+                except Exception as e:
+                    st.error(f'Error creating account: {e}')
+                    conn.rollback()
+    
+    st.write('---')
+    if st.button('← Back to Login'):
+        st.session_state.page = 'login'
+        st.rerun()
@@ -0,0 +1,12 @@
+"""Dashboard page."""
+import streamlit as st
+
+from views.navigation import agent_sidebar
+
+
+def render():
+    """Render the agent landing page"""
+    agent_sidebar()
+    st.title('Welcome to your agent dashboard')
+    st.success('You have successfully logged in.')
+    st.write('Use the navigation options to proceed.')
@@ -0,0 +1,67 @@
+"""Login page."""
+import datetime
+import hashlib
+
+import streamlit as st
+
+from services.db import get_db_connection
+
+
+def render():
+    """Render the agent login page"""
+    conn = get_db_connection()
+    if conn is None:
+        st.stop()
+    cursor = conn.cursor()
+    st.title('Agent Portal Login')
+    st.write('Login with your email and password to access the portal.')
+    
+    with st.form('login_form'):
+        email_input = st.text_input('Email', key='login_email')
+        password_input = st.text_input('Password', type='password', key='login_password')
+        login_button = st.form_submit_button('Login')
+        
+        if login_button:
+            if email_input and password_input:
+                # Hash password
+                password_hash = hashlib.sha256(password_input.encode()).hexdigest()
+                
+                try:
+                    # Query database with corrected join
+                    cursor.execute("""
+                        SELECT ac.agent_id, a.id, a.agent_id as agent_string_id, a.application_status
+                        FROM agent_credentials ac
+                        LEFT JOIN agents a ON ac.agent_id = a.id
+                        WHERE ac.email = ? AND ac.password_hash = ? AND ac.is_active = 1
+                    """, (email_input, password_hash))
+                    
+                    row = cursor.fetchone()
+                    
+                    if row:
+                        st.session_state.db_id = row[0]  # Integer agent_id from agent_credentials (references agents.id)
+                        st.session_state.agent_id = row[2]  # String agent_id from agents.agent_id
+                        st.session_state.email = email_input
+                        
+                        # Check if they need to complete their profile
+                        st.session_state.page = 'dashboard'
+                        st.session_state.application_ref = f"APP-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+                        
+                        st.rerun()
+                    else:
+                        st.error('Invalid email or password')
+                
+                except Exception as e:
+                    st.error(f'Login error: {e}')
+            else:
+                st.warning('Please enter both email and password')
+    
+    st.write('---')
+    st.write('Don\'t have an account?')
+    if st.button('Create New Account'):
+        st.session_state.page = 'create_account'
+        st.rerun()
+    st.write('---')
+    st.caption('HR/Admin Staff')
+    if st.button('Admin Login →'):
+        st.session_state.page = 'admin_login'
+        st.rerun()
@@ -0,0 +1,44 @@
+"""Navigation shared by the agent pages."""
+import streamlit as st
+
+from services.db import get_db_connection
+from services.submissions import send_submission_emails
+
+
+def deliver_submission_emails():
+    """Send the emails of a submission whose run was cut short after it committed (kept until they go out)"""
+    pending = st.session_state.get('submission_emails')
+    if not pending:
+        return
+    conn = get_db_connection()
+    if conn is None:
+        return
+    try:
+        results = send_submission_emails(conn, pending)
+    except Exception as e:
+        st.warning(f"The confirmation emails for your submission could not be sent yet: {e}")
+        return
+    st.session_state.pop('submission_emails', None)
+    if results and not all(results):
+        st.warning('Some confirmation emails for your submission could not be sent')
+
+
+def agent_sidebar():
+    """Render the sidebar navigation for logged-in agents"""
+    # Before the buttons, so a Logout click still sends them
+    deliver_submission_emails()
+    with st.sidebar:
+        st.title("Navigation")
+        if st.button("🏠 Dashboard", use_container_width=True):
+            st.session_state.page = 'dashboard'
+            st.rerun()
+        if st.button("📝 Update My Information", use_container_width=True):
+            st.session_state.page = 'agent_info'
+            st.rerun()
+        if st.button("👤 View Profile", use_container_width=True):
+            st.session_state.page = 'profile'
+            st.rerun()
+        st.write("---")
+        if st.button("🚪 Logout", use_container_width=True):
+            st.session_state.clear()
+            st.rerun()
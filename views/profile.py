@@ -0,0 +1,117 @@
+"""Agent profile/dashboard."""
+import streamlit as st
+
+from services.db import get_db_connection
+from services.telemetry import span
+from views.navigation import agent_sidebar
+
+
+def render():
+    """Render the agent profile and application status"""
+    conn = get_db_connection()
+    if conn is None:
+        st.stop()
+    cursor = conn.cursor()
+    agent_sidebar()
+    st.title('Agent Dashboard')
+    st.write(f"Welcome back! **{st.session_state.get('email', '')}**")
+    # Outcome of a submission made on the agent info page
+    for level, message in st.session_state.pop('profile_notices', []):
+        getattr(st, level)(message)
+    
+    # Fetch agent data
+    try:
+        with span('db.select_agent'):
+            cursor.execute("""
+                SELECT * FROM agents WHERE id = ?
+            """, (st.session_state.db_id,))
+            agent_data = cursor.fetchone()
+        
+        if agent_data:
+            # Get column names
+            columns = [column[0] for column in cursor.description]
+            agent_dict = dict(zip(columns, agent_data))
+            
+            # Display status
+            status = agent_dict.get('application_status', 'Unknown')
+            if status == 'Approved':
+                st.success(f'✅ Application Status: **{status}**')
+            elif status == 'Pending':
+                st.info(f'⏳ Application Status: **{status}**')
+            elif status == 'Incomplete':
+                st.warning(f'⚠️ Application Status: **{status}** - Please complete your profile')
+            else:
+                st.warning(f'Application Status: **{status}**')
+            
+            # Display application reference and agent ID
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.markdown("**Application Reference**")
+                st.write(agent_dict.get('application_ref', 'N/A'))
+            with col2:
+                st.markdown("**Agent ID**")
+                if status == 'Approved' and agent_dict.get('agent_id'):
+                    st.write(agent_dict.get('agent_id', 'N/A'))
+                else:
+                    st.caption("Pending Approval")  # caption has smaller font
+            with col3:
+                st.markdown("**Submitted On**")
+                submitted_date = agent_dict.get('submitted_date')
+                if submitted_date:
+                    st.write(submitted_date.strftime('%Y-%m-%d'))
+                else:
+                    st.write('N/A')
+            
+            # If application is incomplete, prompt to complete
+            if status == 'Incomplete':
+                st.write('---')
+                st.warning('Your application is incomplete. Please complete your profile to submit for review.')
+                if st.button('Complete Application Form'):
+                    st.session_state.page = 'agent_info'
+                    st.rerun()
+            
+            # Show profile details if complete
+            elif agent_dict.get('first_name'):
+                st.write('---')
+                st.subheader('Profile Information')
+                
+                with st.expander('Personal Information', expanded=True):
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.write(f"**Name:** {agent_dict.get('prefix', '')} {agent_dict.get('first_name', '')} {agent_dict.get('surname', '')}")
+                        st.write(f"**Date of Birth:** {agent_dict.get('date_of_birth', 'N/A')}")
+                        st.write(f"**Gender:** {agent_dict.get('gender', 'N/A')}")
+                    with col2:
+                        st.write(f"**Age:** {agent_dict.get('age', 'N/A')}")
+                        st.write(f"**Marital Status:** {agent_dict.get('marital_status', 'N/A')}")
+                
+                with st.expander('Contact Information'):
+                    st.write(f"**Mobile:** {agent_dict.get('mobile_number', 'N/A')}")
+                    st.write(f"**Email:** {agent_dict.get('email', 'N/A')}")
+                    st.write(f"**Address:** {agent_dict.get('residential_address', 'N/A')}")
+                    st.write(f"**State:** {agent_dict.get('state', 'N/A')}")
+                    st.write(f"**LGA:** {agent_dict.get('lga', 'N/A')}")
+                
+                with st.expander('Banking Information'):
+                    st.write(f"**Bank:** {agent_dict.get('bank_name', 'N/A')}")
+                    st.write(f"**Account Number:** {agent_dict.get('account_number', 'N/A')}")
+                    st.write(f"**Account Name:** {agent_dict.get('account_name', 'N/A')}")
+                
+                with st.expander('Business Information'):
+                    st.write(f"**Region:** {agent_dict.get('region', 'N/A')}")
+                    st.write(f"**Agent Category:** {agent_dict.get('Agentcategory', 'N/A')}")
+                    st.write(f"**Preferred Territory:** {agent_dict.get('preferred_territory', 'N/A')}")
+                    st.write(f"**Tax ID:** {agent_dict.get('TaxID', 'N/A')}")
+                
+                with st.expander('Documents'):
+                    if agent_dict.get('passport_photo_blob_name'):
+                        st.write("**Passport Photograph:** ✅ Uploaded")
+                    if agent_dict.get('id_document_blob_name'):
+                        st.write("**ID Document:** ✅ Uploaded")
+                    if agent_dict.get('address_proof_blob_name'):
+                        st.write("**Address Proof:** ✅ Uploaded")
+        else:
+            st.error('Agent profile not found')
+    
+    except Exception as e:
+        st.error(f'Error loading profile: {e}')
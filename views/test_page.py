@@ -0,0 +1,20 @@
+"""Test page for form button."""
+import streamlit as st
+
+
+def render():
+    """Render the form button test page"""
+    st.title('Test Page')
+    st.write('This is a test page to verify form button rendering.')
+    
+    with st.form('test_form', clear_on_submit=True):
+        test_input = st.text_input('Test Input', key='test_input')
+        test_submit = st.form_submit_button('Test Submit', use_container_width=True)
+        
+        if test_submit:
+            st.success(f'Test form submitted with input: {test_input}')
+    
+    st.write('---')
+    if st.button('Back to Admin Login'):
+        st.session_state.page = 'admin_login'
+        st.rerun()